@@ -12,8 +12,10 @@ from argparse import ArgumentParser, RawTextHelpFormatter
 from multiprocessing import freeze_support
 
 from nescient import __version__, __doc__ as description
-from nescient.packer import PACKING_MODES, DEFAULT_PACKING_MODE, NescientPacker, PackingError
-from nescient.timing import estimate_time, EstimatedTimer, load_benchmarks, benchmark_mode
+from nescient.packer import PACKING_MODES, DEFAULT_PACKING_MODE, CHUNK_SIZE, SEGMENT_SIZE, DEFAULT_ITERATIONS, \
+    NescientPacker, PackingError
+from nescient.timing import estimate_time, EstimatedTimer, load_benchmarks, benchmark_mode, calibrate_iterations, \
+    load_thread_tuning
 from nescient.process import process_sync_execute
 from nescient.gui import main as start_gui
 
@@ -63,8 +65,31 @@ def main():
                         help='Prevent Nescient from prompting the user and forces the use of default options.')
     parser.add_argument('-nd', '-nodelete', dest='overwrite', action='store_false', default=True,
                         help='Prevent Nescient from overwriting the original file during processing.')
+    parser.add_argument('-mm', '-mmap', dest='use_mmap', action='store_true', default=False,
+                        help='Memory-map files and process them in place, rather than streaming them in chunks.')
+    parser.add_argument('-ck', '-chunked', dest='chunk_size', nargs='?', type=int, const=CHUNK_SIZE, default=None,
+                        metavar='chunk size',
+                        help='When packing, authenticate files in independent chunks of this many bytes (by default\n'
+                             '%d), which are then authenticated in parallel when packing and unpacking.' % CHUNK_SIZE)
+    parser.add_argument('-sg', '-segmented', dest='segment_size', nargs='?', type=int, const=SEGMENT_SIZE,
+                        default=None, metavar='segment size',
+                        help='When packing in CBC mode, encrypt files in independent segments of this many bytes (by\n'
+                             'default %d), which are then encrypted in parallel.' % SEGMENT_SIZE)
+    parser.add_argument('-mk', '-masterkey', dest='master_key', action='store_true', default=False,
+                        help='When packing, derive a master key from the password once, and the key of each file\n'
+                             'from it, rather than deriving each key from the password. Speeds up packing and\n'
+                             'unpacking many small files.')
+    kdf_group = parser.add_mutually_exclusive_group()
+    kdf_group.add_argument('-it', '-iterations', dest='iterations', type=int, default=DEFAULT_ITERATIONS,
+                           metavar='iterations',
+                           help='When packing, the number of PBKDF2 iterations to derive keys with (by default %d).\n'
+                                'More iterations make passwords harder to guess, but packing and unpacking slower.'
+                                % DEFAULT_ITERATIONS)
+    kdf_group.add_argument('-kt', '-kdftime', dest='kdf_time', type=float, default=None, metavar='seconds',
+                           help='When packing, choose the number of PBKDF2 iterations so that deriving a key takes\n'
+                                'about this many seconds on this machine.')
     args = parser.parse_args()
-    noprompt, overwrite, recursive = args.noprompt, args.overwrite, args.recursive
+    noprompt, overwrite, recursive, use_mmap = args.noprompt, args.overwrite, args.recursive, args.use_mmap
     # Retrieve packer mode information
     alg, mode, auth = args.mode.split('-', 2)
     packing_choice, patterns, out_path = args.packing_choice, args.patterns, args.out_path
@@ -79,6 +104,10 @@ def main():
     # Create Nescient header
     print('== Nescient v' + __version__ + ' ==\n')
     print('Packing mode:', args.mode + '\n')
+    iterations = args.iterations
+    if args.kdf_time is not None and packing_choice == 'pack':
+        iterations = calibrate_iterations(args.kdf_time, args.mode)
+        print('Key derivation iterations:', str(iterations) + '\n')
     # Prompt for password
     if sys.stdin.isatty():  # If reading from a terminal, prompt for the password
         password = getpass('Insert password: ')
@@ -91,16 +120,23 @@ def main():
         password = input('')
         noprompt = True
     # Build the packer, and check for benchmarks
-    packer = NescientPacker(password, alg, mode, auth)
+    try:
+        packer = NescientPacker(password, alg, mode, auth, args.chunk_size, args.master_key, iterations,
+                                segment_size=args.segment_size)
+    except PackingError as e:
+        print(e.__class__.__name__ + ':', e)
+        sys.exit(1)
     benchmarks = load_benchmarks()
     if benchmarks is None or benchmarks.get(args.mode) is None:  # Ask to generate benchmarks if there are none
         if ask_yesno('No current benchmarks for these settings. Generate some?', noprompt=noprompt):
             print('Generating benchmarks...')
             benchmark_mode(args.mode)
             print()
+    load_thread_tuning()  # Use the thread counts measured to pay off on this machine
     prompt_each = ask_yesno('Confirm each file?', default=False, newline=True, noprompt=noprompt)
     print('Packing:' if packing_choice == 'pack' else 'Unpacking:')
-    for file_path in paths:
+    # Derive the keys of upcoming files while the current one is processed
+    for file_path, keys in zip(paths, packer.prefetch_keys(paths, packing_choice)):
         try:
             # Fix the out path and set up display text
             file_out_path = NescientPacker.fix_out_path(file_path, out_path, packing_choice)
@@ -122,8 +158,9 @@ def main():
             timer = EstimatedTimer(display_text, est_time)
             timer.start()
             try:
+                salt, key = keys.result()
                 process_sync_execute(packer.pack_or_unpack_file, file_path, file_out_path, packing_choice,
-                                     overwrite=overwrite)
+                                     overwrite=overwrite, use_mmap=use_mmap, salt=salt, key=key)
             except Exception as e:
                 timer.stop(error=True)
                 print(e.__class__.__name__ + ':', e)
@@ -5,55 +5,47 @@
 """ Classes and (Cython) functions for working with the Advanced Encryption Standard (AES) algorithm in various cipher
 modes.
 
-See FIPS 197 for the AES specification.
+See FIPS 197 for the AES specification, and NIST Special Publication 800-38D for GCM mode.
 """
-# TODO: Docstrings, efficiency, CTR mode, GCM mode
-from nescient.crypto.galois import GaloisField
-from nescient.crypto.tools import get_random_bytes, pad, unpad
+# TODO: Docstrings, efficiency
+from libc.stdint cimport uint8_t, uint32_t, uint64_t
+from libc.string cimport memcpy, memset
 
-GF_FIELD = GaloisField(2, 8, 283, 3)
+import hmac
+import hashlib
 
-def make_sboxes():
-    """ Generate the AES sbox and inverse sbox from scratch.
+from threading import Lock
+from collections import OrderedDict
+from cython.parallel import prange
 
-    Returns:
-        A tuple `(sbox, inv_sbox)` where each is a `bytes` object of length 256, where `b[i]` corresponds to the
-    substitution for byte i.
-    """
-    # Begin with the inverses over GF-256
-    sbox = [GF_FIELD.inverse(i) for i in GF_FIELD.f]
-    # Perform the affine transformation
-    c = 0x63
-    for i in range(256):
-        b = sbox[i]
-        sbox[i] = 0
-        for j in range(8):
-            sbox[i] ^= ((b >> j & 1) ^ (b >> ((j + 4) % 8) & 1) ^ (b >> ((j + 5) % 8) & 1) ^
-                        (b >> ((j + 6) % 8) & 1) ^ (b >> ((j + 7) % 8) & 1) ^ (c >> j & 1)) << j
-    inv_sbox = [0]*256
-    for i in range(256):
-        inv_sbox[sbox[i]] = i  # Map indices to values and vice versa
-    return bytes(sbox), bytes(inv_sbox)
-
-
-def make_mult_lookups():
-    return {const: bytes([GF_FIELD.mult(const, i) for i in GF_FIELD.f]) for const in [0x02, 0x03, 0x09, 0x0b, 0x0d, 0x0e]}
-
-PY_SBOX, PY_INV_SBOX = make_sboxes()
-cdef unsigned char * SBOX = PY_SBOX
-cdef unsigned char * INV_SBOX = PY_INV_SBOX
-
-ms = make_mult_lookups()
-cdef unsigned char * m2 = ms[0x02]
-cdef unsigned char * m3 = ms[0x03]
-cdef unsigned char * m9 = ms[0x09]
-cdef unsigned char * mB = ms[0x0b]
-cdef unsigned char * mD = ms[0x0d]
-cdef unsigned char * mE = ms[0x0e]
-
-
-cdef aes_block_cipher(unsigned char * x, unsigned char * ex_key, unsigned char nr):
-    cdef unsigned char j, k, l, r, b0, b1, b2, b3
+from nescient.crypto.tools import get_random_bytes, randbits, pad, unpad, available_cpus
+
+# The sboxes, GF-256 multiplication tables, T-tables and round constants are compiled in as C constants, generated by
+# `nescient.crypto.aes_tables`
+cdef extern from "aes_tables.h":
+    const unsigned char SBOX[256]
+    const unsigned char INV_SBOX[256]
+    const unsigned char RCON[15]
+    const unsigned char m2 "M2"[256]
+    const unsigned char m3 "M3"[256]
+    const unsigned char m9 "M9"[256]
+    const unsigned char mB "MB"[256]
+    const unsigned char mD "MD"[256]
+    const unsigned char mE "ME"[256]
+    const uint32_t TE0[256]
+    const uint32_t TE1[256]
+    const uint32_t TE2[256]
+    const uint32_t TE3[256]
+    const uint32_t TD0[256]
+    const uint32_t TD1[256]
+    const uint32_t TD2[256]
+    const uint32_t TD3[256]
+
+PY_SBOX, PY_INV_SBOX = bytes(SBOX[:256]), bytes(INV_SBOX[:256])
+
+
+cdef void aes_block_cipher(unsigned char * x, unsigned char * ex_key, unsigned char nr) noexcept nogil:
+    cdef unsigned char j, k, l, r, b, b0, b1, b2, b3
     # Initial AddRoundKey
     for j in range(16):
         x[j] ^= ex_key[j]
@@ -81,8 +73,8 @@ cdef aes_block_cipher(unsigned char * x, unsigned char * ex_key, unsigned char n
         for j in range(16):
             x[j] ^= ex_key[(r << 4)+j]
 
-cdef aes_inv_block_cipher(unsigned char * x, unsigned char * ex_key, unsigned char nr):
-    cdef unsigned char j, k, l, r, b0, b1, b2, b3
+cdef void aes_inv_block_cipher(unsigned char * x, unsigned char * ex_key, unsigned char nr) noexcept nogil:
+    cdef unsigned char j, k, l, r, b, b0, b1, b2, b3
     for r in range(nr, 0, -1):
         # AddRoundKey
         for j in range(16):
@@ -110,6 +102,439 @@ cdef aes_inv_block_cipher(unsigned char * x, unsigned char * ex_key, unsigned ch
         x[j] ^= ex_key[j]
 
 
+# Loads a 16-byte block as four big-endian 32-bit columns, xored with the first round key
+cdef inline void load_state(uint8_t * x, const uint32_t * rk, uint32_t * s) noexcept nogil:
+    cdef int j
+    for j in range(4):
+        s[j] = (<uint32_t>x[4*j] << 24 | <uint32_t>x[4*j+1] << 16 | <uint32_t>x[4*j+2] << 8 | x[4*j+3]) ^ rk[j]
+
+# Stores four 32-bit columns back into a 16-byte block
+cdef inline void store_state(uint8_t * x, uint32_t * s) noexcept nogil:
+    cdef int j
+    for j in range(4):
+        x[4*j], x[4*j+1], x[4*j+2], x[4*j+3] = s[j] >> 24, s[j] >> 16, s[j] >> 8, s[j]
+
+# One round of the word-oriented cipher, from the state s into t, where each round is 16 T-table lookups
+cdef inline void enc_round(const uint32_t * s, uint32_t * t, const uint32_t * rk) noexcept nogil:
+    t[0] = TE0[s[0] >> 24] ^ TE1[(s[1] >> 16) & 0xff] ^ TE2[(s[2] >> 8) & 0xff] ^ TE3[s[3] & 0xff] ^ rk[0]
+    t[1] = TE0[s[1] >> 24] ^ TE1[(s[2] >> 16) & 0xff] ^ TE2[(s[3] >> 8) & 0xff] ^ TE3[s[0] & 0xff] ^ rk[1]
+    t[2] = TE0[s[2] >> 24] ^ TE1[(s[3] >> 16) & 0xff] ^ TE2[(s[0] >> 8) & 0xff] ^ TE3[s[1] & 0xff] ^ rk[2]
+    t[3] = TE0[s[3] >> 24] ^ TE1[(s[0] >> 16) & 0xff] ^ TE2[(s[1] >> 8) & 0xff] ^ TE3[s[2] & 0xff] ^ rk[3]
+
+# The last round has no MixColumns, so only substitutes and shifts
+cdef inline void enc_last_round(const uint32_t * s, uint32_t * t, const uint32_t * rk) noexcept nogil:
+    t[0] = (<uint32_t>SBOX[s[0] >> 24] << 24 | <uint32_t>SBOX[(s[1] >> 16) & 0xff] << 16 |
+            <uint32_t>SBOX[(s[2] >> 8) & 0xff] << 8 | SBOX[s[3] & 0xff]) ^ rk[0]
+    t[1] = (<uint32_t>SBOX[s[1] >> 24] << 24 | <uint32_t>SBOX[(s[2] >> 16) & 0xff] << 16 |
+            <uint32_t>SBOX[(s[3] >> 8) & 0xff] << 8 | SBOX[s[0] & 0xff]) ^ rk[1]
+    t[2] = (<uint32_t>SBOX[s[2] >> 24] << 24 | <uint32_t>SBOX[(s[3] >> 16) & 0xff] << 16 |
+            <uint32_t>SBOX[(s[0] >> 8) & 0xff] << 8 | SBOX[s[1] & 0xff]) ^ rk[2]
+    t[3] = (<uint32_t>SBOX[s[3] >> 24] << 24 | <uint32_t>SBOX[(s[0] >> 16) & 0xff] << 16 |
+            <uint32_t>SBOX[(s[1] >> 8) & 0xff] << 8 | SBOX[s[2] & 0xff]) ^ rk[3]
+
+# One round of the word-oriented equivalent inverse cipher, from the state s into t
+cdef inline void dec_round(const uint32_t * s, uint32_t * t, const uint32_t * rk) noexcept nogil:
+    t[0] = TD0[s[0] >> 24] ^ TD1[(s[3] >> 16) & 0xff] ^ TD2[(s[2] >> 8) & 0xff] ^ TD3[s[1] & 0xff] ^ rk[0]
+    t[1] = TD0[s[1] >> 24] ^ TD1[(s[0] >> 16) & 0xff] ^ TD2[(s[3] >> 8) & 0xff] ^ TD3[s[2] & 0xff] ^ rk[1]
+    t[2] = TD0[s[2] >> 24] ^ TD1[(s[1] >> 16) & 0xff] ^ TD2[(s[0] >> 8) & 0xff] ^ TD3[s[3] & 0xff] ^ rk[2]
+    t[3] = TD0[s[3] >> 24] ^ TD1[(s[2] >> 16) & 0xff] ^ TD2[(s[1] >> 8) & 0xff] ^ TD3[s[0] & 0xff] ^ rk[3]
+
+cdef inline void dec_last_round(const uint32_t * s, uint32_t * t, const uint32_t * rk) noexcept nogil:
+    t[0] = (<uint32_t>INV_SBOX[s[0] >> 24] << 24 | <uint32_t>INV_SBOX[(s[3] >> 16) & 0xff] << 16 |
+            <uint32_t>INV_SBOX[(s[2] >> 8) & 0xff] << 8 | INV_SBOX[s[1] & 0xff]) ^ rk[0]
+    t[1] = (<uint32_t>INV_SBOX[s[1] >> 24] << 24 | <uint32_t>INV_SBOX[(s[0] >> 16) & 0xff] << 16 |
+            <uint32_t>INV_SBOX[(s[3] >> 8) & 0xff] << 8 | INV_SBOX[s[2] & 0xff]) ^ rk[1]
+    t[2] = (<uint32_t>INV_SBOX[s[2] >> 24] << 24 | <uint32_t>INV_SBOX[(s[1] >> 16) & 0xff] << 16 |
+            <uint32_t>INV_SBOX[(s[0] >> 8) & 0xff] << 8 | INV_SBOX[s[3] & 0xff]) ^ rk[2]
+    t[3] = (<uint32_t>INV_SBOX[s[3] >> 24] << 24 | <uint32_t>INV_SBOX[(s[2] >> 16) & 0xff] << 16 |
+            <uint32_t>INV_SBOX[(s[1] >> 8) & 0xff] << 8 | INV_SBOX[s[0] & 0xff]) ^ rk[3]
+
+# The number of independent blocks the interleaved cipher functions process at once. The states of two blocks just fit
+# in the general purpose registers of x86-64; any more are spilled to memory, which costs more than interleaving gains.
+cdef enum:
+    N_WAYS = 2
+
+# Word-oriented AES cipher on n consecutive, independent blocks, where n is at most N_WAYS. rk holds the 4*(nr+1)
+# round key words. Each round is applied to every block before the next round, so that the lookups of one block are
+# carried out while those of another are waited on, rather than stalling on the dependencies between one block's
+# rounds. There is always an odd number of full rounds, so the state passes between s and t two rounds at a time,
+# then through the last full round and the final round.
+cdef inline void encrypt_blocks(uint8_t * x, const uint32_t * rk, int nr, int n) noexcept nogil:
+    cdef uint32_t s[4*N_WAYS]
+    cdef uint32_t t[4*N_WAYS]
+    cdef int r, b
+    for b in range(n):
+        load_state(x + 16*b, rk, s + 4*b)
+    for r in range(1, nr - 1, 2):
+        for b in range(n):
+            enc_round(s + 4*b, t + 4*b, rk + 4*r)
+        for b in range(n):
+            enc_round(t + 4*b, s + 4*b, rk + 4*r + 4)
+    for b in range(n):
+        enc_round(s + 4*b, t + 4*b, rk + 4*nr - 4)
+    for b in range(n):
+        enc_last_round(t + 4*b, s + 4*b, rk + 4*nr)
+        store_state(x + 16*b, s + 4*b)
+
+# Word-oriented equivalent inverse cipher (FIPS 197 section 5.3.5) on n blocks, interleaved as above. rk holds the
+# decryption round key words, which are the encryption round keys in reverse order, with InvMixColumns applied to all
+# but the first and last.
+cdef inline void decrypt_blocks(uint8_t * x, const uint32_t * rk, int nr, int n) noexcept nogil:
+    cdef uint32_t s[4*N_WAYS]
+    cdef uint32_t t[4*N_WAYS]
+    cdef int r, b
+    for b in range(n):
+        load_state(x + 16*b, rk, s + 4*b)
+    for r in range(1, nr - 1, 2):
+        for b in range(n):
+            dec_round(s + 4*b, t + 4*b, rk + 4*r)
+        for b in range(n):
+            dec_round(t + 4*b, s + 4*b, rk + 4*r + 4)
+    for b in range(n):
+        dec_round(s + 4*b, t + 4*b, rk + 4*nr - 4)
+    for b in range(n):
+        dec_last_round(t + 4*b, s + 4*b, rk + 4*nr)
+        store_state(x + 16*b, s + 4*b)
+
+cdef void aes_encrypt_block(uint8_t * x, const uint32_t * rk, int nr) noexcept nogil:
+    encrypt_blocks(x, rk, nr, 1)
+
+cdef void aes_decrypt_block(uint8_t * x, const uint32_t * rk, int nr) noexcept nogil:
+    decrypt_blocks(x, rk, nr, 1)
+
+cdef void aes_encrypt_blocks(uint8_t * x, const uint32_t * rk, int nr) noexcept nogil:
+    encrypt_blocks(x, rk, nr, N_WAYS)
+
+cdef void aes_decrypt_blocks(uint8_t * x, const uint32_t * rk, int nr) noexcept nogil:
+    decrypt_blocks(x, rk, nr, N_WAYS)
+
+# Applies the inverse cipher to a single block, using whichever implementation the crypter was built with
+cdef inline void _inv_cipher(uint8_t * x, const uint32_t * rk, uint8_t * ex_key, uint8_t nr,
+                             bint t_tables) noexcept nogil:
+    if t_tables:
+        aes_decrypt_block(x, rk, nr)
+    else:
+        aes_inv_block_cipher(x, ex_key, nr)
+
+# Encrypts l bytes of data in CBC mode, where prev is the IV
+cdef void _cbc_encrypt_task(uint8_t * data, uint64_t l, const uint8_t * prev, const uint32_t * rk, uint8_t * ex_key,
+                            uint8_t nr, bint t_tables) noexcept nogil:
+    cdef uint64_t i
+    cdef int j
+    for i in range(0, l, 16):  # Feed each ciphered block into the next
+        for j in range(16):
+            data[i+j] ^= prev[j]
+        if t_tables:
+            aes_encrypt_block(data + i, rk, nr)
+        else:
+            aes_block_cipher(data + i, ex_key, nr)
+        prev = data + i
+
+# Encrypts l bytes of data in ECB mode. If interleave is set, the T-table cipher is applied N_WAYS blocks at a time.
+cdef void _ecb_encrypt_task(uint8_t * data, uint64_t l, const uint32_t * rk, uint8_t * ex_key, uint8_t nr,
+                            bint t_tables, bint interleave) noexcept nogil:
+    cdef uint64_t i = 0
+    if t_tables and interleave:
+        while i + 16*N_WAYS <= l:
+            aes_encrypt_blocks(data + i, rk, nr)
+            i += 16*N_WAYS
+    while i < l:
+        if t_tables:
+            aes_encrypt_block(data + i, rk, nr)
+        else:
+            aes_block_cipher(data + i, ex_key, nr)
+        i += 16
+
+# Decrypts l bytes of data in ECB mode, with interleave as in `_ecb_encrypt_task`
+cdef void _ecb_decrypt_task(uint8_t * data, uint64_t l, const uint32_t * rk, uint8_t * ex_key, uint8_t nr,
+                            bint t_tables, bint interleave) noexcept nogil:
+    cdef uint64_t i = 0
+    if t_tables and interleave:
+        while i + 16*N_WAYS <= l:
+            aes_decrypt_blocks(data + i, rk, nr)
+            i += 16*N_WAYS
+    while i < l:
+        _inv_cipher(data + i, rk, ex_key, nr, t_tables)
+        i += 16
+
+# Decrypts l bytes of data in CBC mode, where prev is the ciphertext block preceding the data (or the IV). Blocks are
+# decrypted last to first, so that each is xored with the block before it while that block is still ciphertext.
+# If interleave is set, N_WAYS blocks are decrypted at a time, having first copied the blocks preceding them.
+cdef void _cbc_decrypt_task(uint8_t * data, uint64_t l, const uint8_t * prev, const uint32_t * rk, uint8_t * ex_key,
+                            uint8_t nr, bint t_tables, bint interleave) noexcept nogil:
+    cdef uint64_t i = l
+    cdef int j
+    cdef uint8_t preceding[16*N_WAYS]
+    if t_tables and interleave:
+        while i >= 16*N_WAYS + 16:
+            i -= 16*N_WAYS
+            memcpy(preceding, data + i - 16, 16*N_WAYS)
+            aes_decrypt_blocks(data + i, rk, nr)
+            for j in range(16*N_WAYS):
+                data[i+j] ^= preceding[j]
+    while i > 16:
+        i -= 16
+        _inv_cipher(data + i, rk, ex_key, nr, t_tables)
+        for j in range(16):
+            data[i+j] ^= data[i+j-16]
+    _inv_cipher(data, rk, ex_key, nr, t_tables)
+    for j in range(16):
+        data[j] ^= prev[j]
+
+# Encrypts (or decrypts) l bytes of data in CTR mode, where the counter block of the first block is the 128-bit
+# big-endian integer hi*2**64 + lo, incremented for each block after it. If interleave is set, N_WAYS counter blocks
+# are encrypted at a time.
+cdef void _ctr_task(uint8_t * data, uint64_t l, uint64_t hi, uint64_t lo, const uint32_t * rk, uint8_t * ex_key,
+                    uint8_t nr, bint t_tables, bint interleave) noexcept nogil:
+    cdef uint8_t key_stream[16*N_WAYS]
+    cdef uint64_t i = 0, n
+    cdef int j, b, ways = N_WAYS if t_tables and interleave else 1
+    while i < l:
+        for b in range(ways):
+            for j in range(8):
+                key_stream[16*b+j] = (hi >> (56 - 8*j)) & 0xff
+                key_stream[16*b+8+j] = (lo >> (56 - 8*j)) & 0xff
+            lo += 1
+            if lo == 0:  # Carry into the high half of the counter
+                hi += 1
+        if ways > 1:
+            aes_encrypt_blocks(key_stream, rk, nr)
+        elif t_tables:
+            aes_encrypt_block(key_stream, rk, nr)
+        else:
+            aes_block_cipher(key_stream, ex_key, nr)
+        n = 16*ways if l - i >= 16*ways else l - i
+        for j in range(n):
+            data[i+j] ^= key_stream[j]
+        i += n
+
+# The reduction of each 4 bits shifted off the low end of a GHASH product, by the GCM polynomial
+cdef uint64_t GCM_LAST4[16]
+for _i, _r in enumerate([0x0000, 0x1c20, 0x3840, 0x2460, 0x7080, 0x6ca0, 0x48c0, 0x54e0,
+                         0xe100, 0xfd20, 0xd940, 0xc560, 0x9180, 0x8da0, 0xa9c0, 0xb5e0]):
+    GCM_LAST4[_i] = _r
+
+# Multiplies the block x by the hash key in GF(2^128) in place, 4 bits at a time using tables of the key's products
+# with every 4 bit value (Shoup's method). hh and hl hold the high and low halves of each product.
+cdef void gcm_mult(uint8_t * x, const uint64_t * hh, const uint64_t * hl) noexcept nogil:
+    cdef uint64_t zh, zl, rem
+    cdef int i
+    cdef uint8_t lo, hi
+    lo = x[15] & 0xf
+    zh, zl = hh[lo], hl[lo]
+    for i in range(15, -1, -1):
+        lo, hi = x[i] & 0xf, x[i] >> 4
+        if i != 15:
+            rem = zl & 0xf
+            zl = (zh << 60) | (zl >> 4)
+            zh = (zh >> 4) ^ (GCM_LAST4[rem] << 48)
+            zh ^= hh[lo]
+            zl ^= hl[lo]
+        rem = zl & 0xf
+        zl = (zh << 60) | (zl >> 4)
+        zh = (zh >> 4) ^ (GCM_LAST4[rem] << 48)
+        zh ^= hh[hi]
+        zl ^= hl[hi]
+    for i in range(8):
+        x[i] = (zh >> (56 - 8*i)) & 0xff
+        x[8+i] = (zl >> (56 - 8*i)) & 0xff
+
+# Feeds l bytes of data, a multiple of 16, into the GHASH state y
+cdef void ghash_blocks(uint8_t * y, const uint8_t * data, uint64_t l, const uint64_t * hh,
+                       const uint64_t * hl) noexcept nogil:
+    cdef uint64_t i
+    cdef int j
+    for i in range(0, l, 16):
+        for j in range(16):
+            y[j] ^= data[i+j]
+        gcm_mult(y, hh, hl)
+
+
+cdef class GHash:
+    """ The GHASH function of GCM mode, keyed with a hash key, used to generate GCM authentication tags.
+
+    Works like the hash objects of `hashlib`: the ciphertext is fed incrementally with `update`, and `digest` returns
+    the tag for everything fed so far. The key's multiplication tables are computed once, when the object is created.
+
+    Args:
+        h (bytes): The 16 byte hash key, the encryption of the zero block.
+        mask (bytes): The 16 byte block xored with the hash to make the tag, the encryption of the initial counter
+            block.
+        aad (bytes): Additional data to authenticate, which is not encrypted.
+    """
+    cdef uint64_t hh[16]
+    cdef uint64_t hl[16]
+    cdef uint8_t y[16]
+    cdef uint8_t partial[16]
+    cdef int n_partial
+    cdef uint64_t aad_len, data_len
+    cdef bytes mask
+
+    def __init__(self, h, mask, aad=b''):
+        cdef uint64_t vh = int.from_bytes(h[:8], 'big'), vl = int.from_bytes(h[8:], 'big'), t
+        cdef int i = 4, j
+        # The key's products with 8, 4, 2 and 1 (in GCM's reflected bit order), from which the rest are summed
+        self.hh[0], self.hl[0], self.hh[8], self.hl[8] = 0, 0, vh, vl
+        while i > 0:
+            t = (vl & 1) * 0xe1000000
+            vl = (vh << 63) | (vl >> 1)
+            vh = (vh >> 1) ^ (t << 32)
+            self.hh[i], self.hl[i] = vh, vl
+            i >>= 1
+        i = 2
+        while i <= 8:
+            for j in range(1, i):
+                self.hh[i+j], self.hl[i+j] = self.hh[i] ^ self.hh[j], self.hl[i] ^ self.hl[j]
+            i *= 2
+        memset(self.y, 0, 16)
+        self.mask = bytes(mask)
+        # The additional data is padded with zeros to a whole number of blocks
+        self.n_partial, self.data_len = 0, 0
+        self.update(aad)
+        self._pad()
+        self.aad_len, self.data_len = self.data_len, 0
+
+    # Pads any partial block fed so far with zeros, and feeds it in
+    cdef _pad(self):
+        if self.n_partial:
+            memset(self.partial + self.n_partial, 0, 16 - self.n_partial)
+            ghash_blocks(self.y, self.partial, 16, self.hh, self.hl)
+            self.n_partial = 0
+
+    def update(self, data):
+        """ Feed data to be authenticated. """
+        cdef uint64_t l = len(data), n
+        if l == 0:
+            return
+        cdef const uint8_t[::1] view = data
+        cdef const uint8_t * buffer = &view[0]
+        self.data_len += l
+        if self.n_partial:  # Complete the partial block first
+            n = min(l, 16 - self.n_partial)
+            memcpy(self.partial + self.n_partial, buffer, n)
+            self.n_partial += n
+            buffer, l = buffer + n, l - n
+            if self.n_partial < 16:
+                return
+            self.n_partial = 0
+            ghash_blocks(self.y, self.partial, 16, self.hh, self.hl)
+        n = l // 16 * 16
+        with nogil:
+            ghash_blocks(self.y, buffer, n, self.hh, self.hl)
+        memcpy(self.partial, buffer + n, l - n)
+        self.n_partial = l - n
+
+    def copy(self):
+        """ Return a copy of the object, which can be fed separately. """
+        cdef GHash other = GHash.__new__(GHash)
+        memcpy(other.hh, self.hh, sizeof(self.hh))
+        memcpy(other.hl, self.hl, sizeof(self.hl))
+        memcpy(other.y, self.y, 16)
+        memcpy(other.partial, self.partial, 16)
+        other.n_partial, other.aad_len, other.data_len, other.mask = self.n_partial, self.aad_len, self.data_len, \
+            self.mask
+        return other
+
+    def digest(self):
+        """ Return the 16 byte authentication tag of the data fed so far. """
+        cdef GHash other = self.copy()
+        other._pad()
+        # Finish with the bit lengths of the additional data and the ciphertext
+        lengths = (8*other.aad_len).to_bytes(8, 'big') + (8*other.data_len).to_bytes(8, 'big')
+        ghash_blocks(other.y, lengths, 16, other.hh, other.hl)
+        return bytes(a ^ b for a, b in zip(other.y[:16], self.mask))
+
+
+# Expands a key of nk 32-bit words into the round keys of nr = nk + 6 rounds: as bytes for the byte-oriented cipher,
+# as words for the T-table cipher, and as words for the equivalent inverse cipher, in reverse order and with
+# InvMixColumns applied to the inner round keys
+cdef void expand_key_c(const uint8_t * key, int nk, uint8_t * ex_key, uint32_t * enc_words,
+                       uint32_t * dec_words) noexcept nogil:
+    cdef int i, j, r, nr = nk + 6, n = 4*(nr+1)
+    cdef uint8_t b, b0, b1, b2, b3
+    cdef uint32_t w
+    memcpy(ex_key, key, 4*nk)
+    for i in range(nk, n):
+        b0, b1, b2, b3 = ex_key[4*i-4], ex_key[4*i-3], ex_key[4*i-2], ex_key[4*i-1]
+        if i % nk == 0:
+            b = b0
+            b0 = SBOX[b1] ^ RCON[i // nk - 1]
+            b1, b2, b3 = SBOX[b2], SBOX[b3], SBOX[b]
+        elif nk == 8 and i % nk == 4:
+            b0, b1, b2, b3 = SBOX[b0], SBOX[b1], SBOX[b2], SBOX[b3]
+        ex_key[4*i] = b0 ^ ex_key[4*(i-nk)]
+        ex_key[4*i+1] = b1 ^ ex_key[4*(i-nk)+1]
+        ex_key[4*i+2] = b2 ^ ex_key[4*(i-nk)+2]
+        ex_key[4*i+3] = b3 ^ ex_key[4*(i-nk)+3]
+    for i in range(n):
+        enc_words[i] = <uint32_t>ex_key[4*i] << 24 | <uint32_t>ex_key[4*i+1] << 16 | <uint32_t>ex_key[4*i+2] << 8 | \
+                       ex_key[4*i+3]
+    for r in range(nr+1):
+        for j in range(4):
+            w = enc_words[4*(nr-r)+j]
+            if 0 < r < nr:
+                w = TD0[SBOX[w >> 24]] ^ TD1[SBOX[(w >> 16) & 0xff]] ^ TD2[SBOX[(w >> 8) & 0xff]] ^ TD3[SBOX[w & 0xff]]
+            dec_words[4*r+j] = w
+
+# The number of expanded keys kept, so that crypters made again and again for the same key skip the key expansion
+KEY_CACHE_SIZE = 32
+# Expanded keys, keyed by the SHA-256 digest of the key, from least to most recently used
+_key_cache = OrderedDict()
+_key_cache_lock = Lock()
+
+
+def expand_key(key):
+    """ Expand an AES key, or look up its expansion if it was expanded recently.
+
+    The most recently used `KEY_CACHE_SIZE` expansions are cached, and each is zeroed when evicted. Callers are given
+    copies, which the cache cannot zero, so they are returned as `bytearray` objects that callers can zero themselves
+    once done with them (as `AesCrypter.clear` does). The key itself, and any other copies made of it, are not wiped.
+
+    Args:
+        key (bytes): The 128, 192, or 256 bit key to expand.
+
+    Returns:
+        A tuple `(ex_key, enc_words, dec_words)` of `bytearray` objects: the expanded key, the round key words of the
+        T-table cipher, and those of the equivalent inverse cipher, as native 32-bit unsigned integers.
+
+    Raises:
+        ValueError: If the key is not 16, 24, or 32 bytes long.
+    """
+    if len(key) not in [16, 24, 32]:
+        raise ValueError('AES keys must be 16, 24, or 32 bytes long, not %d.' % len(key))
+    cdef int nk = len(key) // 4, size = 16*(nk + 7)
+    cdef const uint8_t * key_ptr = key
+    cdef uint8_t * buffer
+    digest = hashlib.sha256(key).digest()
+    with _key_cache_lock:
+        schedule = _key_cache.get(digest)
+        if schedule is None:
+            # The expanded key and both sets of round key words share a buffer, each part of it 16-byte aligned
+            schedule = bytearray(3*size)
+            buffer = schedule
+            with nogil:
+                expand_key_c(key_ptr, nk, buffer, <uint32_t *>(buffer+size), <uint32_t *>(buffer+2*size))
+            _key_cache[digest] = schedule
+            if len(_key_cache) > KEY_CACHE_SIZE:
+                clear_schedule(_key_cache.popitem(last=False)[1])
+        else:
+            _key_cache.move_to_end(digest)
+        return schedule[:size], schedule[size:2*size], schedule[2*size:]
+
+
+# Overwrites an expanded key, or part of one, with zeros
+cdef void clear_schedule(bytearray schedule):
+    cdef uint8_t * buffer = schedule
+    memset(buffer, 0, len(schedule))
+
+
+def clear_key_cache():
+    """ Zero and discard every cached key expansion. """
+    with _key_cache_lock:
+        while _key_cache:
+            clear_schedule(_key_cache.popitem()[1])
+
+
 class AesCrypter:
     """ A Crypter object used for encrypting or decrypting arbitrary data using AES in various modes.
 
@@ -119,14 +544,23 @@ class AesCrypter:
 
     Args:
         key (bytes): The 128, 192, or 256 bit key to use to encrypt/decrypt data, as a `bytes` object.
+        t_tables (bool): If `True`, blocks are ciphered a 32-bit column at a time using T-tables, which is several times
+            faster. Otherwise, the byte-oriented implementation following the FIPS 197 pseudocode is used.
+        interleave (bool): If `True`, and T-tables are used, independent blocks (in ECB mode, CBC decryption and the
+            counter modes) are ciphered several at a time with their rounds interleaved, keeping the CPU busy while
+            table lookups are waited on. Output is the same either way.
     """
-    gf = GF_FIELD
     sbox, inv_sbox = PY_SBOX, PY_INV_SBOX
-    modes = ['cbc']
-    auth = ['sha']
+    modes = ['cbc', 'ctr', 'gcm']
+    auth = ['sha', 'b2b', 'gcm']
+    # The number of threads that ECB and CBC decryption and the counter modes run on, and the number of bytes of data
+    # below which they run on a single thread instead, as starting threads would take longer than it saves
+    n_threads = available_cpus()
+    parallel_threshold = 2**20
 
-    def __init__(self, key):
+    def __init__(self, key, t_tables=True, interleave=True):
         self.key = key[:]
+        self.t_tables, self.interleave = t_tables, interleave
         assert len(self.key) in [16, 24, 32]
         # Initialize constants
         self.nb = 4  # Fixed in the FIPS spec
@@ -136,55 +570,62 @@ class AesCrypter:
         self.key_expansion()
 
     def key_expansion(self):
-        # Generate rcon table (only 15 elements--powers of 2 in GF-256)
-        sbox = self.__class__.sbox
-        rcon = [0x01]*15
-        for i in range(1, 15):
-            rcon[i] = GF_FIELD.mult(rcon[i-1], 0x02)
-        # Allocate memory for the expanded key and copy the initial key into it
-        self.ex_key = bytearray(4*self.nb*(self.nr+1))
-        self.ex_key[:len(self.key)] = self.key[:]
-        for i in range(self.nk, self.nb*(self.nr+1)):
-            j = i-1
-            b0, b1, b2, b3 = self.ex_key[4*j], self.ex_key[4*j+1], self.ex_key[4*j+2], self.ex_key[4*j+3]
-            if i % self.nk == 0:
-                b = b0
-                b0 = sbox[b1] ^ rcon[i // self.nk - 1]
-                b1, b2, b3 = sbox[b2], sbox[b3], sbox[b]
-            elif self.nk == 8 and (i % self.nk) == 4:
-                b0, b1, b2, b3 = sbox[b0], sbox[b1], sbox[b2], sbox[b3]
-            self.ex_key[4*i] = b0 ^ self.ex_key[4*(i - self.nk)]
-            self.ex_key[4*i+1] = b1 ^ self.ex_key[4*(i - self.nk)+1]
-            self.ex_key[4*i+2] = b2 ^ self.ex_key[4*(i - self.nk)+2]
-            self.ex_key[4*i+3] = b3 ^ self.ex_key[4*(i - self.nk)+3]
-        self.ex_key = bytes(self.ex_key)
+        self.ex_key, self.enc_words, self.dec_words = expand_key(self.key)
+
+    def clear(self):
+        """ Zero the crypter's expanded key, after which the crypter can no longer be used.
+
+        Only the key expansion is zeroed: the key the crypter was made with is an immutable `bytes` object, and copies
+        of it (or of data it ciphered) that Python has freed may linger in memory.
+        """
+        for schedule in [self.ex_key, self.enc_words, self.dec_words]:
+            if schedule is not None:
+                clear_schedule(schedule)
+        self.ex_key = self.enc_words = self.dec_words = None
 
     def ecb_encrypt(self, data, do_pad=True):
         if do_pad: # Pad the data to a 16 byte block size
             pad(data, 16)
         # Initialize C constants for speed
-        cdef unsigned long long length = len(data)
+        cdef uint64_t length = len(data)
         assert(length % 16 == 0)
-        cdef unsigned long long i
-        cdef unsigned char * buffer = data
+        if length == 0:
+            return
+        cdef unsigned char[::1] view = data
+        cdef unsigned char * buffer = &view[0]
         cdef unsigned char * ex_key = self.ex_key
+        cdef const uint32_t * rk = <const uint32_t *><const unsigned char *>self.enc_words
         cdef unsigned char nr = self.nr
+        cdef bint t_tables = self.t_tables, interleave = self.interleave
         # Cipher each 16-byte block
-        for i in range(0, length, 16):
-            aes_block_cipher(buffer, ex_key, nr)
-            buffer += 16
+        with nogil:
+            _ecb_encrypt_task(buffer, length, rk, ex_key, nr, t_tables, interleave)
 
-    def ecb_decrypt(self, data, do_pad=True):
+    def ecb_decrypt(self, data, do_pad=True, force_single_thread=False):
         # Initialize C constants for speed
-        cdef unsigned long long length = len(data)
+        cdef uint64_t length = len(data)
         assert(length % 16 == 0)
-        cdef unsigned char * buffer = data
+        if length == 0:
+            return
+        cdef unsigned char[::1] view = data
+        cdef unsigned char * buffer = &view[0]
         cdef unsigned char * ex_key = self.ex_key
+        cdef const uint32_t * rk = <const uint32_t *><const unsigned char *>self.dec_words
         cdef unsigned char nr = self.nr
-        # Cipher each 16-byte block
-        for i in range(0, length, 16):
-            aes_inv_block_cipher(buffer, ex_key, nr)
-            buffer += 16
+        cdef bint t_tables = self.t_tables, interleave = self.interleave
+        # Every block is deciphered independently, so large data is split evenly between threads
+        cdef int i, n_threads = self.n_threads
+        cdef uint64_t chunk_size = length//n_threads//16*16
+        if force_single_thread or n_threads == 1 or length < self.parallel_threshold or chunk_size == 0:
+            with nogil:
+                _ecb_decrypt_task(buffer, length, rk, ex_key, nr, t_tables, interleave)
+        else:
+            for i in prange(n_threads, nogil=True):
+                if i == n_threads-1:
+                    _ecb_decrypt_task(buffer+i*chunk_size, length-i*chunk_size, rk, ex_key, nr, t_tables, interleave)
+                else:
+                    _ecb_decrypt_task(buffer+i*chunk_size, chunk_size, rk, ex_key, nr, t_tables, interleave)
+        view = None  # Release the buffer, so that data can be resized
         if do_pad: # Unpad the previously padded data
             unpad(data)
 
@@ -192,56 +633,177 @@ class AesCrypter:
         if do_pad: # Pad the data to a 16 byte block size
             pad(data, 16)
         # Initialize C constants for speed
-        cdef unsigned long long length = len(data)
+        cdef uint64_t length = len(data)
         assert(length % 16 == 0)
-        cdef unsigned long long i
         cdef unsigned char * ex_key = self.ex_key
+        cdef const uint32_t * rk = <const uint32_t *><const unsigned char *>self.enc_words
         cdef unsigned char nr = self.nr
-        cdef unsigned char j
+        cdef bint t_tables = self.t_tables
         if iv is None:  # Generate a random initialization vector, otherwise use the IV passed in
             iv = get_random_bytes(16)
         if implicit:
             # Prepend a random block to the message, so that the IV doesn't have to be stored for decryption
             data[:] = bytearray(get_random_bytes(16)) + data
-        # Xor the first block with the IV and encrypt
-        cdef unsigned char * buffer = data
         length = len(data)
-        for j in range(16):
-            buffer[j] ^= iv[j]
-        aes_block_cipher(buffer, ex_key, nr)
-        buffer += 16
-        for i in range(16, length, 16):  # Feed each ciphered block into the next
-            for j in range(16):
-                buffer[j] ^= buffer[j-16]
-            aes_block_cipher(buffer, ex_key, nr)
-            buffer += 16
+        if length == 0:
+            return
+        cdef unsigned char[::1] view = data
+        cdef unsigned char * buffer = &view[0]
+        cdef bytes iv_bytes = bytes(iv)
+        cdef const unsigned char * prev = iv_bytes
+        # Encryption is serial, but releases the GIL so that separate data can be encrypted on other threads
+        with nogil:
+            _cbc_encrypt_task(buffer, length, prev, rk, ex_key, nr, t_tables)
 
 
-    def cbc_decrypt(self, data, iv=None, do_pad=True):
+    def cbc_decrypt(self, data, iv=None, do_pad=True, force_single_thread=False):
         # Initialize C constants
-        cdef unsigned long long length = len(data)
+        cdef uint64_t length = len(data)
         assert(length % 16 == 0)
-        cdef unsigned long long i
         cdef unsigned char * ex_key = self.ex_key
+        cdef const uint32_t * rk = <const uint32_t *><const unsigned char *>self.dec_words
         cdef unsigned char nr = self.nr
-        cdef unsigned char j
-        cdef unsigned char * buffer = data
-        buffer += length-16
-        for i in range(length-16, 0, -16):
-            # Inverse cipher the block, then xor it with the previous one
-            aes_inv_block_cipher(buffer, ex_key, nr)
-            for j in range(16):
-                buffer[j] ^= buffer[j-16]
-            buffer -= 16
-        if iv:  # If provided an iv, the first block contains meaningful data and we should decrypt it
-            aes_inv_block_cipher(buffer, ex_key, nr)
-            for j in range(16):
-                buffer[j] ^= iv[j]
-        else:  # Otherwise assume it is implicit and slice off the first 16 bytes
+        cdef bint t_tables = self.t_tables, interleave = self.interleave
+        if length == 0:
+            return
+        cdef unsigned char[::1] view = data
+        cdef unsigned char * buffer = &view[0]
+        cdef uint64_t start = 0
+        cdef bint implicit = not iv
+        if implicit:  # If the iv was implicit, the first block is random and serves as the IV for the rest
+            iv = bytes(view[:16])
+            start = 16
+        buffer += start
+        length -= start
+        # Each plaintext block depends only on its own ciphertext block and the one before it, so large data is split
+        # evenly between threads. The ciphertext blocks preceding each thread's chunk are copied out first, since they
+        # may be decrypted by another thread before they are used.
+        cdef int i, n_threads = self.n_threads
+        cdef uint64_t chunk_size = length//n_threads//16*16
+        cdef bytes prevs
+        cdef const unsigned char * prev
+        if force_single_thread or n_threads == 1 or length < self.parallel_threshold or chunk_size == 0:
+            prevs = bytes(iv)
+            prev = prevs
+            with nogil:
+                if length > 0:
+                    _cbc_decrypt_task(buffer, length, prev, rk, ex_key, nr, t_tables, interleave)
+        else:
+            prevs = bytes(iv) + b''.join(view[start+i*chunk_size-16:start+i*chunk_size] for i in range(1, n_threads))
+            prev = prevs
+            for i in prange(n_threads, nogil=True):
+                if i == n_threads-1:
+                    _cbc_decrypt_task(buffer+i*chunk_size, length-i*chunk_size, prev+16*i, rk, ex_key, nr, t_tables,
+                                      interleave)
+                else:
+                    _cbc_decrypt_task(buffer+i*chunk_size, chunk_size, prev+16*i, rk, ex_key, nr, t_tables, interleave)
+        view = None  # Release the buffer, so that data can be resized
+        if implicit:  # If the iv was implicit, slice off the first 16 bytes
             del data[:16]
         if do_pad: # Unpad the previously padded data
             unpad(data)
 
+    def ctr_encrypt(self, data, nonce=None, count=0, force_single_thread=False):
+        """ Encrypt (or decrypt) in-memory data using AES in counter (CTR) mode.
+
+        Block i of the data is xored with the encryption of the counter block `nonce + count + i` (modulo 2**128), so
+        no padding is needed, and any block can be encrypted on its own. Large data is split between threads, each
+        encrypting its own range of counter blocks.
+
+        Since this is a stream cipher mode, encryption is the same as decryption.
+
+        Args:
+            data: Must be either a `bytearray` or some array that is byte-addressable and supports the buffer protocol
+            (`mmap`s and `memoryview`s of these are acceptable arguments as well).
+            nonce (int): If provided, the 128-bit initial counter block. If not provided, a random one is generated.
+            count (int): The number of blocks to advance the counter by before the first block of data.
+            force_single_thread (bool): If `True`, this operation will always run in a single thread.
+
+        Returns:
+            int: The nonce used in this operation.
+        """
+        if nonce is None:
+            nonce = randbits(128)
+        # There is nothing to encrypt in empty data
+        if len(data) == 0:
+            return nonce
+        start = (nonce + count) % 2**128
+        cdef uint64_t hi = start >> 64, lo = start & (2**64 - 1)
+        cdef uint64_t l = len(data)
+        cdef uint8_t[::1] view = data
+        cdef uint8_t * buffer = &view[0]
+        cdef const uint32_t * rk = <const uint32_t *><const unsigned char *>self.enc_words
+        cdef uint8_t * ex_key = self.ex_key
+        cdef uint8_t nr = self.nr
+        cdef bint t_tables = self.t_tables, interleave = self.interleave
+        # Determine the size of each thread's chunk
+        cdef int n_threads = self.n_threads
+        cdef uint64_t chunk_size = l//n_threads//16*16
+        if force_single_thread or n_threads == 1 or l < self.parallel_threshold or chunk_size == 0:
+            with nogil:
+                _ctr_task(buffer, l, hi, lo, rk, ex_key, nr, t_tables, interleave)
+            return nonce
+        # Begin Cython multiprocessing using OpenMP, starting each thread at its chunk's counter block
+        cdef int i
+        cdef uint64_t chunk_lo
+        for i in prange(n_threads, nogil=True):
+            chunk_lo = lo + i*(chunk_size//16)
+            if i == n_threads-1:
+                _ctr_task(buffer+i*chunk_size, l-i*chunk_size, hi + (chunk_lo < lo), chunk_lo, rk, ex_key, nr,
+                          t_tables, interleave)
+            else:
+                _ctr_task(buffer+i*chunk_size, chunk_size, hi + (chunk_lo < lo), chunk_lo, rk, ex_key, nr, t_tables,
+                          interleave)
+        return nonce
+
+    ctr_decrypt = ctr_encrypt
+
+    def gcm_mac(self, nonce, aad=b''):
+        """ Create a `GHash` object, generating the GCM authentication tag of data encrypted with a 12 byte nonce.
+
+        Args:
+            nonce (bytes): The 12 byte nonce the data is encrypted with.
+            aad (bytes): Additional data to authenticate, which is not encrypted.
+
+        Returns:
+            GHash: The `GHash` object, to be fed the encrypted data.
+        """
+        h, mask = bytearray(16), bytearray(nonce + b'\x00\x00\x00\x01')
+        self.ecb_encrypt(h, do_pad=False)
+        self.ecb_encrypt(mask, do_pad=False)
+        return GHash(h, mask, aad)
+
+    def gcm_encrypt(self, data, nonce=None, aad=b'', force_single_thread=False):
+        """ Encrypt in-memory data in place using AES in Galois/counter mode (GCM), and authenticate it.
+
+        The data is encrypted in counter mode, which is split between threads for large data, starting from the
+        counter block following the nonce's initial counter block. The data is limited to 2**32 - 2 blocks.
+
+        Args:
+            data: Must be either a `bytearray` or some array that is byte-addressable and supports the buffer protocol
+            (`mmap`s and `memoryview`s of these are acceptable arguments as well).
+            nonce (bytes): If provided, the 12 byte nonce to use. If not provided, a random one is generated.
+            aad (bytes): Additional data to authenticate, which is not encrypted.
+            force_single_thread (bool): If `True`, encryption will always run in a single thread.
 
+        Returns:
+            tuple: The nonce, and the 16 byte authentication tag.
+        """
+        if nonce is None:
+            nonce = get_random_bytes(12)
+        self.ctr_encrypt(data, int.from_bytes(nonce, 'big') << 32, 2, force_single_thread)
+        mac = self.gcm_mac(nonce, aad)
+        mac.update(data)
+        return nonce, mac.digest()
 
+    def gcm_decrypt(self, data, nonce, tag, aad=b'', force_single_thread=False):
+        """ Authenticate in-memory data encrypted using AES in GCM mode, then decrypt it in place.
 
+        Arguments are as in `gcm_encrypt`, with tag the 16 byte authentication tag. Raises a `ValueError` if the data
+        fails authentication, leaving it encrypted.
+        """
+        mac = self.gcm_mac(nonce, aad)
+        mac.update(data)
+        if not hmac.compare_digest(mac.digest(), tag):
+            raise ValueError('GCM authentication tags not equal.')
+        self.ctr_decrypt(data, int.from_bytes(nonce, 'big') << 32, 2, force_single_thread)
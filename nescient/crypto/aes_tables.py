@@ -0,0 +1,116 @@
+# Nescient: A Python program for packing/unpacking encrypted, salted, and authenticated file containers.
+# Copyright (C) 2018 Ariel Antonitis. Licensed under the MIT license.
+#
+# nescient/crypto/aes_tables.py
+""" Functions for generating the lookup tables used by the AES cipher, and writing them out as a C header.
+
+The tables are constants of the algorithm, so rather than being computed each time `nescient.crypto.aes` is imported,
+they are generated once by running this module and compiled into the extension from `aes_tables.h`:
+
+    python -m nescient.crypto.aes_tables
+"""
+import os
+
+from nescient.crypto.galois import GaloisField
+
+GF_FIELD = GaloisField(2, 8, 283, 3)
+HEADER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'aes_tables.h')
+
+
+def make_sboxes():
+    """ Generate the AES sbox and inverse sbox from scratch.
+
+    Returns:
+        A tuple `(sbox, inv_sbox)` where each is a `bytes` object of length 256, where `b[i]` corresponds to the
+    substitution for byte i.
+    """
+    # Begin with the inverses over GF-256
+    sbox = [GF_FIELD.inverse(i) for i in GF_FIELD.f]
+    # Perform the affine transformation
+    c = 0x63
+    for i in range(256):
+        b = sbox[i]
+        sbox[i] = 0
+        for j in range(8):
+            sbox[i] ^= ((b >> j & 1) ^ (b >> ((j + 4) % 8) & 1) ^ (b >> ((j + 5) % 8) & 1) ^
+                        (b >> ((j + 6) % 8) & 1) ^ (b >> ((j + 7) % 8) & 1) ^ (c >> j & 1)) << j
+    inv_sbox = [0]*256
+    for i in range(256):
+        inv_sbox[sbox[i]] = i  # Map indices to values and vice versa
+    return bytes(sbox), bytes(inv_sbox)
+
+
+def make_mult_lookups():
+    """ Generate the tables of products over GF-256 by each of the constants used by MixColumns and its inverse.
+
+    Returns:
+        A dictionary mapping each constant to a `bytes` object of length 256, where `b[i]` is the product of i and it.
+    """
+    return {const: bytes([GF_FIELD.mult(const, i) for i in GF_FIELD.f]) for const in [0x02, 0x03, 0x09, 0x0b, 0x0d,
+                                                                                        0x0e]}
+
+
+def make_t_tables(sbox, inv_sbox, ms):
+    """ Generate the T-tables of the word-oriented AES cipher and inverse cipher.
+
+    Each entry of a T-table combines SubBytes and MixColumns (or their inverses) for a single byte, as a 32-bit
+    big-endian column. The tables for each row are rotations of the first, which folds ShiftRows into table lookups.
+
+    Returns:
+        A tuple `(te, td)` of lists of four 256-entry lists, each holding the encryption and decryption T-tables.
+    """
+    te0 = [ms[0x02][s] << 24 | s << 16 | s << 8 | ms[0x03][s] for s in sbox]
+    td0 = [ms[0x0e][s] << 24 | ms[0x09][s] << 16 | ms[0x0d][s] << 8 | ms[0x0b][s] for s in inv_sbox]
+    rotate = lambda w, n: (w >> n | w << (32 - n)) & 0xffffffff
+    return [[rotate(w, 8*i) if i else w for w in te0] for i in range(4)], \
+           [[rotate(w, 8*i) if i else w for w in td0] for i in range(4)]
+
+
+def make_rcon():
+    """ Generate the round constants of the key expansion (only 15 elements--powers of 2 in GF-256). """
+    rcon = [0x01]*15
+    for i in range(1, 15):
+        rcon[i] = GF_FIELD.mult(rcon[i-1], 0x02)
+    return bytes(rcon)
+
+
+def make_tables():
+    """ Generate every AES lookup table.
+
+    Returns:
+        A dictionary mapping the C name of each table to a list of its entries.
+    """
+    sbox, inv_sbox = make_sboxes()
+    ms = make_mult_lookups()
+    te, td = make_t_tables(sbox, inv_sbox, ms)
+    tables = {'SBOX': list(sbox), 'INV_SBOX': list(inv_sbox), 'RCON': list(make_rcon())}
+    tables.update(('M%X' % const, list(table)) for const, table in ms.items())
+    tables.update(('TE%d' % i, table) for i, table in enumerate(te))
+    tables.update(('TD%d' % i, table) for i, table in enumerate(td))
+    return tables
+
+
+# Formats a table as a C array definition, eight entries to a line
+def _c_array(name, table):
+    word = any(v > 0xff for v in table)
+    c_type, fmt = ('uint32_t', '0x%08xU') if word else ('unsigned char', '0x%02x')
+    lines = [', '.join(fmt % v for v in table[i:i+8]) for i in range(0, len(table), 8)]
+    return 'static const %s %s[%d] = {\n    %s\n};\n' % (c_type, name, len(table), ',\n    '.join(lines))
+
+
+def write_header(path=HEADER_PATH):
+    """ Write the AES lookup tables to a C header.
+
+    Args:
+        path (str): The path of the header to write. Defaults to `aes_tables.h`, next to this module.
+    """
+    with open(path, 'w') as f:
+        f.write('/* Lookup tables for nescient/crypto/aes.pyx. Generated by nescient/crypto/aes_tables.py; do not '
+                'edit. */\n#ifndef NESCIENT_AES_TABLES_H\n#define NESCIENT_AES_TABLES_H\n\n#include <stdint.h>\n')
+        for name, table in make_tables().items():
+            f.write('\n' + _c_array(name, table))
+        f.write('\n#endif\n')
+
+
+if __name__ == '__main__':
+    write_header()
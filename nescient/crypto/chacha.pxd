@@ -1,4 +1,4 @@
 from libc.stdint cimport uint8_t, uint32_t, uint64_t
 
-cdef void _chacha_task(uint32_t * key_w, uint8_t * data, uint32_t * nonce_w, uint32_t count,
-                       uint64_t l) nogil
\ No newline at end of file
+cdef void _chacha_task(uint32_t * key_w, uint8_t * data, uint32_t * nonce_w, uint64_t count,
+                       uint64_t l, bint wide) noexcept nogil
\ No newline at end of file
@@ -4,21 +4,23 @@
 # nescient/crypto/chacha.pyx
 """ Classes and (Cython) functions for working with the ChaCha20 stream cipher.
 
-See RFC 7539 for the cipher specification.
+See RFC 7539 for the cipher specification, and for the Poly1305 authenticator and the AEAD construction combining the
+two.
 """
-# TODO: Documentation, determine when to multiprocess, implement poly1305 auth tags
+# TODO: Documentation
 from cpython.mem cimport PyMem_Malloc, PyMem_Free
 
 import sys
+import hmac
 from time import sleep
-from multiprocessing import cpu_count, Process, active_children
+from multiprocessing import Process, active_children
 from multiprocessing.sharedctypes import RawArray
 from ctypes import c_ubyte
 from cython.parallel import prange
-from libc.stdlib cimport malloc, free
+from libc.string cimport memcpy, memset
 from libc.stdint cimport uint32_t, uint8_t, uint64_t
 
-from nescient.crypto.tools import randbits
+from nescient.crypto.tools import randbits, available_cpus
 
 
 # Little endian bytes to 32-bit words conversion
@@ -45,20 +47,6 @@ cdef uint32_t * bytes_to_words(uint8_t * b, uint64_t l):
 cdef bint big_endian = sys.byteorder == 'big'
 
 
-# byteswap
-cdef void byte_swap(uint8_t * b, uint64_t l) nogil:
-    cdef uint64_t i
-    cdef uint8_t temp
-    for i in range(0, l, 4):
-        temp = b[i]
-        b[i] = b[i+3]
-        b[i+3] = temp
-        temp = b[i+1]
-        b[i+1] = b[i+2]
-        b[i+2] = temp
-    return
-
-
 # # Display a bytes object as hex
 # def display_hex(data):
 #     for i in range(0, len(data), 16):
@@ -72,111 +60,303 @@ cdef void byte_swap(uint8_t * b, uint64_t l) nogil:
 #     x[i] = x[i] + x[j]; x[l] = x[l] ^ x[i]; x[l] = (x[l] << 8) | (x[l] >> 24)
 #     x[k] = x[k] + x[l]; x[j] = x[j] ^ x[k]; x[j] = (x[j] << 7) | (x[j] >> 25)
 
-# Generates 64 keystream bytes from a 256-bit key, a 96-bit nonce, and a 32-bit counter
-cdef void chacha20(uint8_t * key_stream, uint32_t * key, uint32_t * nonce, uint32_t count) nogil:
-    cdef uint32_t state[16]
-    cdef uint32_t start_state[16]
-    cdef uint8_t i
-    # First four words are constants
-    state[0] = 0x61707865; state[1] = 0x3320646e; state[2] = 0x79622d32; state[3] = 0x6b206574
-    # Words 4-11 are the key
-    state[4] = key[0]; state[5] = key[1]; state[6] = key[2]; state[7] = key[3]; state[8] = key[4]; state[9] = key[5]
-    state[10] = key[6]; state[11] = key[7]
-    # Word 12 is the count
-    state[12] = count
-    # Words 13-15 are the nonce
-    state[13] = nonce[0]; state[14] = nonce[1]; state[15] = nonce[2]
+# The number of blocks computed at once. The state of each block is kept in its own lane of 16 arrays of N_WAYS words,
+# one per state word, so that each step of a quarter round is the same operation over every lane, which compilers
+# turn into SIMD instructions
+cdef enum:
+    N_WAYS = 8
+
+
+cdef inline uint32_t rotl(uint32_t x, int n) noexcept nogil:
+    return (x << n) | (x >> (32 - n))
+
+
+# A ChaCha quarter round on the words a, b, c, d of every lane
+cdef inline void quarter_round(uint32_t * x, int a, int b, int c, int d) noexcept nogil:
+    cdef uint32_t * xa = x + a*N_WAYS
+    cdef uint32_t * xb = x + b*N_WAYS
+    cdef uint32_t * xc = x + c*N_WAYS
+    cdef uint32_t * xd = x + d*N_WAYS
+    cdef int k
+    for k in range(N_WAYS):
+        xa[k] += xb[k]; xd[k] = rotl(xd[k] ^ xa[k], 16)
+        xc[k] += xd[k]; xb[k] = rotl(xb[k] ^ xc[k], 12)
+        xa[k] += xb[k]; xd[k] = rotl(xd[k] ^ xa[k], 8)
+        xc[k] += xd[k]; xb[k] = rotl(xb[k] ^ xc[k], 7)
+
+
+# Generates the key stream of N_WAYS consecutive blocks from a 256-bit key, a 96-bit nonce, and a 32-bit counter, as
+# 16 arrays of N_WAYS native words (word i of block k at x[i*N_WAYS+k]). If wide, the counter is instead 64-bit and
+# takes the place of the first word of the nonce, as in the original ChaCha layout.
+cdef inline void chacha20_blocks(uint32_t * x, const uint32_t * key, const uint32_t * nonce, uint64_t count,
+                                 bint wide) noexcept nogil:
+    cdef uint32_t start_state[16*N_WAYS]
+    cdef int i, k
+    for k in range(N_WAYS):
+        # First four words are constants
+        x[k] = 0x61707865; x[N_WAYS+k] = 0x3320646e; x[2*N_WAYS+k] = 0x79622d32; x[3*N_WAYS+k] = 0x6b206574
+        # Words 4-11 are the key
+        for i in range(8):
+            x[(4+i)*N_WAYS+k] = key[i]
+        # Word 12 is the count (and word 13 its high word, if wide), and words 13-15 are the nonce
+        x[12*N_WAYS+k] = <uint32_t>(count + k)
+        x[13*N_WAYS+k] = <uint32_t>((count + k) >> 32) if wide else nonce[0]
+        x[14*N_WAYS+k] = nonce[1]; x[15*N_WAYS+k] = nonce[2]
     # Copy the state into the start state for later
-    for i in range(16):
-        start_state[i] = state[i]
-    # Perform the ChaCha20 rounds
+    memcpy(start_state, x, sizeof(start_state))
+    # Perform the ChaCha20 rounds, alternating column and diagonal rounds
     for i in range(10):
-        # Quarter round 0, 4, 8, 12
-        state[0] = state[0] + state[4]; state[12] = state[12] ^ state[0]; state[12] = (state[12] << 16) | (state[12] >> 16)
-        state[8] = state[8] + state[12]; state[4] = state[4] ^ state[8]; state[4] = (state[4] << 12) | (state[4] >> 20)
-        state[0] = state[0] + state[4]; state[12] = state[12] ^ state[0]; state[12] = (state[12] << 8) | (state[12] >> 24)
-        state[8] = state[8] + state[12]; state[4] = state[4] ^ state[8]; state[4] = (state[4] << 7) | (state[4] >> 25)
-        # Quarter round 1, 5, 9, 13
-        state[1] = state[1] + state[5]; state[13] = state[13] ^ state[1]; state[13] = (state[13] << 16) | (state[13] >> 16)
-        state[9] = state[9] + state[13]; state[5] = state[5] ^ state[9]; state[5] = (state[5] << 12) | (state[5] >> 20)
-        state[1] = state[1] + state[5]; state[13] = state[13] ^ state[1]; state[13] = (state[13] << 8) | (state[13] >> 24)
-        state[9] = state[9] + state[13]; state[5] = state[5] ^ state[9]; state[5] = (state[5] << 7) | (state[5] >> 25)
-        # Quarter round 2, 6, 10, 14
-        state[2] = state[2] + state[6]; state[14] = state[14] ^ state[2]; state[14] = (state[14] << 16) | (state[14] >> 16)
-        state[10] = state[10] + state[14]; state[6] = state[6] ^ state[10]; state[6] = (state[6] << 12) | (state[6] >> 20)
-        state[2] = state[2] + state[6]; state[14] = state[14] ^ state[2]; state[14] = (state[14] << 8) | (state[14] >> 24)
-        state[10] = state[10] + state[14]; state[6] = state[6] ^ state[10]; state[6] = (state[6] << 7) | (state[6] >> 25)
-        # Quarter round 3, 7, 11, 15
-        state[3] = state[3] + state[7]; state[15] = state[15] ^ state[3]; state[15] = (state[15] << 16) | (state[15] >> 16)
-        state[11] = state[11] + state[15]; state[7] = state[7] ^ state[11]; state[7] = (state[7] << 12) | (state[7] >> 20)
-        state[3] = state[3] + state[7]; state[15] = state[15] ^ state[3]; state[15] = (state[15] << 8) | (state[15] >> 24)
-        state[11] = state[11] + state[15]; state[7] = state[7] ^ state[11]; state[7] = (state[7] << 7) | (state[7] >> 25)
-        # Quarter round 0, 5, 10, 15
-        state[0] = state[0] + state[5]; state[15] = state[15] ^ state[0]; state[15] = (state[15] << 16) | (state[15] >> 16)
-        state[10] = state[10] + state[15]; state[5] = state[5] ^ state[10]; state[5] = (state[5] << 12) | (state[5] >> 20)
-        state[0] = state[0] + state[5]; state[15] = state[15] ^ state[0]; state[15] = (state[15] << 8) | (state[15] >> 24)
-        state[10] = state[10] + state[15]; state[5] = state[5] ^ state[10]; state[5] = (state[5] << 7) | (state[5] >> 25)
-        # Quarter round 1, 6, 11, 12
-        state[1] = state[1] + state[6]; state[12] = state[12] ^ state[1]; state[12] = (state[12] << 16) | (state[12] >> 16)
-        state[11] = state[11] + state[12]; state[6] = state[6] ^ state[11]; state[6] = (state[6] << 12) | (state[6] >> 20)
-        state[1] = state[1] + state[6]; state[12] = state[12] ^ state[1]; state[12] = (state[12] << 8) | (state[12] >> 24)
-        state[11] = state[11] + state[12]; state[6] = state[6] ^ state[11]; state[6] = (state[6] << 7) | (state[6] >> 25)
-        # Quarter round 2, 7, 8, 13
-        state[2] = state[2] + state[7]; state[13] = state[13] ^ state[2]; state[13] = (state[13] << 16) | (state[13] >> 16)
-        state[8] = state[8] + state[13]; state[7] = state[7] ^ state[8]; state[7] = (state[7] << 12) | (state[7] >> 20)
-        state[2] = state[2] + state[7]; state[13] = state[13] ^ state[2]; state[13] = (state[13] << 8) | (state[13] >> 24)
-        state[8] = state[8] + state[13]; state[7] = state[7] ^ state[8]; state[7] = (state[7] << 7) | (state[7] >> 25)
-        # Quarter round 3, 4, 9, 14
-        state[3] = state[3] + state[4]; state[14] = state[14] ^ state[3]; state[14] = (state[14] << 16) | (state[14] >> 16)
-        state[9] = state[9] + state[14]; state[4] = state[4] ^ state[9]; state[4] = (state[4] << 12) | (state[4] >> 20)
-        state[3] = state[3] + state[4]; state[14] = state[14] ^ state[3]; state[14] = (state[14] << 8) | (state[14] >> 24)
-        state[9] = state[9] + state[14]; state[4] = state[4] ^ state[9]; state[4] = (state[4] << 7) | (state[4] >> 25)
+        quarter_round(x, 0, 4, 8, 12)
+        quarter_round(x, 1, 5, 9, 13)
+        quarter_round(x, 2, 6, 10, 14)
+        quarter_round(x, 3, 7, 11, 15)
+        quarter_round(x, 0, 5, 10, 15)
+        quarter_round(x, 1, 6, 11, 12)
+        quarter_round(x, 2, 7, 8, 13)
+        quarter_round(x, 3, 4, 9, 14)
     # Add the original state with the result
-    for i in range(16):
-        state[i] += start_state[i]
-    # Cast to bytes, and byteswap if necessary
-    cdef uint8_t * b = <uint8_t *>(state)
-    for i in range(64):
-        key_stream[i] = b[i]
+    for i in range(16*N_WAYS):
+        x[i] += start_state[i]
+
+
+# Byte swaps a 32-bit word on big endian systems, so that words are serialized little endian
+cdef inline uint32_t to_little(uint32_t w) noexcept nogil:
     if big_endian:
-        byte_swap(key_stream, 64)
-    return
+        return (w >> 24) | ((w >> 8) & 0xff00) | ((w << 8) & 0xff0000) | (w << 24)
+    return w
 
-cdef void _chacha_task(uint32_t * key_w, uint8_t * data, uint32_t * nonce_w, uint32_t count,
-                       uint64_t l) nogil:
-    # Initialize counter and working variables
-    cdef uint32_t counter = count
-    cdef uint32_t n_blocks = <uint32_t>(l//64)
-    cdef uint8_t * key_stream = <uint8_t *>malloc(64)
-    cdef uint8_t * buffer = data
-    cdef uint32_t i
-    cdef uint8_t j
-    for i in range(n_blocks):
-        chacha20(key_stream, key_w, nonce_w, counter+i)
-        for j in range(64):
-            buffer[j] ^= key_stream[j]
-        buffer += 64
-    i = n_blocks
-    if l % 64 != 0:
-        chacha20(key_stream, key_w, nonce_w, counter+i)
-        for j in range(l % 64):
-            buffer[j] ^= key_stream[j]
-    free(key_stream)
+
+cdef void _chacha_task(uint32_t * key_w, uint8_t * data, uint32_t * nonce_w, uint64_t count,
+                       uint64_t l, bint wide) noexcept nogil:
+    cdef uint32_t x[16*N_WAYS]
+    cdef uint32_t w
+    cdef uint8_t key_stream[64]
+    cdef uint64_t pos = 0
+    cdef uint64_t counter = count
+    cdef int i, k
+    cdef uint64_t j, n
+    # XOR whole groups of N_WAYS blocks a word at a time, straight into the data
+    while l - pos >= 64*N_WAYS:
+        chacha20_blocks(x, key_w, nonce_w, counter, wide)
+        for k in range(N_WAYS):
+            for i in range(16):
+                memcpy(&w, data + pos + 4*i, 4)
+                w ^= to_little(x[i*N_WAYS+k])
+                memcpy(data + pos + 4*i, &w, 4)
+            pos += 64
+        counter += N_WAYS
+    # The remaining blocks are XORed a byte at a time, through a block of key stream
+    if pos < l:
+        chacha20_blocks(x, key_w, nonce_w, counter, wide)
+        for k in range(N_WAYS):
+            if pos >= l:
+                break
+            for i in range(16):
+                w = to_little(x[i*N_WAYS+k])
+                memcpy(key_stream + 4*i, &w, 4)
+            n = l - pos if l - pos < 64 else 64
+            for j in range(n):
+                data[pos+j] ^= key_stream[j]
+            pos += n
     return
 
+
+# Little endian load of a 32-bit word
+cdef inline uint32_t load32(const uint8_t * b) noexcept nogil:
+    return b[0] | (<uint32_t>b[1] << 8) | (<uint32_t>b[2] << 16) | (<uint32_t>b[3] << 24)
+
+
+# Little endian store of a 32-bit word
+cdef inline void store32(uint8_t * b, uint32_t w) noexcept nogil:
+    b[0] = w & 0xff; b[1] = (w >> 8) & 0xff; b[2] = (w >> 16) & 0xff; b[3] = w >> 24
+
+
+# Feeds l bytes (a multiple of 16) of 16-byte blocks into the Poly1305 accumulator h, computing h = (h + block)*r mod
+# 2**130 - 5 for each. Numbers are held in five 26-bit limbs, so that products of limbs fit in 64 bits. hibit is the
+# bit above each block (1 << 24 in the top limb), which is left out of a final partial block, padded by hand.
+cdef void poly1305_blocks(uint32_t * h, const uint32_t * r, const uint8_t * m, uint64_t l,
+                          uint32_t hibit) noexcept nogil:
+    cdef uint32_t r0 = r[0], r1 = r[1], r2 = r[2], r3 = r[3], r4 = r[4]
+    # Multiples of 5 fold the limbs of products above 2**130 back in, as 2**130 = 5 mod 2**130 - 5
+    cdef uint32_t s1 = r1*5, s2 = r2*5, s3 = r3*5, s4 = r4*5
+    cdef uint32_t h0 = h[0], h1 = h[1], h2 = h[2], h3 = h[3], h4 = h[4]
+    cdef uint64_t d0, d1, d2, d3, d4
+    cdef uint32_t c
+    cdef uint64_t i
+    for i in range(0, l, 16):
+        h0 += load32(m + i) & 0x3ffffff
+        h1 += (load32(m + i + 3) >> 2) & 0x3ffffff
+        h2 += (load32(m + i + 6) >> 4) & 0x3ffffff
+        h3 += (load32(m + i + 9) >> 6) & 0x3ffffff
+        h4 += (load32(m + i + 12) >> 8) | hibit
+        d0 = <uint64_t>h0*r0 + <uint64_t>h1*s4 + <uint64_t>h2*s3 + <uint64_t>h3*s2 + <uint64_t>h4*s1
+        d1 = <uint64_t>h0*r1 + <uint64_t>h1*r0 + <uint64_t>h2*s4 + <uint64_t>h3*s3 + <uint64_t>h4*s2
+        d2 = <uint64_t>h0*r2 + <uint64_t>h1*r1 + <uint64_t>h2*r0 + <uint64_t>h3*s4 + <uint64_t>h4*s3
+        d3 = <uint64_t>h0*r3 + <uint64_t>h1*r2 + <uint64_t>h2*r1 + <uint64_t>h3*r0 + <uint64_t>h4*s4
+        d4 = <uint64_t>h0*r4 + <uint64_t>h1*r3 + <uint64_t>h2*r2 + <uint64_t>h3*r1 + <uint64_t>h4*r0
+        # Partially reduce, carrying each limb into the next
+        c = <uint32_t>(d0 >> 26); h0 = <uint32_t>d0 & 0x3ffffff
+        d1 += c; c = <uint32_t>(d1 >> 26); h1 = <uint32_t>d1 & 0x3ffffff
+        d2 += c; c = <uint32_t>(d2 >> 26); h2 = <uint32_t>d2 & 0x3ffffff
+        d3 += c; c = <uint32_t>(d3 >> 26); h3 = <uint32_t>d3 & 0x3ffffff
+        d4 += c; c = <uint32_t>(d4 >> 26); h4 = <uint32_t>d4 & 0x3ffffff
+        h0 += c*5; c = h0 >> 26; h0 &= 0x3ffffff
+        h1 += c
+    h[0], h[1], h[2], h[3], h[4] = h0, h1, h2, h3, h4
+
+
+# Fully reduces the accumulator h mod 2**130 - 5 and adds s to it, writing the 16 byte tag
+cdef void poly1305_finish(uint8_t * tag, uint32_t * h, const uint32_t * s) noexcept nogil:
+    cdef uint32_t h0 = h[0], h1 = h[1], h2 = h[2], h3 = h[3], h4 = h[4], c, mask
+    cdef uint32_t g0, g1, g2, g3, g4
+    cdef uint64_t f
+    c = h1 >> 26; h1 &= 0x3ffffff
+    h2 += c; c = h2 >> 26; h2 &= 0x3ffffff
+    h3 += c; c = h3 >> 26; h3 &= 0x3ffffff
+    h4 += c; c = h4 >> 26; h4 &= 0x3ffffff
+    h0 += c*5; c = h0 >> 26; h0 &= 0x3ffffff
+    h1 += c
+    # Compute h - p = h + 5 - 2**130, and select it in constant time if it is not negative
+    g0 = h0 + 5; c = g0 >> 26; g0 &= 0x3ffffff
+    g1 = h1 + c; c = g1 >> 26; g1 &= 0x3ffffff
+    g2 = h2 + c; c = g2 >> 26; g2 &= 0x3ffffff
+    g3 = h3 + c; c = g3 >> 26; g3 &= 0x3ffffff
+    g4 = h4 + c - (1 << 26)
+    mask = (g4 >> 31) - 1
+    h0 = (h0 & ~mask) | (g0 & mask); h1 = (h1 & ~mask) | (g1 & mask); h2 = (h2 & ~mask) | (g2 & mask)
+    h3 = (h3 & ~mask) | (g3 & mask); h4 = (h4 & ~mask) | (g4 & mask)
+    # Pack the limbs into 32-bit words (mod 2**128), and add s
+    h0 = h0 | (h1 << 26)
+    h1 = (h1 >> 6) | (h2 << 20)
+    h2 = (h2 >> 12) | (h3 << 14)
+    h3 = (h3 >> 18) | (h4 << 8)
+    f = <uint64_t>h0 + s[0]; store32(tag, <uint32_t>f)
+    f = <uint64_t>h1 + s[1] + (f >> 32); store32(tag + 4, <uint32_t>f)
+    f = <uint64_t>h2 + s[2] + (f >> 32); store32(tag + 8, <uint32_t>f)
+    f = <uint64_t>h3 + s[3] + (f >> 32); store32(tag + 12, <uint32_t>f)
+
+
+cdef class Poly1305:
+    """ The Poly1305 one-time authenticator, keyed with a 32 byte one-time key.
+
+    Works like the hash objects of `hashlib`: data is fed incrementally with `update`, and `digest` returns the tag for
+    everything fed so far. If additional data is given, tags are those of the AEAD construction of RFC 7539 instead,
+    authenticating the additional data, then the data fed, each padded to a whole number of blocks, then their lengths.
+
+    Args:
+        key (bytes): The 32 byte one-time key. A key must never be used to authenticate more than one message.
+        aad (bytes): If not `None`, additional data to authenticate, which is not encrypted.
+    """
+    cdef uint32_t r[5]
+    cdef uint32_t h[5]
+    cdef uint32_t s[4]
+    cdef uint8_t partial[16]
+    cdef int n_partial
+    cdef bint aead
+    cdef uint64_t aad_len, data_len
+
+    def __init__(self, key, aad=None):
+        cdef const uint8_t[::1] view = key
+        cdef const uint8_t * k = &view[0]
+        assert len(key) == 32
+        # r is clamped, clearing the bits that keep the limb products from overflowing
+        self.r[0] = load32(k) & 0x3ffffff
+        self.r[1] = (load32(k + 3) >> 2) & 0x3ffff03
+        self.r[2] = (load32(k + 6) >> 4) & 0x3ffc0ff
+        self.r[3] = (load32(k + 9) >> 6) & 0x3f03fff
+        self.r[4] = (load32(k + 12) >> 8) & 0x00fffff
+        self.s[0], self.s[1], self.s[2], self.s[3] = load32(k + 16), load32(k + 20), load32(k + 24), load32(k + 28)
+        memset(self.h, 0, sizeof(self.h))
+        self.n_partial, self.data_len, self.aead = 0, 0, aad is not None
+        if self.aead:  # The additional data is padded with zeros to a whole number of blocks
+            self.update(aad)
+            self._pad()
+        self.aad_len, self.data_len = self.data_len, 0
+
+    # Pads any partial block fed so far with zeros, and feeds it in as a whole block
+    cdef _pad(self):
+        if self.n_partial:
+            memset(self.partial + self.n_partial, 0, 16 - self.n_partial)
+            poly1305_blocks(self.h, self.r, self.partial, 16, 1 << 24)
+            self.n_partial = 0
+
+    def update(self, data):
+        """ Feed data to be authenticated. """
+        cdef uint64_t l = len(data), n
+        if l == 0:
+            return
+        cdef const uint8_t[::1] view = data
+        cdef const uint8_t * buffer = &view[0]
+        self.data_len += l
+        if self.n_partial:  # Complete the partial block first
+            n = min(l, 16 - self.n_partial)
+            memcpy(self.partial + self.n_partial, buffer, n)
+            self.n_partial += n
+            buffer, l = buffer + n, l - n
+            if self.n_partial < 16:
+                return
+            self.n_partial = 0
+            poly1305_blocks(self.h, self.r, self.partial, 16, 1 << 24)
+        n = l // 16 * 16
+        with nogil:
+            poly1305_blocks(self.h, self.r, buffer, n, 1 << 24)
+        memcpy(self.partial, buffer + n, l - n)
+        self.n_partial = l - n
+
+    def copy(self):
+        """ Return a copy of the object, which can be fed separately. """
+        cdef Poly1305 other = Poly1305.__new__(Poly1305)
+        memcpy(other.r, self.r, sizeof(self.r))
+        memcpy(other.h, self.h, sizeof(self.h))
+        memcpy(other.s, self.s, sizeof(self.s))
+        memcpy(other.partial, self.partial, 16)
+        other.n_partial, other.aead, other.aad_len, other.data_len = self.n_partial, self.aead, self.aad_len, \
+            self.data_len
+        return other
+
+    def digest(self):
+        """ Return the 16 byte authentication tag of the data fed so far. """
+        cdef Poly1305 other = self.copy()
+        cdef uint8_t tag[16]
+        if other.aead:  # Finish with the lengths of the additional data and the data
+            other._pad()
+            lengths = other.aad_len.to_bytes(8, 'little') + other.data_len.to_bytes(8, 'little')
+            poly1305_blocks(other.h, other.r, lengths, 16, 1 << 24)
+        elif other.n_partial:  # A final partial block is followed by a 1 byte, then padded with zeros
+            other.partial[other.n_partial] = 1
+            memset(other.partial + other.n_partial + 1, 0, 15 - other.n_partial)
+            poly1305_blocks(other.h, other.r, other.partial, 16, 0)
+        poly1305_finish(tag, other.h, other.s)
+        return bytes(tag[:16])
+
+
+# Converts a nonce into an array of 32-bit words, laid out as the last three words of the state. A 64-bit nonce takes
+# the last two words, the one before them holding the high word of the counter.
+cdef uint32_t * nonce_to_words(nonce, bint wide):
+    return bytes_to_words((nonce << 32 if wide else nonce).to_bytes(12, 'little'), 12)
+
 #foo
 class ChaChaCrypter:
     """ A Crypter object used for encrypting or decrypting arbitrary data using the ChaCha stream cipher.
 
     Attributes:
-        modes (list): A list of cipher modes supported by the algorithm.
+        modes (list): A list of cipher modes supported by the algorithm: 'stm' is ChaCha20 as specified in RFC 7539,
+            with a 96-bit nonce and a 32-bit counter, and 'c64' the original ChaCha20 layout, with a 64-bit nonce and a
+            64-bit counter, for data beyond the 256 GiB a 32-bit counter allows.
         auth (list): A list of authentication modes supported by the algorithm.
 
     Args:
         key (bytes): The 256 bit key used to encrypt/decrypt data.
     """
-    modes = ['stm']  # Represents stream cipher mode
-    auth = ['sha']
+    modes = ['stm', 'c64']  # Represents stream cipher mode, and stream cipher mode with a 64-bit counter
+    auth = ['sha', 'b2b', 'ply']
+    # The default number of threads to encrypt on: the CPUs that this process can actually use
+    n_threads = available_cpus()
+    # Data shorter than this many bytes is encrypted on a single thread, as starting threads would take longer than it
+    # saves, and each thread is given at least min_thread_chunk bytes. `nescient.timing.calibrate_threads` measures
+    # both for the current machine, and `nescient.timing.load_thread_tuning` applies them.
+    parallel_threshold = 2**20
+    min_thread_chunk = 2**18
 
     def __init__(self, key):
         assert len(key) == 32
@@ -185,49 +365,59 @@ class ChaChaCrypter:
         self.chacha_decrypt = self.chacha_encrypt
 
     # The function that actually performs ChaCha encryption/decryption
-    def _chacha_task(self, data, nonce, count=1):
+    def _chacha_task(self, data, nonce, count=1, wide=False):
         # Convert key from bytes to little-endian words
         cdef uint32_t * key_w = bytes_to_words(self.key, 32)
         # Convert the nonce into an array of 32-bit words
-        cdef uint32_t * nonce_w = bytes_to_words(nonce.to_bytes(12, 'little'), 12)
+        cdef uint32_t * nonce_w = nonce_to_words(nonce, wide)
         # Create a typed memoryview of data and pass its address
-        cdef uint8_t[:] view = data
-        _chacha_task(key_w, &view[0], nonce_w, count, len(data))
+        cdef uint8_t[::1] view = data
+        cdef uint8_t * buffer = &view[0]
+        cdef uint64_t ccount = count
+        cdef uint64_t l = len(data)
+        cdef bint cwide = wide
+        # Release the GIL, so that several threads may each encrypt their own data at once
+        with nogil:
+            _chacha_task(key_w, buffer, nonce_w, ccount, l, cwide)
         PyMem_Free(key_w)
         PyMem_Free(nonce_w)
 
-    def chacha_encrypt(self, data, nonce=None, count=1, force_single_thread=False):
+    def chacha_encrypt(self, data, nonce=None, count=1, force_single_thread=False, n_threads=None, wide=False):
         """ Encrypt (or decrypt) in-memory data using ChaCha20.
 
-        Because the count argument is limited to 32-bits, the most data that can be encrypted at once with this function
-        is 256 GiB.
+        With a 32-bit counter, the key stream repeats after 256 GiB, which is the most data that can be encrypted under
+        one nonce. With a 64-bit counter (`wide`), this limit is 2**70 bytes.
 
         Since this is a stream cipher, encryption is the same as decryption.
 
         Args:
-            data: Must be either a `bytearray` or some array that is byte-addressable and supports the buffer protocol.
-            (byte `RawArray`s are acceptable arguments as well.
-            nonce (int): If provided, the 96-bit integer to use as a nonce for this operation. If not provided, a
-            random nonce will be generated.
-            count (int): The 32-bit counter at which to start the key stream.
+            data: Must be either a `bytearray` or some array that is byte-addressable and supports the buffer protocol
+            (byte `RawArray`s, `mmap`s and `memoryview`s of these are acceptable arguments as well).
+            nonce (int): If provided, the 96-bit (or 64-bit if `wide`) integer to use as a nonce for this operation. If
+            not provided, a random nonce will be generated.
+            count (int): The 32-bit (or 64-bit if `wide`) counter at which to start the key stream.
             force_single_thread (bool): If `True`, this operation will always run in a single process.
+            n_threads (int): The most threads to use, if not the crypter's `n_threads`. Fewer are used if the data is
+            too small to give each at least `min_thread_chunk` bytes.
+            wide (bool): If `True`, use a 64-bit nonce and a 64-bit counter, as in 'c64' mode.
 
         Returns:
             int: The nonce used in this operation.
         """
-        # Generate a random 96-bit nonce if unspecified
+        # Generate a random 96-bit (or 64-bit) nonce if unspecified
         if nonce is None:
-            nonce = randbits(96)
-        # Determine the number of threads to use based on CPU count
-        cdef int n_threads = cpu_count()
+            nonce = randbits(64 if wide else 96)
+        # There is nothing to encrypt in empty data
+        if len(data) == 0:
+            return nonce
+        # Determine the number of threads to use, without giving any less than the minimum chunk
+        cdef int threads = min(n_threads or self.n_threads, len(data)//max(self.min_thread_chunk, 64))
         # Determine the size of the chunks to use for each thread, and the number of ChaCha blocks per chunk
-        cdef uint32_t chunk_size = len(data)//n_threads//64*64
-        cdef uint32_t blocks_per_chunk = chunk_size//64
-        # If forced to use a single thread, or multiprocessing would be slower than a single process,
-        # run in a single process
-        # TODO: 2**20 bytes = 1 MiB is an artificially set breakpoint for performance; change this
-        if force_single_thread or n_threads == 1 or len(data) < 2**20 or blocks_per_chunk == 0:
-            self._chacha_task(data, nonce, count)
+        cdef uint64_t chunk_size = len(data)//max(threads, 1)//64*64
+        cdef uint64_t blocks_per_chunk = chunk_size//64
+        # If forced to use a single thread, or multithreading would be slower than a single thread, use a single thread
+        if force_single_thread or threads <= 1 or len(data) < self.parallel_threshold or blocks_per_chunk == 0:
+            self._chacha_task(data, nonce, count, wide)
             return nonce
         # Begin Cython multiprocessing using OpenMP
         cdef int i
@@ -235,17 +425,67 @@ class ChaChaCrypter:
         # Convert key from bytes to little-endian words
         cdef uint32_t * key_w = bytes_to_words(self.key, 32)
         # Convert the nonce into an array of 32-bit words
-        cdef uint32_t * nonce_w = bytes_to_words(nonce.to_bytes(12, 'little'), 12)
+        cdef uint32_t * nonce_w = nonce_to_words(nonce, wide)
         cdef uint64_t l = len(data)
-        cdef uint8_t * buffer = data
-        for i in prange(n_threads, nogil=True):
-            if i == n_threads-1:
-                _chacha_task(key_w, buffer+((n_threads-1)*chunk_size), nonce_w, ccount+(blocks_per_chunk*i),
-                             l-(n_threads-1)*chunk_size)
+        cdef bint cwide = wide
+        cdef uint8_t[::1] view = data
+        cdef uint8_t * buffer = &view[0]
+        for i in prange(threads, nogil=True, num_threads=threads):
+            if i == threads-1:
+                _chacha_task(key_w, buffer+((threads-1)*chunk_size), nonce_w, ccount+(blocks_per_chunk*i),
+                             l-(threads-1)*chunk_size, cwide)
             else:
-                _chacha_task(key_w, buffer+(i*chunk_size), nonce_w, ccount+(blocks_per_chunk*i), chunk_size)
+                _chacha_task(key_w, buffer+(i*chunk_size), nonce_w, ccount+(blocks_per_chunk*i), chunk_size, cwide)
         PyMem_Free(key_w)
         PyMem_Free(nonce_w)
         return nonce
 
+    def poly1305_mac(self, nonce, aad=b''):
+        """ Create a `Poly1305` object, generating the RFC 7539 AEAD authentication tag of data encrypted with a nonce.
+
+        The one-time key is the first 32 bytes of the key stream block at counter 0, which is not used for encryption.
+
+        Args:
+            nonce (int): The 96-bit nonce the data is encrypted with.
+            aad (bytes): Additional data to authenticate, which is not encrypted.
+
+        Returns:
+            Poly1305: The `Poly1305` object, to be fed the encrypted data.
+        """
+        block = bytearray(64)
+        self.chacha_encrypt(block, nonce, 0, force_single_thread=True)
+        return Poly1305(bytes(block[:32]), aad)
+
+    def aead_encrypt(self, data, nonce=None, aad=b'', force_single_thread=False):
+        """ Encrypt in-memory data in place using ChaCha20, and authenticate it with Poly1305, as in RFC 7539.
+
+        The data is encrypted starting from counter 1, and is limited to 2**32 - 1 blocks.
+
+        Args:
+            data: Must be either a `bytearray` or some array that is byte-addressable and supports the buffer protocol
+            (`mmap`s and `memoryview`s of these are acceptable arguments as well).
+            nonce (int): If provided, the 96-bit nonce to use. If not provided, a random one is generated.
+            aad (bytes): Additional data to authenticate, which is not encrypted.
+            force_single_thread (bool): If `True`, encryption will always run in a single thread.
 
+        Returns:
+            tuple: The nonce, and the 16 byte authentication tag.
+        """
+        if nonce is None:
+            nonce = randbits(96)
+        self.chacha_encrypt(data, nonce, 1, force_single_thread)
+        mac = self.poly1305_mac(nonce, aad)
+        mac.update(data)
+        return nonce, mac.digest()
+
+    def aead_decrypt(self, data, nonce, tag, aad=b'', force_single_thread=False):
+        """ Authenticate in-memory data encrypted with `aead_encrypt`, then decrypt it in place.
+
+        Arguments are as in `aead_encrypt`, with tag the 16 byte authentication tag. Raises a `ValueError` if the data
+        fails authentication, leaving it encrypted.
+        """
+        mac = self.poly1305_mac(nonce, aad)
+        mac.update(data)
+        if not hmac.compare_digest(mac.digest(), tag):
+            raise ValueError('Poly1305 authentication tags not equal.')
+        self.chacha_decrypt(data, nonce, 1, force_single_thread)
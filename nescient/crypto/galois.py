@@ -10,6 +10,12 @@ x_0*p^0+x_1*p^1+...+x_(n-1)*p^(n-1)
 """
 # TODO: Make better class docstrings
 import math
+from array import array
+
+try:  # NumPy is only needed for the batch operations on arrays of elements
+    import numpy as np
+except ImportError:
+    np = None
 
 
 class GaloisField:
@@ -17,6 +23,13 @@ class GaloisField:
 
     Elements are consider to be normal integers in the range 0...q-1 (inclusive)
     Can perform the standard operations (add, mult, exponentiation, inversion), optionally using lookup tables
+    If NumPy is installed, each operation can also be performed elementwise over whole arrays of elements at once
+
+    Memory model: the lookup tables are an exp (antilog) and a log table of q entries each, stored as arrays of the
+    smallest unsigned integer type able to hold q-1, so 2*q*itemsize bytes in all (1 KB for GF(2^8), 256 KB for
+    GF(2^16), 16 MB for GF(2^24)), which the batch operations view in place rather than copy. They are built the first
+    time an operation needs them, and only if they fit in maxMem bytes; larger fields reduce polynomial products
+    directly instead, and invert by exponentiation
     """
     def __init__(self, p, n=1, r=None, g=None, maxMem=2 ** 30):
         if p < 2 or n < 1:
@@ -28,13 +41,20 @@ class GaloisField:
         self.r = p if n == 1 else r  # Technically reduce by p if this is a prime field
         if r is None and n > 1:  # If an r was not provided and is required (n > 1), find one
             self.r = self.findR()
-        self.expTable = {}
-        self.logTable = {}
-        self.haveTables = False
-        # If the memory needed to make lookup tables is less than 1 GB (default), calculate them now
-        if self.q * math.log(self.q, 2) / 8 <= maxMem:
+        self.expTable = None
+        self.logTable = None
+        self.arrayTables = None
+        # Use lookup tables only if the memory needed to make them is at most maxMem (1 GB by default)
+        self.typecode = next(c for c in 'BHILQ' if 8 * array(c).itemsize >= (self.q - 1).bit_length())
+        self.tableMem = 2 * self.q * array(self.typecode).itemsize
+        self.tablesAllowed = self.tableMem <= maxMem
+
+    # Whether lookup tables are used, building them the first time they are needed
+    @property
+    def haveTables(self):
+        if self.expTable is None and self.tablesAllowed:
             self.makeLookupTables()
-            self.haveTables = True
+        return self.expTable is not None
 
     # Calculate the unique set of prime factors of n
     @staticmethod
@@ -82,11 +102,11 @@ class GaloisField:
         if self.g is None or self.generate(self.g) is False:  # If a generator was not provided or was invalid, find one
             if self.n == 1:  # If this is a prime field we can find a generator faster than brute force
                 pfs = GaloisField.prime_factors(self.q - 1)  # Calculate the prime factors of phi(p), equal to p-1
-                for g in self.f:
+                for g in range(1, self.q):  # 0 is never a generator
                     s = set()
                     isGen = True
                     for pf in pfs:
-                        y = self.pow(g, (self.q - 1) / pf)
+                        y = pow(g, (self.q - 1) // pf, self.p)
                         if y in s or y == 1:
                             isGen = False
                             break
@@ -105,23 +125,23 @@ class GaloisField:
         raise RuntimeError('Unable to find a generator for the specified field')
 
     # Returns whether g is a generator for the field, also updates exp and log tables accordingly
+    # If check is False, g is assumed to be a generator
     def generate(self, g, check=True):
-        if check:  # If using this method to check whether the generator is valid, use dictionaries
-            self.expTable = {}
-            self.logTable = {}
-        else:  # Otherwise assume g is valid and use lists to optimize for speed
-            self.expTable = [0] * self.q
-            self.logTable = [0] * self.q
+        self.arrayTables = None
+        expTable = array(self.typecode, [0]) * self.q
+        logTable = array(self.typecode, [0]) * self.q
         y = 1
-        for x in self.f:
-            if check and y in self.logTable and x != self.q - 1:
+        for x in range(self.q - 1):
+            expTable[x] = y
+            logTable[y] = x
+            y = self.modP(self.multPoly(g, y), self.r, bound=self.q)  # Tables are not ready, so reduce directly
+            # g generates the field iff its powers only return to 1 after q-1 of them
+            if check and (y == 0 or y == 1) and x != self.q - 2:
                 return False
-            self.expTable[x] = y
-            self.logTable[y] = x
-            y = self.mult(g, y)
-        if check and len(self.logTable) != self.q - 1:
+        if check and y != 1:
             return False
-        self.logTable[1] = 0
+        expTable[self.q - 1] = 1
+        self.expTable, self.logTable = expTable, logTable
         return True
 
     # Attempts to find the smallest degree n irreducible polynomial over the field
@@ -204,13 +224,15 @@ class GaloisField:
         else:  # Otherwise use the slower reduction method
             return self.modP(self.multPoly(a, b), self.r, bound=self.q)
 
-    # Returns the multiplicative inverse of an element using lookup tables
+    # Returns the multiplicative inverse of an element
     def inverse(self, x):
+        # Technically speaking, 0 has no multiplicative inverse, so just define it as itself
+        if x == 0:
+            return 0
         if self.haveTables:  # Use lookup tables if possible
-            # Technically speaking, 0 has no multiplicative inverse, so just define it as itself
-            return 0 if x == 0 else self.expTable[self.q - 1 - self.logTable[x]]
-        else:  # TODO Otherwise, well, give up (might do this later, there's an easy way for prime fields)
-            raise NotImplementedError
+            return self.expTable[self.q - 1 - self.logTable[x]]
+        else:  # Otherwise x^(q-1) = 1, so x^(q-2) is the inverse
+            return self.pow(x, self.q - 2)
 
     # Raise an element in the field to a power
     def pow(self, a, b):
@@ -223,12 +245,78 @@ class GaloisField:
             while b > 0:
                 if b % 2 == 0:
                     a = self.mult(a, a)
-                    b /= 2
+                    b //= 2
                 else:
                     c = self.mult(a, c)
                     b -= 1
             return c
 
+    # Returns the exp & log lookup tables as NumPy arrays. These are views of the tables, not copies, so entries looked
+    # up in them are of the tables' unsigned type, and must be cast before any arithmetic that could overflow it
+    def getArrayTables(self):
+        if np is None:
+            raise ImportError('NumPy is required for operations on arrays of field elements')
+        if self.arrayTables is None:
+            self.arrayTables = (np.frombuffer(self.expTable, dtype='u%d' % self.expTable.itemsize),
+                                np.frombuffer(self.logTable, dtype='u%d' % self.logTable.itemsize))
+        return self.arrayTables
+
+    # Converts an array-like of elements (or a single element) to a NumPy array of integers
+    @staticmethod
+    def asArray(a):
+        if np is None:
+            raise ImportError('NumPy is required for operations on arrays of field elements')
+        return np.asarray(a, dtype=np.int64)
+
+    # Adds two arrays of elements elementwise
+    def add_array(self, a, b):
+        a, b = self.asArray(a), self.asArray(b)
+        if self.n == 1:
+            return (a + b) % self.p
+        if self.p == 2:
+            return (a ^ b) & (self.q - 1)
+        else:  # Add each digit of the base p representations modulo p
+            c = np.zeros(np.broadcast(a, b).shape, dtype=np.int64)
+            for i in range(self.n):
+                c += ((a // self.p ** i + b // self.p ** i) % self.p) * self.p ** i
+            return c
+
+    # Multiplies two arrays of elements elementwise
+    def mult_array(self, a, b):
+        a, b = self.asArray(a), self.asArray(b)
+        if not self.haveTables:
+            return np.frompyfunc(self.mult, 2, 1)(a, b).astype(np.int64)
+        exp, log = self.getArrayTables()
+        c = exp[(log[a].astype(np.int64) + log[b]) % (self.q - 1)].astype(np.int64)
+        return np.where((a == 0) | (b == 0), 0, c)
+
+    # Returns the multiplicative inverses of an array of elements, with 0 mapped to itself as in `inverse`
+    def inverse_array(self, x):
+        x = self.asArray(x)
+        if not self.haveTables:
+            return np.frompyfunc(self.inverse, 1, 1)(x).astype(np.int64)
+        exp, log = self.getArrayTables()
+        return np.where(x == 0, 0, exp[self.q - 1 - log[x].astype(np.int64)].astype(np.int64))
+
+    # Raises an array of elements to (an array of) integer powers elementwise
+    def pow_array(self, a, b):
+        a, b = self.asArray(a), self.asArray(b)
+        if not self.haveTables:
+            return np.frompyfunc(self.pow, 2, 1)(a, b).astype(np.int64)
+        exp, log = self.getArrayTables()
+        # Reduce the exponents first, so that the products of logs cannot overflow
+        c = exp[(log[a].astype(np.int64) * (b % (self.q - 1))) % (self.q - 1)].astype(np.int64)
+        return np.where(a == 0, 0, c)
+
+    # Evaluates the polynomial with the given coefficients (constant term first) at an array of elements, via Horner's
+    # method
+    def poly_eval_array(self, coefficients, x):
+        x = self.asArray(x)
+        y = np.zeros(x.shape, dtype=np.int64)
+        for c in reversed(coefficients):
+            y = self.add_array(self.mult_array(y, x), c)
+        return y
+
     # Allows for grabbing GfElement representations by indexing
     def __getitem__(self, item):
         if 0 <= item < self.q:
@@ -241,6 +329,8 @@ class GfElement:
 
     Allows one to perform intuitive operations on the elements and get the correct results
     """
+    __slots__ = ('f', 'val')
+
     def __init__(self, val, f):
         assert (0 <= val < f.q)
         self.f = f
@@ -3,11 +3,12 @@
 #
 # nescient/crypto/tools.py
 """ Various functions and tools for general cryptographic purposes, like secure randomness, padding, etc. """
+import os
+import hmac
+import math
 try:  # Define a Python-version-independent source of securely random bytes
     import secrets
 except ImportError:
-    import os
-
     def get_random_bytes(n):
         return bytes(os.urandom(n))
 
@@ -44,3 +45,72 @@ def unpad(data):
     """
     n = data[-1]  # The number of bytes to remove
     del data[-n:]
+
+
+def hkdf(key, salt, info, length):
+    """ Derives a key from keying material using HKDF with SHA-256.
+
+    See RFC 5869 for the specification. The keying material must already be uniformly random, like a key derived from
+    a password with PBKDF2, as HKDF does nothing to slow down guessing.
+
+    Args:
+        key (bytes): The input keying material.
+        salt (bytes): A salt, which should be random and unique to each key derived.
+        info (bytes): Context binding the derived key to its purpose.
+        length (int): The length of the key to derive in bytes. Must be at most 8160.
+
+    Returns:
+        bytes: The derived key.
+    """
+    assert(length <= 255*32)
+    prk = hmac.new(salt, key, digestmod='sha256').digest()  # Extract
+    okm, block = b'', b''
+    for i in range(1, -(-length // 32) + 1):  # Expand
+        block = hmac.new(prk, block + info + bytes([i]), digestmod='sha256').digest()
+        okm += block
+    return okm[:length]
+
+
+# The files giving the CPU quota of the process's cgroup, under cgroup v2 and v1
+CGROUP_CPU_MAX = '/sys/fs/cgroup/cpu.max'
+CGROUP_CFS_QUOTA = '/sys/fs/cgroup/cpu/cpu.cfs_quota_us'
+CGROUP_CFS_PERIOD = '/sys/fs/cgroup/cpu/cpu.cfs_period_us'
+
+
+# Returns the number of CPUs' worth of time the process's cgroup may use, or None if it is not limited
+def _cgroup_cpu_quota():
+    try:
+        with open(CGROUP_CPU_MAX) as f:
+            quota, period = f.read().split()[:2]
+        if quota == 'max':
+            return None
+    except (OSError, ValueError):
+        try:
+            with open(CGROUP_CFS_QUOTA) as f_quota, open(CGROUP_CFS_PERIOD) as f_period:
+                quota, period = f_quota.read().strip(), f_period.read().strip()
+        except OSError:
+            return None
+    try:
+        quota, period = int(quota), int(period)
+    except ValueError:
+        return None
+    return quota/period if quota > 0 and period > 0 else None
+
+
+def available_cpus():
+    """ Returns the number of CPUs the current process can actually make use of.
+
+    This is the number of CPUs the process may be scheduled on, as given by its affinity mask where supported, further
+    limited by the CPU quota of its cgroup (rounded up), so that containers with CPU limits are not oversubscribed.
+
+    Returns:
+        int: The number of CPUs available, at least 1.
+    """
+    try:
+        n_cpus = len(os.sched_getaffinity(0))
+    except AttributeError:  # Affinity masks are not supported on every platform
+        n_cpus = os.cpu_count() or 1
+    quota = _cgroup_cpu_quota()
+    if quota is not None:
+        n_cpus = min(n_cpus, math.ceil(quota))
+    return max(1, n_cpus)
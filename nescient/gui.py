@@ -16,7 +16,7 @@ from threading import Thread, main_thread, current_thread
 from multiprocessing import freeze_support, active_children
 
 from nescient import __version__, url
-from nescient.timing import load_benchmarks, estimate_time, TkTimer, benchmark_mode
+from nescient.timing import load_benchmarks, estimate_time, TkTimer, benchmark_mode, load_thread_tuning
 from nescient.packer import DEFAULT_PACKING_MODE, PACKING_MODES, NescientPacker, PackingError
 from nescient.process import process_sync_execute
 from nescient.resources.banner import BANNER_DATA
@@ -348,7 +348,8 @@ class NescientUI(Tk):
         
     def packing_loop(self, choice, packer):
         self.title('Nescient %s - %s' % (__version__, 'Packing' if choice == 'pack' else 'Unpacking'))
-        for path_num, path in enumerate(self.paths):
+        # Derive the keys of upcoming files while the current one is processed
+        for path_num, (path, keys) in enumerate(zip(self.paths, packer.prefetch_keys(self.paths, choice))):
             try:
                 # Color and scroll to the tag
                 tag = 'path%s' % path_num
@@ -368,8 +369,9 @@ class NescientUI(Tk):
                 timer = TkTimer(self, display_text, est_time, lambda s: self.status.config(text=s))
                 timer.start()
                 try:
+                    salt, key = keys.result()
                     process_sync_execute(packer.pack_or_unpack_file, path, file_out_path, choice,
-                                         overwrite=self.menu.overwrite.get())
+                                         overwrite=self.menu.overwrite.get(), salt=salt, key=key)
                 except Exception as e:
                     timer.stop(error=True)
                     error_string = e.__class__.__name__ + ': ' + str(e)
@@ -419,6 +421,7 @@ class NescientUI(Tk):
 
 def main():
     paths = sys.argv[1:] if len(sys.argv) > 1 else None
+    load_thread_tuning()
     gui = NescientUI(paths)
     gui.mainloop()
                                 
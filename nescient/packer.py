@@ -5,12 +5,18 @@
 """ The Packer class, used to pack and unpack Nescient containers, as well as packer-specific exceptions. """
 # TODO: Documentation, version handling
 import os
+import mmap
 import hmac  # Generating authentication tags with SHA-2 # TODO: Re-implement this in Cython
+import shutil
+import tempfile
+from threading import Lock
+from collections import deque
 from contextlib import ExitStack
-from hashlib import pbkdf2_hmac  # PBKDF2 Key derivation # TODO: Re-implement this in Cython
+from concurrent.futures import ThreadPoolExecutor
+from hashlib import blake2b, pbkdf2_hmac  # PBKDF2 Key derivation # TODO: Re-implement this in Cython
 
 from nescient import __version__, version_to_tuple, newer_version, NescientError
-from nescient.crypto.tools import get_random_bytes
+from nescient.crypto.tools import get_random_bytes, hkdf, available_cpus
 from nescient.crypto.aes import AesCrypter
 from nescient.crypto.chacha import ChaChaCrypter
 
@@ -33,11 +39,65 @@ class AuthError(PackingError):
 SUPPORTED_ALGS = {'aes128': (AesCrypter, 16), 'aes192': (AesCrypter, 24), 'aes256': (AesCrypter, 32),
                   'chacha': (ChaChaCrypter, 32)}
 
+# Authentication modes built into a cipher mode, authenticating the data in the same pass as it is encrypted (AEAD),
+# mapped to the cipher mode each is built into. Cipher modes that are only AEAD modes are used with nothing else.
+AEAD_AUTH = {'gcm': 'gcm', 'ply': 'stm'}
+AEAD_ONLY_MODES = {'gcm'}
+
+
+# Returns whether a cipher mode and an authentication mode can be used together
+def compatible_modes(mode, auth):
+    if auth in AEAD_AUTH:
+        return AEAD_AUTH[auth] == mode
+    return mode not in AEAD_ONLY_MODES
+
+
 # All available packing modes, and the default mode
 PACKING_MODES = [alg + '-' + mode + '-' + auth for alg, (CrypterClass, _) in SUPPORTED_ALGS.items()
-                 for mode in CrypterClass.modes for auth in CrypterClass.auth]
+                 for mode in CrypterClass.modes for auth in CrypterClass.auth if compatible_modes(mode, auth)]
 DEFAULT_PACKING_MODE = 'chacha-stm-sha'
 
+# The number of bytes read, processed and written at a time when packing or unpacking files.
+# Must be a multiple of both the ChaCha block size (64) and the AES block size (16).
+CHUNK_SIZE = 2**22
+
+# The number of bytes encrypted or decrypted at a time before being fed to the MAC, so that the data only passes
+# through main memory once. Small enough to stay in cache, and large enough for ChaCha to use multiple threads.
+# Must be a multiple of both the ChaCha block size (64) and the AES block size (16).
+FUSED_BLOCK_SIZE = 2**20
+
+# Containers packed by this version or later have a block of parameters following the auth tag, describing the layout
+# of the container beyond what the header does. The block begins with its 2 byte length, followed by each parameter as
+# a 3 character name, a 1 byte length and a value.
+PARAMS_VERSION = '0.10.0'
+
+# The default size of the segments of segmented CBC containers, each of which is encrypted independently.
+# Must be a multiple of the AES block size (16).
+SEGMENT_SIZE = 2**22
+
+# The number of threads that chunks of chunked containers, and segments of segmented containers, are processed on in
+# parallel
+N_THREADS = available_cpus()
+
+# The number of files ahead of the one being processed whose keys are derived in advance by `prefetch_keys`
+PREFETCH_DEPTH = 2
+
+# The number of PBKDF2 iterations keys are derived with by default, and in containers that do not record the number
+DEFAULT_ITERATIONS = 100000
+# The largest number of PBKDF2 iterations accepted. The number is read from containers before they are authenticated,
+# so without a limit a tampered container could make deriving its key take practically forever.
+MAX_ITERATIONS = 100*DEFAULT_ITERATIONS
+
+# The size of key check values in bytes. Just large enough that an incorrect key is practically never accepted.
+KCV_SIZE = 8
+
+# The largest amount of data GCM can encrypt under one nonce, as its 32-bit block counter starts at 2
+GCM_MAX_SIZE = (2**32 - 2)*16
+
+# The most bytes that can be packed in ChaCha's 'stm' mode, before its 32-bit block counter (starting at 1) would wrap.
+# The 'c64' mode has a 64-bit counter, and no practical limit.
+STM_MAX_SIZE = (2**32 - 1)*64
+
 
 class NescientPacker:
     """ Packer/Unpacker for Nescient containers
@@ -46,13 +106,31 @@ class NescientPacker:
         password: The password to encrypt/decrypt with. Must be a `str` or `bytes` object
         alg (str): A 6 character string specifying the algorithm to use for packing. Must exist in `SUPPORTED_ALGS`.
         mode (str): A 3 character string specifying the cipher mode of operation.
-        auth (str): A 3 character string specifying the cipher mode of operation. Currently only `'sha'` is supported.
+        auth (str): A 3 character string specifying the authentication mode: `'sha'` for HMAC-SHA256, `'b2b'` for
+            keyed BLAKE2b, `'gcm'` for the GCM cipher mode's own authentication, or `'ply'` for Poly1305 with ChaCha in
+            stream mode, as in the RFC 7539 AEAD construction.
+        chunk_size (int): If provided, the data is authenticated in independent chunks of this many bytes, whose tags
+            are bound together by the container's auth tag. Chunks are then authenticated on all cores, and a corrupted
+            chunk is detected without authenticating the rest. Must be a multiple of 64.
+        master_key (bool): If `True`, a master key is derived from the password once, and the key of each container
+            packed is derived from it with HKDF, which is far cheaper than deriving it from the password. Suits packing
+            many small files at once.
+        iterations (int): The number of PBKDF2 iterations to derive keys with, recorded in each container packed.
+            More iterations make guessing the password slower, at the cost of slower packing and unpacking. See
+            `timing.calibrate_iterations` for choosing a number suited to the current machine.
+        key_check (bool): If `True`, a short value derived from each container's key is recorded in it, so that an
+            incorrect password is rejected as soon as the key is derived, without reading the rest of the container.
+            The value reveals nothing a password guesser could not already learn from the auth tag.
+        segment_size (int): If provided, the data is split into segments of this many bytes, each encrypted as a
+            separate CBC chain with its own IV, so that segments are encrypted on all cores. Only supported in CBC mode.
+            Must be a multiple of 16.
 
     Attributes:
         times: Either a dictionary with file sizes as keys and a list of benchmarked packing times as values, or,
             if no benchmarking data is available for the packer's settings, `None`.
     """
-    def __init__(self, password, alg='chacha', mode='stm', auth='sha'):
+    def __init__(self, password, alg='chacha', mode='stm', auth='sha', chunk_size=None, master_key=False,
+                 iterations=DEFAULT_ITERATIONS, key_check=True, segment_size=None):
         # password must be a bytes object in order to work with the key generation, so convert it
         if type(password) is str:
             self.password = bytes(password, 'utf-8')
@@ -69,7 +147,34 @@ class NescientPacker:
             raise ParamError('Cipher mode %s is unsupported by algorithm.' % mode)
         if auth not in self.CrypterClass.auth:
             raise ParamError('Authentication mode %s is unspported by algorithm.' % auth)
+        if not compatible_modes(mode, auth):
+            raise ParamError('Authentication mode %s is unsupported by cipher mode %s.' % (auth, mode))
         self.alg, self.mode, self.auth = alg, mode, auth
+        # Chunks must hold whole ChaCha and AES blocks, and their size must fit in the parameter block
+        if chunk_size is not None and not (0 < chunk_size < 2**32 and chunk_size % 64 == 0):
+            raise ParamError('Chunk size must be a positive multiple of 64, less than 4 GiB.')
+        # Chunk tags are made with a keyed hash, which the AEAD auth modes do not provide, so they cannot be chunked
+        if chunk_size is not None and auth in AEAD_AUTH:
+            raise ParamError('Chunking is unsupported with authentication mode %s.' % auth)
+        self.chunk_size = chunk_size
+        if not 0 < iterations <= MAX_ITERATIONS:
+            raise ParamError('Number of iterations must be positive, and at most %d.' % MAX_ITERATIONS)
+        self.iterations = iterations
+        self.key_check = key_check
+        # Segments are only needed by CBC, the one mode whose encryption is serial
+        if segment_size is not None and mode != 'cbc':
+            raise ParamError('Segments are only supported in CBC mode.')
+        if segment_size is not None and not (0 < segment_size < 2**32 and segment_size % 16 == 0):
+            raise ParamError('Segment size must be a positive multiple of 16, less than 4 GiB.')
+        self.segment_size = segment_size
+        # Master keys derived so far, by master salt and number of iterations. Containers packed with a master key
+        # record its salt, so that unpacking containers packed together only derives their master key once. Keys are
+        # derived under a lock, as `prefetch_keys` derives them on several threads at once.
+        self._master_keys, self._master_key_lock = {}, Lock()
+        self.master_salt = None
+        if master_key:
+            self.master_salt = get_random_bytes(16)
+            self.derive_master_key(self.master_salt)
 
     # Fix out paths depending on the packing choice and the output path
     @staticmethod
@@ -98,18 +203,18 @@ class NescientPacker:
     def parse_nescient_header(data_or_path):
         if type(data_or_path) is str:
             with open(data_or_path, 'rb') as f:
-                data = bytearray(
-                    min(os.path.getsize(data_or_path), 72))  # 24 header bytes, 16 salt bytes, 32 auth bytes
+                # 24 header bytes, 16 salt bytes, 32 auth bytes, and a parameter block of at most 2 + 2**16 - 1 bytes
+                data = bytearray(min(os.path.getsize(data_or_path), 74 + 2**16))
                 f.readinto(data)
         else:
             data = data_or_path
         # Check for a valid header
         if len(data) < 24:
             raise PackingError('Not a valid Nescient container.')
-        header = data[:24]
+        header = bytes(data[:24])
         if header[0:4] != b'NESC':
             raise PackingError('Not a valid Nescient container.')
-        # packed_version = str(header[4:12], 'utf-8')
+        packed_version = str(header[4:12], 'utf-8', 'replace')
         # if newer_version(__version__, packed_version) == 2:  # If the packed version is newer, warn the user
         #     warn('Packed version', packed_version, 'is newer than current; may be unable to unpack.')
         alg, mode, auth = str(header[12:18], 'utf-8'), str(header[18:21], 'utf-8'), str(header[21:24], 'utf-8')
@@ -125,22 +230,179 @@ class NescientPacker:
         # Ensure the salt exists
         if len(data) < 40:
             raise PackingError('Container missing salt.')
-        salt = data[24:40]
+        salt = bytes(data[24:40])
         # Ensure the authentication tag exists
         if len(data) < 72:
             raise PackingError('Container missing auth tag.')
-        auth_tag = data[40:72]
-        return {'header': header, 'alg': alg, 'mode': mode, 'auth': auth, 'salt': salt, 'auth_tag': auth_tag}
+        auth_tag = bytes(data[40:72])
+        # Containers packed by older versions have no parameter block
+        try:
+            has_params = newer_version(packed_version, PARAMS_VERSION) != 2
+        except ValueError:
+            raise PackingError('Not a valid Nescient container.')
+        params_data = b''
+        if has_params:
+            if len(data) < 74 or len(data) < 74 + int.from_bytes(data[72:74], 'little'):
+                raise PackingError('Container missing parameters.')
+            params_data = bytes(data[72:74 + int.from_bytes(data[72:74], 'little')])
+        params = NescientPacker._decode_params(params_data[2:])
+        # The auth tag covers the header, salt and parameters, and the payload begins right after them
+        return {'header': header, 'alg': alg, 'mode': mode, 'auth': auth, 'salt': salt, 'auth_tag': auth_tag,
+                'params': params, 'auth_data': header + salt + params_data, 'offset': 72 + len(params_data)}
+
+    # Generates and verifies the 24 byte Nescient header
+    def _make_header(self):
+        version_tuple = version_to_tuple(__version__)[:3]
+        header = bytearray('NESC' + '%02d.%02d.%02d' % version_tuple + self.alg + self.mode + self.auth, 'utf-8')
+        if len(header) != 24:
+            raise PackingError('Invalid Nescient header ' + str(header, 'utf-8'))
+        return header
+
+    # Returns the parameters of containers packed with this packer's settings, as a dictionary of names to values. The
+    # values of parameters that depend on the container's key are left empty, to be filled in by `_make_prefix`.
+    def _params(self):
+        params = {'itr': self.iterations.to_bytes(4, 'little')}
+        if self.key_check:
+            params['kcv'] = bytes(KCV_SIZE)
+        if self.chunk_size is not None:
+            params['chk'] = self.chunk_size.to_bytes(4, 'little')
+        if self.master_salt is not None:
+            params['mks'] = self.master_salt
+        if self.segment_size is not None:
+            params['seg'] = self.segment_size.to_bytes(4, 'little')
+        return params
+
+    # Encodes a dictionary of parameters into a parameter block, prefixed with its length
+    @staticmethod
+    def _encode_params(params):
+        block = b''.join(bytes(name, 'utf-8') + bytes([len(value)]) + value for name, value in sorted(params.items()))
+        return len(block).to_bytes(2, 'little') + block
+
+    # Decodes a parameter block, without its length, into a dictionary of names to values
+    @staticmethod
+    def _decode_params(block):
+        params, i = {}, 0
+        while i < len(block):
+            if i + 4 > len(block) or i + 4 + block[i+3] > len(block):
+                raise PackingError('Container parameters are malformed.')
+            params[str(block[i:i+3], 'utf-8', 'replace')] = bytes(block[i+4:i+4+block[i+3]])
+            i += 4 + block[i+3]
+        return params
+
+    # Generates the prefix of a container packed with a given salt and key (header, salt, a placeholder for the auth
+    # tag, and the parameter block), along with the data its auth tag covers
+    def _make_prefix(self, salt, key):
+        params = self._params()
+        if self.key_check:
+            params['kcv'] = self._key_check_value(key)
+        header, params_data = self._make_header(), self._encode_params(params)
+        return header + salt + bytes(32) + params_data, header + salt + params_data
+
+    # Derives the key check value of a key, which is independent of the keys used for encryption and authentication
+    @staticmethod
+    def _key_check_value(key):
+        return hkdf(key, b'', b'Nescient key check value', KCV_SIZE)
+
+    # Returns the key of a parsed container, derived from the password unless given along with the container's salt.
+    # If the container has a key check value, the key is checked against it, raising an AuthError if they differ.
+    def _unpack_key(self, parsed, salt=None, key=None):
+        if salt != parsed['salt'] or key is None:
+            key = self._key_gen(parsed['salt'])
+        kcv = parsed['params'].get('kcv')
+        if kcv is not None and not hmac.compare_digest(kcv, self._key_check_value(key)):
+            raise AuthError('Key check values not equal! The password is incorrect, or the file is corrupt.')
+        return key
 
-    # Performs PBKDF2 key derivation with a specified salt
+    # Returns a packer with the settings of a parsed container, for unpacking it with this packer's password
+    def _unpacker(self, parsed):
+        params = parsed['params']
+        chunk_size = int.from_bytes(params['chk'], 'little') if 'chk' in params else None
+        iterations = int.from_bytes(params['itr'], 'little') if 'itr' in params else DEFAULT_ITERATIONS
+        if iterations > MAX_ITERATIONS:
+            raise PackingError('Container requires %d key derivation iterations, more than the maximum of %d.'
+                               % (iterations, MAX_ITERATIONS))
+        segment_size = int.from_bytes(params['seg'], 'little') if 'seg' in params else None
+        unpacker = NescientPacker(self.password, parsed['alg'], parsed['mode'], parsed['auth'], chunk_size,
+                                  iterations=iterations, key_check='kcv' in params, segment_size=segment_size)
+        # Share master keys, so that they are kept once derived
+        unpacker._master_keys, unpacker._master_key_lock = self._master_keys, self._master_key_lock
+        unpacker.master_salt = params.get('mks')
+        return unpacker
+
+    # Performs PBKDF2 key derivation with a specified salt, or, given a master salt, HKDF key derivation from the
+    # master key
     def _key_gen(self, salt):
-        return pbkdf2_hmac('sha256', self.password, salt, 100000, self.key_len)
+        if self.master_salt is None:
+            return pbkdf2_hmac('sha256', self.password, salt, self.iterations, self.key_len)
+        return hkdf(self.derive_master_key(self.master_salt), salt, b'Nescient container key', self.key_len)
 
-    def _gen_auth_tag(self, key, auth_data, enc_data):
-        # Currently only SHA-256 authentication is available
-        # TODO: Add more authentication methods
+    def derive_master_key(self, master_salt):
+        """ Derive the master key with a given master salt from the password, with the packer's number of iterations,
+        unless already derived.
+
+        Master keys are kept by the packer, so that each is only derived once. Deriving one ahead of time allows copies
+        of the packer (such as those pickled for other processes) to unpack its containers without deriving it again.
+
+        Args:
+            master_salt (bytes): The 16 byte master salt, as in the `'mks'` parameter of a parsed container.
+
+        Returns:
+            bytes: The master key.
+        """
+        with self._master_key_lock:
+            if (master_salt, self.iterations) not in self._master_keys:
+                self._master_keys[master_salt, self.iterations] = pbkdf2_hmac('sha256', self.password, master_salt,
+                                                                              self.iterations, 32)
+            return self._master_keys[master_salt, self.iterations]
+
+    # Locks cannot be pickled, so copies of the packer in other processes are given their own
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_master_key_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._master_key_lock = Lock()
+
+    # Returns a new random salt and the key derived with it, unless a salt and key (derived ahead of time) are given
+    def _salt_and_key(self, salt=None, key=None):
+        if salt is None or key is None:
+            salt = get_random_bytes(16)
+            key = self._key_gen(salt)
+        return salt, key
+
+    # Returns a new MAC object, fed with auth_data, that encrypted data can be incrementally added to via `update`
+    def _new_mac(self, key, auth_data):
         if self.auth == 'sha':
-            return hmac.new(key, auth_data + enc_data, digestmod='sha256').digest()
+            return hmac.new(key, auth_data, digestmod='sha256')
+        elif self.auth == 'b2b':
+            # BLAKE2b is keyed natively, so unlike HMAC needs only a single pass. Its digest is truncated to the 32
+            # bytes reserved for the auth tag
+            mac = blake2b(key=key, digest_size=32)
+            mac.update(auth_data)
+            return mac
+        elif self.auth == 'gcm':
+            # The nonce is the first 12 bytes of the salt, which follows the header in auth_data
+            return self.CrypterClass(key).gcm_mac(bytes(auth_data[24:36]), auth_data)
+        elif self.auth == 'ply':
+            # As with encryption, the nonce is the first 12 bytes of the salt
+            nonce, _ = self._chacha_nonce(bytes(auth_data[24:40]))
+            return self.CrypterClass(key).poly1305_mac(nonce, bytes(auth_data))
+
+    def _gen_auth_tag(self, key, auth_data, enc_data):
+        # Feed the MAC incrementally, rather than concatenating the (possibly large) encrypted data to auth_data
+        mac = self._new_mac(key, auth_data)
+        mac.update(enc_data)
+        return mac.digest()
+
+    # Compares a container's auth tag to a newly generated one in constant time, raising an AuthError if they differ.
+    # Tags shorter than the 32 bytes reserved for them, such as GCM's, are followed by zeros.
+    @staticmethod
+    def _check_auth_tag(auth_tag, new_auth_tag):
+        if not hmac.compare_digest(auth_tag, new_auth_tag.ljust(32, b'\x00')):
+            raise AuthError('Authentication tags not equal! The file is corrupt, tampered with, '
+                            'or the password is incorrect.')
 
     # Encrypts an arbitrary block of data, modifying it in place and returning the key and salt used
     def _encrypt(self, data, key=None, salt=None):
@@ -150,76 +412,566 @@ class NescientPacker:
         # Build a new crypter object
         crypter = self.CrypterClass(key)
         if isinstance(crypter, ChaChaCrypter):
-            # Use the first 12 bytes of the salt as the nonce
-            nonce = int.from_bytes(salt[:12], byteorder='little')
-            crypter.chacha_encrypt(data, nonce)
+            nonce, wide = self._chacha_nonce(salt)
+            crypter.chacha_encrypt(data, nonce, wide=wide)
         elif isinstance(crypter, AesCrypter):
             getattr(crypter, self.mode + '_encrypt')(data)
         return key, salt
 
-    # Decrypts data, using the specified key
-    def _decrypt(self, data, key, salt):
-        crypter = self.CrypterClass(key)
+    @property
+    def headroom(self):
+        """ int: The number of bytes preceding the data in containers packed with this packer's settings. """
+        # 24 header bytes, 16 salt bytes, 32 auth_tag bytes and the parameter block, plus a random first block in CBC
+        # mode
+        params_len = len(self._encode_params(self._params()))
+        return 72 + params_len + 16 if self.mode == 'cbc' else 72 + params_len
+
+    # Returns the number of bytes following size bytes of data in containers packed with this packer's settings: the
+    # padding in CBC mode, and the chunk tags of chunked containers
+    def _tailroom(self, size):
+        body_len = size + 16 - size % 16 if self.mode == 'cbc' else size
+        return body_len - size + (32*self._n_chunks(body_len) if self.chunk_size is not None else 0)
+
+    # Raises a ParamError if more data than this packer's cipher mode can encrypt is to be packed
+    def _check_size(self, size):
+        if self.mode == 'gcm' and size > GCM_MAX_SIZE:
+            raise ParamError('GCM mode cannot pack more than %d bytes.' % GCM_MAX_SIZE)
+        if self.mode == 'stm' and size > STM_MAX_SIZE:
+            raise ParamError('Stream mode cannot pack more than %d bytes; use c64 mode instead.' % STM_MAX_SIZE)
+
+    # Returns the ChaCha nonce taken from a salt, and whether the key stream has a 64-bit counter. In 'stm' mode the
+    # nonce is the first 12 bytes of the salt, and in 'c64' mode the first 8.
+    def _chacha_nonce(self, salt):
+        if self.mode == 'c64':
+            return int.from_bytes(salt[:8], byteorder='little'), True
+        return int.from_bytes(salt[:12], byteorder='little'), False
+
+    # Returns the number of chunks an encrypted body of the given length is authenticated in
+    def _n_chunks(self, body_len):
+        return max(1, -(-body_len // self.chunk_size))
+
+    # Splits the length of a container's payload, less any random first block, into the length of the encrypted body
+    # and the number of chunk tags following it. Raises a PackingError if no container could have such a payload.
+    def _split_payload(self, length):
+        body_len, n_chunks = length, 0
+        if self.chunk_size is not None:
+            n_chunks = max(1, -(-length // (self.chunk_size + 32)))
+            body_len = length - 32*n_chunks
+            if body_len < 0 or self._n_chunks(body_len) != n_chunks:
+                raise PackingError('Container is truncated or malformed.')
+        if self.mode == 'cbc' and (body_len == 0 or body_len % 16 != 0):
+            raise PackingError('Container payload is not a multiple of the block size.')
+        return body_len, n_chunks
+
+    # Returns the IV of the segment at the given index of a segmented CBC container: the encryption of the salt xored
+    # with the index. The first segment is instead preceded by the container's random first block.
+    @staticmethod
+    def _segment_iv(crypter, salt, index):
+        iv = bytearray((int.from_bytes(salt, 'big') ^ index).to_bytes(16, 'big'))
+        crypter.ecb_encrypt(iv, do_pad=False)
+        return bytes(iv)
+
+    # Splits a block of data at offset pos in the encrypted body of a CBC container into its pieces in each segment,
+    # returning the bounds of each piece within the block and the IV it is chained from. iv is the ciphertext block
+    # preceding the block, and is replaced by the segment's own IV wherever a segment begins.
+    def _cbc_pieces(self, crypter, length, salt, pos, iv):
+        if self.segment_size is None:
+            return [(0, length, iv)]
+        pieces, start = [], 0
+        while start < length:
+            index, offset = divmod(pos + start, self.segment_size)
+            if offset == 0 and index > 0:
+                iv = self._segment_iv(crypter, salt, index)
+            end = min(length, start + self.segment_size - offset)
+            pieces.append((start, end, iv))
+            start = end
+        return pieces
+
+    # Encrypts a block of data in place. pos is the offset of the block in the encrypted body, and iv the ciphertext
+    # block preceding it in CBC mode. Returns the iv for the next block. If single_thread is `True`, the block is
+    # encrypted on the calling thread only; otherwise the segments of segmented CBC containers are encrypted in
+    # parallel, on executor if given, so that it can be shared by the blocks of a file.
+    def _encrypt_block(self, crypter, block, salt, pos, iv, single_thread=False, executor=None):
         if isinstance(crypter, ChaChaCrypter):
-            # Use the first 12 bytes of the salt as the nonce
-            nonce = int.from_bytes(salt[:12], byteorder='little')
-            crypter.chacha_encrypt(data, nonce)
-        elif isinstance(crypter, AesCrypter):
-            getattr(crypter, self.mode + '_decrypt')(data)
+            # Use the start of the salt as the nonce, starting the key stream at the block's offset
+            nonce, wide = self._chacha_nonce(salt)
+            crypter.chacha_encrypt(block, nonce, 1 + pos//64, force_single_thread=single_thread, wide=wide)
+        elif self.mode == 'ctr':
+            # Use the whole salt as the initial counter block, starting at the block's offset
+            crypter.ctr_encrypt(block, int.from_bytes(salt, 'big'), pos//16, force_single_thread=single_thread)
+        elif self.mode == 'gcm':
+            # Use the first 12 bytes of the salt as the nonce. The data's counter blocks follow the initial counter
+            # block, which is left for generating the tag.
+            nonce = int.from_bytes(salt[:12], 'big') << 32
+            crypter.ctr_encrypt(block, nonce, 2 + pos//16, force_single_thread=single_thread)
+        else:
+            pieces = self._cbc_pieces(crypter, len(block), salt, pos, iv)
+
+            def encrypt(piece):
+                start, end, piece_iv = piece
+                with memoryview(block) as view, view[start:end] as data:
+                    crypter.cbc_encrypt(data, implicit=False, iv=piece_iv, do_pad=False)
+            if single_thread or len(pieces) == 1:
+                for piece in pieces:
+                    encrypt(piece)
+            elif executor is not None:
+                list(executor.map(encrypt, pieces))
+            else:
+                with ThreadPoolExecutor(N_THREADS) as executor:
+                    list(executor.map(encrypt, pieces))
+            return bytes(block[-16:])
+
+    # Decrypts a block of data in place, with the same arguments as `_encrypt_block`
+    def _decrypt_block(self, crypter, block, salt, pos, iv, single_thread=False):
+        if isinstance(crypter, ChaChaCrypter):
+            nonce, wide = self._chacha_nonce(salt)
+            crypter.chacha_encrypt(block, nonce, 1 + pos//64, force_single_thread=single_thread, wide=wide)
+        elif self.mode == 'ctr':
+            crypter.ctr_decrypt(block, int.from_bytes(salt, 'big'), pos//16, force_single_thread=single_thread)
+        elif self.mode == 'gcm':
+            nonce = int.from_bytes(salt[:12], 'big') << 32
+            crypter.ctr_decrypt(block, nonce, 2 + pos//16, force_single_thread=single_thread)
+        else:
+            next_iv = bytes(block[-16:])
+            for start, end, piece_iv in self._cbc_pieces(crypter, len(block), salt, pos, iv):
+                with memoryview(block) as view, view[start:end] as data:
+                    crypter.cbc_decrypt(data, iv=piece_iv, do_pad=False, force_single_thread=single_thread)
+            return next_iv
+
+    # Encrypts then authenticates, or authenticates then decrypts, a memoryview in place. This is done a block of
+    # FUSED_BLOCK_SIZE bytes at a time, so that each block is fed to the MAC while it is still in cache, and the data
+    # only passes through main memory once. pos, iv and executor are as in `_encrypt_block`, and the iv following the
+    # data is returned.
+    def _crypt_fused(self, crypter, view, salt, mac, encrypt, pos=0, iv=None, executor=None):
+        if encrypt and self.segment_size is not None:
+            # Segments are encrypted in parallel up front instead, which gains far more than fusing does
+            iv = self._encrypt_block(crypter, view, salt, pos, iv, executor=executor)
+            for i in range(0, len(view), FUSED_BLOCK_SIZE):
+                with view[i:i+FUSED_BLOCK_SIZE] as block:
+                    mac.update(block)
+            return iv
+        for i in range(0, len(view), FUSED_BLOCK_SIZE):
+            with view[i:i+FUSED_BLOCK_SIZE] as block:
+                if encrypt:
+                    iv = self._encrypt_block(crypter, block, salt, pos + i, iv)
+                    mac.update(block)
+                else:
+                    mac.update(block)
+                    iv = self._decrypt_block(crypter, block, salt, pos + i, iv)
+        return iv
+
+    # Generates the tag of the chunk at the given index, from a MAC fed with everything preceding the encrypted body.
+    # The index is authenticated along with the chunk, so that chunks cannot be reordered.
+    @staticmethod
+    def _chunk_tag(mac, index, chunk):
+        mac = mac.copy()
+        mac.update(index.to_bytes(8, 'little'))
+        mac.update(chunk)
+        return mac.digest()
+
+    # Generates the auth tag of a chunked container from the concatenated chunk tags, binding them and the length of
+    # the body together
+    @staticmethod
+    def _top_tag(mac, body_len, tags):
+        mac = mac.copy()
+        mac.update(body_len.to_bytes(8, 'little'))
+        mac.update(tags)
+        return mac.digest()
+
+    # Encrypts then authenticates chunks of the encrypted body in place, each on its own thread. view is a memoryview
+    # of the chunks, the first of which is at the given index in the body, and iv the ciphertext block preceding them
+    # in CBC mode. Returns a list of the chunk tags, and the iv following the chunks.
+    def _seal_chunks(self, crypter, view, salt, mac, index=0, iv=None):
+        chunk_size = self.chunk_size
+        if self.mode == 'cbc':  # CBC encryption is serial within segments, so is done before authenticating in parallel
+            iv = self._encrypt_block(crypter, view, salt, index*chunk_size, iv)
+
+        def seal(i):
+            with view[i*chunk_size:(i+1)*chunk_size] as chunk:
+                if self.mode != 'cbc':
+                    self._encrypt_block(crypter, chunk, salt, (index + i)*chunk_size, None, single_thread=True)
+                return self._chunk_tag(mac, index + i, chunk)
+        with ThreadPoolExecutor(N_THREADS) as executor:
+            return list(executor.map(seal, range(self._n_chunks(len(view))))), iv
+
+    # Authenticates then decrypts chunks of the encrypted body in place, each on its own thread. Arguments are as in
+    # `_seal_chunks`, with tags a sequence of the chunks' tags. If any chunk fails authentication, those that were
+    # decrypted are encrypted again before raising, so that no unauthenticated plaintext is left behind. Returns the
+    # iv following the chunks.
+    def _open_chunks(self, crypter, view, salt, mac, tags, index=0, iv=None):
+        chunk_size, ivs, next_iv = self.chunk_size, [None]*len(tags), None
+        if self.mode == 'cbc':
+            # Each chunk's IV is the last ciphertext block of the chunk before, so gather them before any is decrypted
+            ivs = [iv] + [bytes(view[i*chunk_size-16:i*chunk_size]) for i in range(1, len(tags))]
+            next_iv = bytes(view[-16:])
 
-    def pack(self, data):
+        def open_chunk(i):
+            with view[i*chunk_size:(i+1)*chunk_size] as chunk:
+                if not hmac.compare_digest(tags[i], self._chunk_tag(mac, index + i, chunk)):
+                    return False
+                self._decrypt_block(crypter, chunk, salt, (index + i)*chunk_size, ivs[i], single_thread=True)
+                return True
+        with ThreadPoolExecutor(N_THREADS) as executor:
+            opened = list(executor.map(open_chunk, range(len(tags))))
+        if not all(opened):
+            for i in range(len(tags)):
+                if opened[i]:
+                    with view[i*chunk_size:(i+1)*chunk_size] as chunk:
+                        self._encrypt_block(crypter, chunk, salt, (index + i)*chunk_size, ivs[i])
+            raise AuthError('Authentication tag of chunk %d not equal! The file is corrupt, tampered with, '
+                            'or the password is incorrect.' % (index + opened.index(False)))
+        return next_iv
+
+    # Packs size bytes of data into a container in place. view must be a writable memoryview holding the data at
+    # offset `headroom`, followed by `_tailroom(size)` bytes of space for any padding and chunk tags. A salt and the key
+    # derived with it may be given, and are otherwise generated.
+    def _pack_into(self, view, size, salt=None, key=None):
+        self._check_size(size)
+        salt, key = self._salt_and_key(salt, key)
+        prefix, auth_data = self._make_prefix(salt, key)
+        crypter = self.CrypterClass(key)
+        mac = self._new_mac(key, auth_data)
+        start, iv = len(prefix), None
+        if self.mode == 'cbc':
+            # A random first block serves as the IV for the rest, followed by the data and its padding
+            iv = get_random_bytes(16)
+            view[start:start+16] = iv
+            mac.update(iv)
+            start += 16
+            n_pad = 16 - size % 16
+            view[start+size:start+size+n_pad] = bytes([n_pad]*n_pad)
+            size += n_pad
+        with view[start:start+size] as body:
+            if self.chunk_size is None:
+                self._crypt_fused(crypter, body, salt, mac, True, iv=iv)
+                auth_tag = mac.digest()
+            else:
+                tags = b''.join(self._seal_chunks(crypter, body, salt, mac, iv=iv)[0])
+                view[start+size:] = tags
+                auth_tag = self._top_tag(mac, size, tags)
+        view[:len(prefix)] = prefix
+        view[40:72] = auth_tag.ljust(32, b'\x00')
+
+    # Authenticates and decrypts a container's payload in place, returning the bounds of the plaintext within it.
+    # If authentication fails, the payload is encrypted again before raising, so that no unauthenticated plaintext
+    # is left behind.
+    def _unpack_into(self, payload, key, salt, auth_data, auth_tag):
+        crypter = self.CrypterClass(key)
+        mac = self._new_mac(key, auth_data)
+        start, iv = 0, None
+        if self.mode == 'cbc':
+            if len(payload) < 16:
+                raise PackingError('Container payload is not a multiple of the block size.')
+            # The random first block serves as the IV for the rest
+            iv = bytes(payload[:16])
+            mac.update(iv)
+            start = 16
+        body_len, n_chunks = self._split_payload(len(payload) - start)
+        end = start + body_len
+        with payload[start:end] as body:
+            if n_chunks:
+                # Check the chunk tags are genuine before authenticating the chunks themselves
+                tags = bytes(payload[end:])
+                NescientPacker._check_auth_tag(auth_tag, self._top_tag(mac, body_len, tags))
+                self._open_chunks(crypter, body, salt, mac, [tags[i:i+32] for i in range(0, len(tags), 32)], iv=iv)
+            else:
+                self._crypt_fused(crypter, body, salt, mac, False, iv=iv)
+                try:
+                    NescientPacker._check_auth_tag(auth_tag, mac.digest())
+                except AuthError:
+                    self._encrypt_block(crypter, body, salt, 0, iv)
+                    raise
+        return start, end - payload[end-1] if iv is not None else end
+
+    def pack(self, data, reserved=False):
         """ Pack data into an in-memory Nescient container in place.
 
+        The data is encrypted and authenticated where it is, without being copied. Unless space has been reserved in
+        front of it, the data is moved once to make room for the container's header.
+
         Args:
             data: The bytearray representing the data.
+            reserved (bool): If `True`, the first `headroom` bytes of data are not part of the data, but space reserved
+                for the container's header, which is then written there without moving the data at all.
         """
-        # Generate and verify 24 byte Nescient header
-        version_tuple = version_to_tuple(__version__)[:3]
-        header = bytearray('NESC' + '%02d.%02d.%02d' % version_tuple + self.alg + self.mode + self.auth, 'utf-8')
-        if len(header) != 24:
-            raise PackingError('Invalid Nescient header ' + str(header, 'utf-8'))
-        # Encrypt-then-MAC the data
-        key, salt = self._encrypt(data)
-        auth_tag = self._gen_auth_tag(key, header + salt, data)
-        # Prepend the header, salt, and auth_tag to the data
-        data[:] = header + salt + auth_tag + data
+        size = len(data) - self.headroom if reserved else len(data)
+        if not reserved:
+            data[:0] = bytes(self.headroom)
+        data.extend(bytes(self._tailroom(size)))  # Make room for any padding and chunk tags
+        with memoryview(data) as view:
+            self._pack_into(view, size)
 
     def unpack(self, data):
         """ Unpack an in-memory Nescient container in place.
 
         Args:
-            data: The bytearray representing the Nescient container.
+            data: The bytearray representing the Nescient container. Any other writable buffer is accepted as well.
+
+        Returns:
+            The unpacked data. A bytearray is stripped of the container's header and padding without moving the data,
+            and returned. Buffers that cannot be resized are left as they are, and a memoryview of the region of the
+            buffer holding the data is returned instead.
         """
         # Parse the nescient header of the data
         parsed = NescientPacker.parse_nescient_header(data)
-        header, alg, mode, auth, salt, auth_tag = [parsed[name] for name in ['header', 'alg', 'mode', 'auth', 'salt', 'auth_tag']]
         # Initialize a packer with these settings
-        temp_unpacker = NescientPacker(self.password, alg, mode, auth)
-        auth_tag = data[40:72]
-        data[:] = data[72:]  # 24 header bytes, 16 salt bytes and 32 auth_tag bytes == 72
-        key = temp_unpacker._key_gen(salt)
-        new_auth_tag = temp_unpacker._gen_auth_tag(key, header + salt, data)
-        if not hmac.compare_digest(auth_tag, new_auth_tag):
-            raise AuthError('Authentication tags not equal! The file is corrupt, tampered with, '
-                            'or the password is incorrect.')
-        temp_unpacker._decrypt(data, key, salt)
+        temp_unpacker = self._unpacker(parsed)
+        key = temp_unpacker._unpack_key(parsed)
+        offset = parsed['offset']
+        with memoryview(data) as view, view[offset:] as payload:
+            start, end = temp_unpacker._unpack_into(payload, key, parsed['salt'], parsed['auth_data'],
+                                                    parsed['auth_tag'])
+        start, end = start + offset, end + offset
+        if isinstance(data, bytearray):
+            # Deleting from either end of a bytearray only adjusts its bounds, and does not move its contents
+            del data[end:]
+            del data[:start]
+            return data
+        return memoryview(data)[start:end]
+
+    # Yields successive chunks of at most chunk_size bytes of a stream made up of size bytes read from a file object,
+    # followed by the bytes of after (such as padding). At least one chunk, possibly empty, is always yielded.
+    @staticmethod
+    def _read_stream(f_in, size, chunk_size, after=b''):
+        pos, total = 0, size + len(after)
+        while True:
+            chunk = bytearray(min(chunk_size, total - pos))
+            n_read = max(0, min(len(chunk), size - pos))
+            with memoryview(chunk) as view:
+                if f_in.readinto(view[:n_read]) != n_read:
+                    raise PackingError('File ended unexpectedly; was it modified during processing?')
+                view[n_read:] = after[pos + n_read - size:pos + len(chunk) - size]
+            pos += len(chunk)
+            yield chunk
+            if pos == total:
+                return
+
+    # Reads the prefix of a container from a file object of the given size, leaving the file at the payload. Returns
+    # the parsed prefix, along with a packer with the container's settings and the container's key. The key is only
+    # derived if not given along with the container's salt.
+    def _read_prefix(self, f_in, size, salt=None, key=None):
+        prefix = bytearray(min(size, 74 + 2**16))
+        f_in.readinto(prefix)
+        parsed = NescientPacker.parse_nescient_header(prefix)
+        f_in.seek(parsed['offset'])
+        temp_unpacker = self._unpacker(parsed)
+        return parsed, temp_unpacker, temp_unpacker._unpack_key(parsed, salt, key)
+
+    # Reads the random first block of a CBC payload of the given length from a file object, feeding it to the MAC
+    @staticmethod
+    def _read_iv(f_in, length, mac):
+        if length < 16:
+            raise PackingError('Container payload is not a multiple of the block size.')
+        iv = f_in.read(16)
+        mac.update(iv)
+        return iv
+
+    # Reads the chunk tags following an encrypted body of the given length from a file object positioned at the start
+    # of the body, and checks them against the container's auth tag. Returns a list of the tags, leaving the file where
+    # it was.
+    @staticmethod
+    def _read_chunk_tags(f_in, body_len, n_chunks, mac, auth_tag):
+        body_start = f_in.tell()
+        f_in.seek(body_start + body_len)
+        tags = f_in.read(32*n_chunks)
+        NescientPacker._check_auth_tag(auth_tag, NescientPacker._top_tag(mac, body_len, tags))
+        f_in.seek(body_start)
+        return [tags[i:i+32] for i in range(0, len(tags), 32)]
+
+    # Returns the number of bytes of a container that is not chunked to read at a time when streaming it. Segmented
+    # containers are read a whole number of segments at a time, at least one per thread, so that the segments of each
+    # read are encrypted in parallel.
+    def _stream_block_size(self):
+        if self.segment_size is None:
+            return CHUNK_SIZE
+        return self.segment_size*max(N_THREADS, CHUNK_SIZE // self.segment_size)
+
+    # Packs a file object into another, a chunk at a time. Chunked containers are read a chunk per thread at a time.
+    def _pack_stream(self, f_in, f_out, size, salt=None, key=None):
+        self._check_size(size)
+        salt, key = self._salt_and_key(salt, key)
+        prefix, auth_data = self._make_prefix(salt, key)
+        # The auth tag is only known once all the data has been encrypted, so it is filled in afterwards
+        f_out.write(prefix)
+        mac = self._new_mac(key, auth_data)
+        crypter = self.CrypterClass(key)
+        iv, padding = None, b''
+        if self.mode == 'cbc':
+            # A random first block serves as the IV for the rest, and the data is padded
+            iv = get_random_bytes(16)
+            mac.update(iv)
+            f_out.write(iv)
+            padding = bytes([16 - size % 16]*(16 - size % 16))
+        if self.chunk_size is None:
+            pos = 0
+            with ThreadPoolExecutor(N_THREADS) as executor:
+                for chunk in self._read_stream(f_in, size, self._stream_block_size(), padding):
+                    with memoryview(chunk) as view:
+                        iv = self._crypt_fused(crypter, view, salt, mac, True, pos, iv, executor)
+                    f_out.write(chunk)
+                    pos += len(chunk)
+            auth_tag = mac.digest()
+        else:
+            tags = []
+            for chunks in self._read_stream(f_in, size, self.chunk_size*N_THREADS, padding):
+                with memoryview(chunks) as view:
+                    chunk_tags, iv = self._seal_chunks(crypter, view, salt, mac, len(tags), iv)
+                f_out.write(chunks)
+                tags += chunk_tags
+            tags = b''.join(tags)
+            f_out.write(tags)
+            auth_tag = self._top_tag(mac, size + len(padding), tags)
+        f_out.seek(40)
+        f_out.write(auth_tag.ljust(32, b'\x00'))
+
+    # Unpacks a file object into another, a chunk at a time. The payload is authenticated as it is decrypted; should
+    # authentication fail, the caller must discard everything written to f_out.
+    def _unpack_stream(self, f_in, f_out, size, salt=None, key=None):
+        parsed, temp_unpacker, key = self._read_prefix(f_in, size, salt, key)
+        salt = parsed['salt']
+        mac = temp_unpacker._new_mac(key, parsed['auth_data'])
+        crypter = temp_unpacker.CrypterClass(key)
+        length, iv = size - parsed['offset'], None
+        if temp_unpacker.mode == 'cbc':
+            iv = self._read_iv(f_in, length, mac)
+            length -= 16
+        body_len, n_chunks = temp_unpacker._split_payload(length)
+        if n_chunks:
+            tags = self._read_chunk_tags(f_in, body_len, n_chunks, mac, parsed['auth_tag'])
+            chunk_size = temp_unpacker.chunk_size
+            index = 0
+            for chunks in self._read_stream(f_in, body_len, chunk_size*N_THREADS):
+                n_read = temp_unpacker._n_chunks(len(chunks))
+                with memoryview(chunks) as view:
+                    iv = temp_unpacker._open_chunks(crypter, view, salt, mac, tags[index:index+n_read], index, iv)
+                f_out.write(chunks)
+                index += n_read
+        else:
+            pos = 0
+            for chunks in self._read_stream(f_in, body_len, temp_unpacker._stream_block_size()):
+                with memoryview(chunks) as view:
+                    iv = temp_unpacker._crypt_fused(crypter, view, salt, mac, False, pos, iv)
+                f_out.write(chunks)
+                pos += len(chunks)
+            NescientPacker._check_auth_tag(parsed['auth_tag'], mac.digest())
+        if temp_unpacker.mode == 'cbc':  # Strip the padding
+            f_out.truncate(f_out.tell() - chunks[-1])
 
-    def pack_or_unpack_file(self, in_path, out_path, packing_choice, overwrite=True):
-        with ExitStack() as stack:
-            f_in = stack.enter_context(open(in_path, 'rb'))
-            data = bytearray(os.path.getsize(in_path))
-            f_in.readinto(data)
+    # Packs a file object into another by mapping the output file into memory, reading the input directly into the
+    # mapping and encrypting it there. The kernel pages the data in and out as needed, so it is never all resident.
+    def _pack_mmap(self, f_in, f_out, size, salt=None, key=None):
+        start = self.headroom
+        length = start + size + self._tailroom(size)
+        f_out.truncate(length)
+        mm = mmap.mmap(f_out.fileno(), length)
+        try:
+            with memoryview(mm) as view:
+                if f_in.readinto(view[start:start+size]) != size:
+                    raise PackingError('File ended unexpectedly; was it modified during processing?')
+                self._pack_into(view, size, salt, key)
+        finally:
+            mm.close()
+
+    # Unpacks a file object into another by mapping the output file into memory, reading the payload directly into
+    # the mapping, then authenticating and decrypting it in place. As with `_unpack_stream`, the caller must discard
+    # the output if authentication fails.
+    def _unpack_mmap(self, f_in, f_out, size, salt=None, key=None):
+        parsed, temp_unpacker, key = self._read_prefix(f_in, size, salt, key)
+        salt = parsed['salt']
+        mac = temp_unpacker._new_mac(key, parsed['auth_data'])
+        crypter = temp_unpacker.CrypterClass(key)
+        length, iv = size - parsed['offset'], None
+        if temp_unpacker.mode == 'cbc':  # The random first block is never written out
+            iv = self._read_iv(f_in, length, mac)
+            length -= 16
+        body_len, n_chunks = temp_unpacker._split_payload(length)
+        if n_chunks:
+            tags = self._read_chunk_tags(f_in, body_len, n_chunks, mac, parsed['auth_tag'])
+        f_out.truncate(body_len)
+        if body_len > 0:  # Empty files cannot be mapped
+            mm = mmap.mmap(f_out.fileno(), body_len)
+            try:
+                with memoryview(mm) as view:
+                    if f_in.readinto(view) != body_len:
+                        raise PackingError('File ended unexpectedly; was it modified during processing?')
+                    if n_chunks:
+                        temp_unpacker._open_chunks(crypter, view, salt, mac, tags, iv=iv)
+                    else:
+                        temp_unpacker._crypt_fused(crypter, view, salt, mac, False, iv=iv)
+                    if temp_unpacker.mode == 'cbc':
+                        body_len -= view[-1]  # Strip the padding
+            finally:
+                mm.close()
+            f_out.truncate(body_len)
+        if not n_chunks:
+            NescientPacker._check_auth_tag(parsed['auth_tag'], mac.digest())
+
+    def pack_or_unpack_file(self, in_path, out_path, packing_choice, overwrite=True, use_mmap=False, salt=None,
+                            key=None):
+        """ Pack or unpack a file, streaming it through in chunks of `CHUNK_SIZE` bytes.
+
+        Memory use is independent of the size of the file. Output is written to a temporary file in the same directory
+        as `out_path`, which replaces `out_path` only once processing succeeds.
+
+        Args:
+            in_path (str): The path of the file to process.
+            out_path (str): The path to write the processed file to.
+            packing_choice (str): Either `'pack'` or `'unpack'`.
+            overwrite (bool): If `True`, the file at `in_path` is removed once it has been processed.
+            use_mmap (bool): If `True`, instead of streaming, the output file is memory-mapped, the input read directly
+                into it and processed there in place. This avoids copying the data through intermediate buffers, and
+                suits files that fit in the address space but not in memory.
+            salt (bytes): A salt, as returned by a future yielded by `prefetch_keys`.
+            key (bytes): The key derived with salt. If a salt and key are given, the file is packed with them, rather
+                than with a new salt and key, or, if the salt is that of the container being unpacked, the key is not
+                derived again.
+        """
+        size = os.path.getsize(in_path)
+        fd, temp_path = tempfile.mkstemp(prefix='.nescient-', dir=os.path.dirname(os.path.abspath(out_path)))
+        try:
+            with ExitStack() as stack:
+                # The temporary file is wrapped first, so that it is closed even if the input cannot be opened
+                f_out = stack.enter_context(open(fd, 'w+b'))
+                f_in = stack.enter_context(open(in_path, 'rb'))
+                if packing_choice == 'pack':
+                    (self._pack_mmap if use_mmap else self._pack_stream)(f_in, f_out, size, salt, key)
+                else:
+                    (self._unpack_mmap if use_mmap else self._unpack_stream)(f_in, f_out, size, salt, key)
+            shutil.copymode(in_path, temp_path)
+            os.replace(temp_path, out_path)
+        except BaseException:
+            os.remove(temp_path)
+            raise
+        if overwrite and os.path.abspath(in_path) != os.path.abspath(out_path):
+            os.remove(in_path)
+
+    def prefetch_keys(self, paths, packing_choice, depth=PREFETCH_DEPTH):
+        """ Derive the keys of files to be packed or unpacked ahead of time, on a thread pool.
+
+        Key derivation releases the GIL, so keys for upcoming files are derived while the current file is being
+        processed, hiding the cost of key derivation in runs over many files. At most `depth` keys are derived ahead
+        of the file being processed.
+
+        Args:
+            paths: An iterable of the paths of the files to be processed, in order.
+            packing_choice (str): Either `'pack'` or `'unpack'`.
+            depth (int): The number of files whose keys are derived ahead of time.
+
+        Returns:
+            A generator yielding a `Future` for each path in order, whose result is a tuple `(salt, key)` to pass on to
+            `pack_or_unpack_file`. When unpacking, the future raises a `PackingError` if the file is not a valid
+            Nescient container.
+        """
+        def derive(path):
             if packing_choice == 'pack':
-                self.pack(data)
-            else:
-                self.unpack(data)
-            # Close the file descriptor
-            stack.close()
-            if overwrite:
-                f_out = stack.enter_context(open(in_path, 'wb'))
-                f_out.write(data)
-                stack.close()
-                os.replace(in_path, out_path)
-            else:
-                f_out = stack.enter_context(open(out_path, 'wb'))
-                f_out.write(data)
+                return self._salt_and_key()
+            parsed = NescientPacker.parse_nescient_header(path)
+            return parsed['salt'], self._unpacker(parsed)._unpack_key(parsed)
+        with ThreadPoolExecutor(depth) as executor:
+            futures = deque()
+            for path in paths:
+                futures.append(executor.submit(derive, path))
+                if len(futures) > depth:
+                    yield futures.popleft()
+            while futures:
+                yield futures.popleft()
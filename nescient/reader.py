@@ -0,0 +1,154 @@
+# Nescient: A Python program for packing/unpacking encrypted, salted, and authenticated file containers.
+# Copyright (C) 2018 Ariel Antonitis. Licensed under the MIT license.
+#
+# nescient/reader.py
+""" The NescientReader class, a seekable file-like object for reading the data of Nescient container files. """
+import io
+import os
+import hmac
+from hashlib import blake2b
+
+from nescient.packer import NescientPacker, AuthError
+
+# The number of bytes decrypted at a time when reading from containers that are not chunked.
+# Must be a multiple of both the ChaCha block size (64) and the AES block size (16).
+READ_BLOCK_SIZE = 2**16
+
+# The size in bytes of the digests kept of each block of containers that are not chunked
+DIGEST_SIZE = 32
+
+
+class NescientReader(io.RawIOBase):
+    """ Read-only, seekable file-like object over the data of a Nescient container file.
+
+    Only the blocks of the container holding the data read are decrypted, so that a small range can be read out of a
+    large container without unpacking it. Chunked containers are authenticated a chunk at a time as chunks are first
+    read, and reading a corrupted chunk raises an `AuthError`. In CBC mode, reading the chunk following a corrupted one
+    does too, as it is decrypted with the last ciphertext block of the corrupted chunk as its IV. Containers that are
+    not chunked have no finer-grained tags, and are instead authenticated in full when the reader is opened. A digest
+    of each of their blocks is kept along the way (`DIGEST_SIZE` bytes per `READ_BLOCK_SIZE` bytes), and blocks read
+    afterwards are checked against it, so that reading a block changed after the reader was opened also raises an
+    `AuthError`.
+
+    Args:
+        path (str): The path of the container file to read.
+        password: The password the container was packed with. Must be a `str` or `bytes` object.
+
+    Raises:
+        AuthError: If the container, or the chunk tags of a chunked container, fail authentication.
+    """
+    def __init__(self, path, password):
+        super().__init__()
+        self._file = None
+        try:
+            self._file = open(path, 'rb')
+            self._open(os.path.getsize(path), password)
+        except BaseException:
+            self.close()
+            raise
+
+    # Reads the container's prefix and derives its key, then authenticates the container (or its chunk tags)
+    def _open(self, size, password):
+        f_in = self._file
+        parsed, self._packer, key = NescientPacker(password)._read_prefix(f_in, size)
+        self._salt = parsed['salt']
+        self._crypter = self._packer.CrypterClass(key)
+        self._mac = self._packer._new_mac(key, parsed['auth_data'])
+        length, self._iv = size - parsed['offset'], None
+        if self._packer.mode == 'cbc':
+            self._iv = NescientPacker._read_iv(f_in, length, self._mac)
+            length -= 16
+        self._body_start = f_in.tell()
+        self._body_len, n_chunks = self._packer._split_payload(length)
+        if n_chunks:
+            self._block_size = self._packer.chunk_size
+            self._tags = NescientPacker._read_chunk_tags(f_in, self._body_len, n_chunks, self._mac, parsed['auth_tag'])
+            self._digests = None
+        else:
+            self._block_size = READ_BLOCK_SIZE
+            self._tags = None
+            # Authenticate the whole container, without decrypting any of it, keeping a digest of each block
+            mac, self._digests = self._mac.copy(), []
+            for _ in range(0, self._body_len, READ_BLOCK_SIZE):
+                block = f_in.read(READ_BLOCK_SIZE)
+                mac.update(block)
+                self._digests.append(blake2b(block, digest_size=DIGEST_SIZE).digest())
+            NescientPacker._check_auth_tag(parsed['auth_tag'], mac.digest())
+        self._index, self._block, self._next_iv = None, b'', None
+        self._pos, self._size = 0, self._body_len
+        if self._packer.mode == 'cbc':  # Strip the padding, found at the end of the last block
+            self._size -= self._read_block((self._body_len - 1) // self._block_size)[-1]
+
+    # Reads the encrypted block of the container's body at the given index, authenticating it if chunked, or checking
+    # it against its digest otherwise
+    def _read_encrypted(self, index):
+        start = index*self._block_size
+        self._file.seek(self._body_start + start)
+        block = bytearray(min(self._block_size, self._body_len - start))
+        self._file.readinto(block)
+        if self._tags is not None and not hmac.compare_digest(self._tags[index],
+                                                             NescientPacker._chunk_tag(self._mac, index, block)):
+            raise AuthError('Authentication tag of chunk %d not equal! The file is corrupt, tampered with, '
+                            'or the password is incorrect.' % index)
+        if self._digests is not None and not hmac.compare_digest(self._digests[index],
+                                                                blake2b(block, digest_size=DIGEST_SIZE).digest()):
+            raise AuthError('Block %d changed since the container was authenticated! The file was modified while '
+                            'being read.' % index)
+        return block
+
+    # Returns the decrypted block of the container's body at the given index. The last block read is kept, so that
+    # reading a block a little at a time only decrypts it once.
+    def _read_block(self, index):
+        if index == self._index:
+            return self._block
+        iv = self._iv
+        if self._packer.mode == 'cbc' and index > 0:
+            # The IV is the ciphertext block preceding this one, which is checked along with the block it ends. When
+            # reading sequentially, it is the one kept from the last block read.
+            iv = self._next_iv if index - 1 == self._index else bytes(self._read_encrypted(index - 1)[-16:])
+        block = self._read_encrypted(index)
+        self._next_iv = bytes(block[-16:])
+        self._packer._decrypt_block(self._crypter, block, self._salt, index*self._block_size, iv)
+        self._index, self._block = index, block
+        return block
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self._pos
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_SET:
+            pos = offset
+        elif whence == io.SEEK_CUR:
+            pos = self._pos + offset
+        elif whence == io.SEEK_END:
+            pos = self._size + offset
+        else:
+            raise ValueError('Invalid whence (%r).' % whence)
+        if pos < 0:
+            raise ValueError('Negative seek position %d.' % pos)
+        self._pos = pos
+        return pos
+
+    def readinto(self, b):
+        with memoryview(b) as buffer, buffer.cast('B') as view:
+            n_read = max(0, min(len(view), self._size - self._pos))
+            done = 0
+            while done < n_read:
+                index, offset = divmod(self._pos + done, self._block_size)
+                block = self._read_block(index)
+                n = min(n_read - done, len(block) - offset)
+                view[done:done+n] = block[offset:offset+n]
+                done += n
+        self._pos += n_read
+        return n_read
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+        super().close()
@@ -6,87 +6,256 @@
 import os
 import unittest
 import pickle
+import tempfile
+import hashlib
 from unittest import mock
 from random import randint
+from itertools import product
 
-from nescient.packer import NescientPacker, PACKING_MODES
+from nescient import packer as packer_module, reader as reader_module
+from nescient.crypto import aes as aes_module
+from nescient.packer import NescientPacker, PACKING_MODES, AEAD_AUTH, PackingError, ParamError, AuthError
+from nescient.reader import NescientReader
 from nescient.process import process_sync_wrapper
 from nescient.crypto.aes import AesCrypter
-from nescient.crypto.chacha import ChaChaCrypter
-from nescient.crypto.tools import get_random_bytes, randbits
+from nescient.crypto.aes_tables import HEADER_PATH, make_sboxes, write_header
+from nescient.crypto.chacha import ChaChaCrypter, Poly1305
+from nescient.crypto.galois import GaloisField, np
+from nescient.crypto import tools as tools_module
+from nescient.crypto.tools import get_random_bytes, randbits, hkdf, available_cpus
+
+# Packing modes whose containers can be chunked: those authenticated with HMACs
+CHUNKED_MODES = [packing_mode for packing_mode in PACKING_MODES if packing_mode.split('-')[2] not in AEAD_AUTH]
 
 
 class AesTest(unittest.TestCase):
     # Test vectors are taken from FIPS 197 Appendix C
     # CBC test vectors are taken from NIST Special Publication 800-38a, Appendix F.2
+    # CTR test vectors are taken from NIST Special Publication 800-38a, Appendix F.5
+    # GCM test vectors are taken from the GCM specification (McGrew and Viega), Appendix B
+    # Each vector is checked against both the T-table and the byte-oriented ciphers
     def test_vector_1(self):
-        key = bytes.fromhex('000102030405060708090a0b0c0d0e0f')
-        crypter = AesCrypter(key)
-        data = bytearray.fromhex('00112233445566778899aabbccddeeff')
-        expected1 = bytes.fromhex('69c4e0d86a7b0430d8cdb78070b4c55a')
-        expected2 = data[:]
-        crypter.ecb_encrypt(data, do_pad=False)
-        self.assertEqual(expected1, data)
-        crypter.ecb_decrypt(data, do_pad=False)
-        self.assertEqual(expected2, data)
+        for t_tables in [False, True]:
+            key = bytes.fromhex('000102030405060708090a0b0c0d0e0f')
+            crypter = AesCrypter(key, t_tables)
+            data = bytearray.fromhex('00112233445566778899aabbccddeeff')
+            expected1 = bytes.fromhex('69c4e0d86a7b0430d8cdb78070b4c55a')
+            expected2 = data[:]
+            crypter.ecb_encrypt(data, do_pad=False)
+            self.assertEqual(expected1, data)
+            crypter.ecb_decrypt(data, do_pad=False)
+            self.assertEqual(expected2, data)
 
     def test_vector_2(self):
-        key = bytes.fromhex('000102030405060708090a0b0c0d0e0f1011121314151617')
-        crypter = AesCrypter(key)
-        data = bytearray.fromhex('00112233445566778899aabbccddeeff')
-        expected1 = bytes.fromhex('dda97ca4864cdfe06eaf70a0ec0d7191')
-        expected2 = data[:]
-        crypter.ecb_encrypt(data, do_pad=False)
-        self.assertEqual(expected1, data)
-        crypter.ecb_decrypt(data, do_pad=False)
-        self.assertEqual(expected2, data)
+        for t_tables in [False, True]:
+            key = bytes.fromhex('000102030405060708090a0b0c0d0e0f1011121314151617')
+            crypter = AesCrypter(key, t_tables)
+            data = bytearray.fromhex('00112233445566778899aabbccddeeff')
+            expected1 = bytes.fromhex('dda97ca4864cdfe06eaf70a0ec0d7191')
+            expected2 = data[:]
+            crypter.ecb_encrypt(data, do_pad=False)
+            self.assertEqual(expected1, data)
+            crypter.ecb_decrypt(data, do_pad=False)
+            self.assertEqual(expected2, data)
 
     def test_vector_3(self):
-        key = bytes.fromhex('000102030405060708090a0b0c0d0e0f101112131415161718191a1b1c1d1e1f')
-        crypter = AesCrypter(key)
-        data = bytearray.fromhex('00112233445566778899aabbccddeeff')
-        expected1 = bytes.fromhex('8ea2b7ca516745bfeafc49904b496089')
-        expected2 = data[:]
-        crypter.ecb_encrypt(data, do_pad=False)
-        self.assertEqual(expected1, data)
-        crypter.ecb_decrypt(data, do_pad=False)
-        self.assertEqual(expected2, data)
+        for t_tables in [False, True]:
+            key = bytes.fromhex('000102030405060708090a0b0c0d0e0f101112131415161718191a1b1c1d1e1f')
+            crypter = AesCrypter(key, t_tables)
+            data = bytearray.fromhex('00112233445566778899aabbccddeeff')
+            expected1 = bytes.fromhex('8ea2b7ca516745bfeafc49904b496089')
+            expected2 = data[:]
+            crypter.ecb_encrypt(data, do_pad=False)
+            self.assertEqual(expected1, data)
+            crypter.ecb_decrypt(data, do_pad=False)
+            self.assertEqual(expected2, data)
 
     def test_cbc_vector_1(self):
-        key = bytes.fromhex('2b7e151628aed2a6abf7158809cf4f3c')
-        crypter = AesCrypter(key)
-        iv = bytes.fromhex('000102030405060708090a0b0c0d0e0f')
-        data = bytearray.fromhex('6bc1bee22e409f96e93d7e117393172a'
-                                 'ae2d8a571e03ac9c9eb76fac45af8e51'
-                                 '30c81c46a35ce411e5fbc1191a0a52ef'
-                                 'f69f2445df4f9b17ad2b417be66c3710')
-        expected1 = bytes.fromhex('7649abac8119b246cee98e9b12e9197d'
-                                  '5086cb9b507219ee95db113a917678b2'
-                                  '73bed6b8e3c1743b7116e69e22229516'
-                                  '3ff1caa1681fac09120eca307586e1a7')
-        expected2 = data[:]
-        crypter.cbc_encrypt(data, implicit=False, iv=iv, do_pad=False)
-        self.assertEqual(expected1, data)
-        crypter.cbc_decrypt(data, iv=iv, do_pad=False)
-        self.assertEqual(expected2, data)
+        for t_tables in [False, True]:
+            key = bytes.fromhex('2b7e151628aed2a6abf7158809cf4f3c')
+            crypter = AesCrypter(key, t_tables)
+            iv = bytes.fromhex('000102030405060708090a0b0c0d0e0f')
+            data = bytearray.fromhex('6bc1bee22e409f96e93d7e117393172a'
+                                     'ae2d8a571e03ac9c9eb76fac45af8e51'
+                                     '30c81c46a35ce411e5fbc1191a0a52ef'
+                                     'f69f2445df4f9b17ad2b417be66c3710')
+            expected1 = bytes.fromhex('7649abac8119b246cee98e9b12e9197d'
+                                      '5086cb9b507219ee95db113a917678b2'
+                                      '73bed6b8e3c1743b7116e69e22229516'
+                                      '3ff1caa1681fac09120eca307586e1a7')
+            expected2 = data[:]
+            crypter.cbc_encrypt(data, implicit=False, iv=iv, do_pad=False)
+            self.assertEqual(expected1, data)
+            crypter.cbc_decrypt(data, iv=iv, do_pad=False)
+            self.assertEqual(expected2, data)
 
     def test_cbc_vector_2(self):
-        key = bytes.fromhex('8e73b0f7da0e6452c810f32b809079e562f8ead2522c6b7b')
+        for t_tables in [False, True]:
+            key = bytes.fromhex('8e73b0f7da0e6452c810f32b809079e562f8ead2522c6b7b')
+            crypter = AesCrypter(key, t_tables)
+            iv = bytes.fromhex('000102030405060708090a0b0c0d0e0f')
+            data = bytearray.fromhex('6bc1bee22e409f96e93d7e117393172a'
+                                     'ae2d8a571e03ac9c9eb76fac45af8e51'
+                                     '30c81c46a35ce411e5fbc1191a0a52ef'
+                                     'f69f2445df4f9b17ad2b417be66c3710')
+            expected1 = bytes.fromhex('4f021db243bc633d7178183a9fa071e8'
+                                      'b4d9ada9ad7dedf4e5e738763f69145a'
+                                      '571b242012fb7ae07fa9baac3df102e0'
+                                      '08b0e27988598881d920a9e64f5615cd')
+            expected2 = data[:]
+            crypter.cbc_encrypt(data, implicit=False, iv=iv, do_pad=False)
+            self.assertEqual(expected1, data)
+            crypter.cbc_decrypt(data, iv=iv, do_pad=False)
+            self.assertEqual(expected2, data)
+
+    def test_ctr_vector_1(self):
+        for t_tables in [False, True]:
+            key = bytes.fromhex('2b7e151628aed2a6abf7158809cf4f3c')
+            crypter = AesCrypter(key, t_tables)
+            nonce = int('f0f1f2f3f4f5f6f7f8f9fafbfcfdfeff', 16)
+            data = bytearray.fromhex('6bc1bee22e409f96e93d7e117393172a'
+                                     'ae2d8a571e03ac9c9eb76fac45af8e51'
+                                     '30c81c46a35ce411e5fbc1191a0a52ef'
+                                     'f69f2445df4f9b17ad2b417be66c3710')
+            expected1 = bytes.fromhex('874d6191b620e3261bef6864990db6ce'
+                                      '9806f66b7970fdff8617187bb9fffdff'
+                                      '5ae4df3edbd5d35e5b4f09020db03eab'
+                                      '1e031dda2fbe03d1792170a0f3009cee')
+            expected2 = data[:]
+            crypter.ctr_encrypt(data, nonce)
+            self.assertEqual(expected1, data)
+            crypter.ctr_decrypt(data, nonce)
+            self.assertEqual(expected2, data)
+            # Starting the counter partway through must give the rest of the key stream
+            data = expected2[32:]
+            crypter.ctr_encrypt(data, nonce, 2)
+            self.assertEqual(expected1[32:], data)
+
+    def test_gcm_vector_1(self):
+        for t_tables in [False, True]:
+            crypter = AesCrypter(bytes(16), t_tables)
+            data = bytearray(16)
+            expected1 = bytes.fromhex('0388dace60b6a392f328c2b971b2fe78')
+            expected2 = data[:]
+            nonce, tag = crypter.gcm_encrypt(data, bytes(12))
+            self.assertEqual(expected1, data)
+            self.assertEqual(bytes.fromhex('ab6e47d42cec13bdf53a67b21257bddf'), tag)
+            crypter.gcm_decrypt(data, nonce, tag)
+            self.assertEqual(expected2, data)
+
+    def test_gcm_vector_2(self):
+        for t_tables in [False, True]:
+            crypter = AesCrypter(bytes.fromhex('feffe9928665731c6d6a8f9467308308'), t_tables)
+            nonce = bytes.fromhex('cafebabefacedbaddecaf888')
+            aad = bytes.fromhex('feedfacedeadbeeffeedfacedeadbeefabaddad2')
+            data = bytearray.fromhex('d9313225f88406e5a55909c5aff5269a'
+                                     '86a7a9531534f7da2e4c303d8a318a72'
+                                     '1c3c0c95956809532fcf0e2449a6b525'
+                                     'b16aedf5aa0de657ba637b39')
+            expected1 = bytes.fromhex('42831ec2217774244b7221b784d0d49c'
+                                      'e3aa212f2c02a4e035c17e2329aca12e'
+                                      '21d514b25466931c7d8f6a5aac84aa05'
+                                      '1ba30b396a0aac973d58e091')
+            expected2 = data[:]
+            _, tag = crypter.gcm_encrypt(data, nonce, aad)
+            self.assertEqual(expected1, data)
+            self.assertEqual(bytes.fromhex('5bc94fbc3221a5db94fae95ae7121a47'), tag)
+            # Feeding the data in uneven pieces must give the same tag
+            mac = crypter.gcm_mac(nonce, aad)
+            for i in range(0, len(data), 7):
+                mac.update(data[i:i+7])
+            self.assertEqual(tag, mac.copy().digest())
+            data[3] ^= 1
+            with self.assertRaises(ValueError):
+                crypter.gcm_decrypt(data, nonce, tag, aad)
+            data[3] ^= 1
+            crypter.gcm_decrypt(data, nonce, tag, aad)
+            self.assertEqual(expected2, data)
+
+    # Checks that the interleaved core gives the same output as the one-block loop, including on the blocks left over
+    # when the number of blocks is not a multiple of the number interleaved
+    def test_interleave(self):
+        key = get_random_bytes(24)
+        crypter1, crypter2 = AesCrypter(key, interleave=False), AesCrypter(key, interleave=True)
+        iv = get_random_bytes(16)
+        for size in [16, 48, 160, 16*101 + 5]:
+            data = get_random_bytes(size)
+            for method, kwargs in [('ecb_encrypt', {'do_pad': False}), ('ecb_decrypt', {'do_pad': False}),
+                                   ('cbc_decrypt', {'iv': iv, 'do_pad': False}), ('ctr_encrypt', {'nonce': 2**128-3})]:
+                if method != 'ctr_encrypt' and size % 16:
+                    continue
+                data1, data2 = bytearray(data), bytearray(data)
+                getattr(crypter1, method)(data1, **kwargs)
+                getattr(crypter2, method)(data2, **kwargs)
+                self.assertEqual(data1, data2)
+
+    # Checks that the tables compiled into the extension are those generated from scratch
+    def test_tables(self):
+        self.assertEqual((AesCrypter.sbox, AesCrypter.inv_sbox), make_sboxes())
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, 'aes_tables.h')
+            write_header(path)
+            with open(path) as f, open(HEADER_PATH) as header:
+                self.assertEqual(f.read(), header.read())
+
+    # Checks that expanded keys are cached, and zeroed once evicted without affecting crypters that use them
+    def test_key_cache(self):
+        aes_module.clear_key_cache()
+        # The last round key of the FIPS 197 Appendix A.1 key expansion
+        key = bytes.fromhex('2b7e151628aed2a6abf7158809cf4f3c')
         crypter = AesCrypter(key)
-        iv = bytes.fromhex('000102030405060708090a0b0c0d0e0f')
-        data = bytearray.fromhex('6bc1bee22e409f96e93d7e117393172a'
-                                 'ae2d8a571e03ac9c9eb76fac45af8e51'
-                                 '30c81c46a35ce411e5fbc1191a0a52ef'
-                                 'f69f2445df4f9b17ad2b417be66c3710')
-        expected1 = bytes.fromhex('4f021db243bc633d7178183a9fa071e8'
-                                  'b4d9ada9ad7dedf4e5e738763f69145a'
-                                  '571b242012fb7ae07fa9baac3df102e0'
-                                  '08b0e27988598881d920a9e64f5615cd')
-        expected2 = data[:]
-        crypter.cbc_encrypt(data, implicit=False, iv=iv, do_pad=False)
-        self.assertEqual(expected1, data)
-        crypter.cbc_decrypt(data, iv=iv, do_pad=False)
-        self.assertEqual(expected2, data)
+        self.assertEqual(crypter.ex_key[-16:], bytes.fromhex('d014f9a8c9ee2589e13f0cc8b6630ca6'))
+        schedule = next(iter(aes_module._key_cache.values()))
+        self.assertEqual(AesCrypter(key).dec_words, crypter.dec_words)
+        self.assertEqual(len(aes_module._key_cache), 1)
+        for _ in range(aes_module.KEY_CACHE_SIZE):
+            AesCrypter(get_random_bytes(32))
+        self.assertEqual(len(aes_module._key_cache), aes_module.KEY_CACHE_SIZE)
+        self.assertEqual(schedule, bytes(len(schedule)))
+        data = bytearray.fromhex('3243f6a8885a308d313198a2e0370734')
+        crypter.ecb_encrypt(data, do_pad=False)
+        self.assertEqual(data, bytes.fromhex('3925841d02dc09fbdc118597196a0b32'))
+        aes_module.clear_key_cache()
+        self.assertEqual(len(aes_module._key_cache), 0)
+        # Crypters zero their own copies of the expansion
+        ex_key = crypter.ex_key
+        crypter.clear()
+        self.assertEqual(ex_key, bytes(len(ex_key)))
+        self.assertRaises(TypeError, crypter.ecb_encrypt, data, do_pad=False)
+        for size in [3, 20]:
+            self.assertRaises(ValueError, aes_module.expand_key, bytes(size))
+
+    # Checks that multithreaded CTR encryption gives the same result as encrypting in a single thread, including when
+    # the counter wraps around. The thread count is faked so that several threads are used on any machine.
+    @mock.patch.object(AesCrypter, 'n_threads', 3)
+    def test_ctr_threads(self):
+        crypter = AesCrypter(get_random_bytes(32))
+        nonce = 2**128 - 1000
+        data = get_random_bytes(2**22 + 5)
+        data1, data2 = bytearray(data), bytearray(data)
+        crypter.ctr_encrypt(data1, nonce, 3)
+        crypter.ctr_encrypt(data2, nonce, 3, force_single_thread=True)
+        self.assertEqual(data1, data2)
+        crypter.ctr_decrypt(data1, nonce, 3)
+        self.assertEqual(data, data1)
+
+    # Checks that multithreaded CBC and ECB decryption give the same result as decrypting in a single thread
+    @mock.patch.object(AesCrypter, 'n_threads', 3)
+    def test_decrypt_threads(self):
+        for t_tables in [False, True]:
+            crypter = AesCrypter(get_random_bytes(32), t_tables)
+            iv = get_random_bytes(16)
+            data = get_random_bytes(2**22 + 16*5)
+            for mode, kwargs in [('cbc', {'iv': iv}), ('cbc', {}), ('ecb', {})]:
+                data1 = bytearray(data)
+                getattr(crypter, mode + '_decrypt')(data1, do_pad=False, **kwargs)
+                data2 = bytearray(data)
+                getattr(crypter, mode + '_decrypt')(data2, do_pad=False, force_single_thread=True, **kwargs)
+                self.assertEqual(data1, data2)
+            data1 = bytearray(data)
+            crypter.cbc_encrypt(data1, implicit=False, iv=iv, do_pad=False)
+            crypter.cbc_decrypt(data1, iv=iv, do_pad=False)
+            self.assertEqual(data, data1)
 
 
 class ChaChaTest(unittest.TestCase):
@@ -182,6 +351,85 @@ class ChaChaTest(unittest.TestCase):
         c.chacha_decrypt(data, nonce, counter)
         self.assertEqual(expected, data)
 
+    # Checks that the key stream is the same whether it is generated many blocks at a time or a block at a time, across
+    # partial blocks and the counter wrapping around
+    def test_blocks(self):
+        crypter = ChaChaCrypter(get_random_bytes(32))
+        nonce = randbits(96)
+        for size in [1, 63, 64, 65, 511, 512, 513, 64*21 + 7]:
+            for count in [0, 2**32 - 3]:
+                data = bytearray(get_random_bytes(size))
+                expected = data[:]
+                crypter.chacha_encrypt(data, nonce, count)
+                for i in range(0, size, 64):
+                    block = expected[i:i+64]
+                    crypter.chacha_encrypt(block, nonce, (count + i//64) % 2**32)
+                    expected[i:i+64] = block
+                self.assertEqual(data, expected)
+
+    # Test vector is taken from RFC 7539 Section 2.5.2
+    def test_poly1305_vector(self):
+        key = bytes.fromhex('85d6be7857556d337f4452fe42d506a80103808afb0db2fd4abff6af4149f51b')
+        mac = Poly1305(key)
+        mac.update(b'Cryptographic Forum ')
+        copy = mac.copy()
+        mac.update(b'Research Group')
+        self.assertEqual(mac.digest(), bytes.fromhex('a8061dc1305136c6c22b8baf0c0127a9'))
+        copy.update(b'Research Group')
+        self.assertEqual(copy.digest(), mac.digest())
+
+    # Test vector is taken from RFC 7539 Section 2.8.2
+    def test_aead_vector(self):
+        crypter = ChaChaCrypter(bytes(range(0x80, 0xa0)))
+        nonce = int.from_bytes(bytes.fromhex('070000004041424344454647'), 'little')
+        aad = bytes.fromhex('50515253c0c1c2c3c4c5c6c7')
+        expected2 = b'Ladies and Gentlemen of the class of \'99: If I could offer you only one tip for the future, ' \
+                    b'sunscreen would be it.'
+        expected1 = bytes.fromhex('d31a8d34648e60db7b86afbc53ef7ec2a4aded51296e08fea9e2b5a736ee62d6'
+                                  '3dbea45e8ca9671282fafb69da92728b1a71de0a9e060b2905d6a5b67ecd3b36'
+                                  '92ddbd7f2d778b8c9803aee328091b58fab324e4fad675945585808b4831d7bc'
+                                  '3ff4def08e4b7a9de576d26586cec64b6116')
+        data = bytearray(expected2)
+        _, tag = crypter.aead_encrypt(data, nonce, aad)
+        self.assertEqual(data, expected1)
+        self.assertEqual(tag, bytes.fromhex('1ae10b594f09e26a7e902ecbd0600691'))
+        with self.assertRaises(ValueError):
+            crypter.aead_decrypt(data, nonce, tag, aad[1:])
+        self.assertEqual(data, expected1)
+        crypter.aead_decrypt(data, nonce, tag, aad)
+        self.assertEqual(data, expected2)
+
+    # Checks the 64-bit counter against the 32-bit one: while its high word is n, the key stream for a 64-bit nonce is
+    # that of the 96-bit nonce with the 64-bit nonce in its last two words, and n in its first
+    def test_wide_counter(self):
+        crypter = ChaChaCrypter(get_random_bytes(32))
+        nonce = randbits(64)
+        data = bytearray(get_random_bytes(64*20 + 9))
+        expected = data[:]
+        crypter.chacha_encrypt(data, nonce, 2**32 - 3, wide=True)
+        head, tail = expected[:64*3], expected[64*3:]
+        crypter.chacha_encrypt(head, nonce << 32, 2**32 - 3)
+        crypter.chacha_encrypt(tail, nonce << 32 | 1, 0)
+        self.assertEqual(data, head + tail)
+        # Large counts are also split correctly between threads
+        threaded = bytearray(head + tail)
+        crypter.parallel_threshold, crypter.min_thread_chunk = 0, 64
+        crypter.chacha_encrypt(threaded, nonce, 2**32 - 3, n_threads=3, wide=True)
+        self.assertEqual(threaded, expected)
+
+    # Checks that encrypting on a given number of threads gives the same result as on a single thread
+    def test_n_threads(self):
+        crypter = ChaChaCrypter(get_random_bytes(32))
+        crypter.parallel_threshold, crypter.min_thread_chunk = 0, 2**10
+        nonce = randbits(96)
+        data = get_random_bytes(2**16 + 5)
+        expected = bytearray(data)
+        crypter.chacha_encrypt(expected, nonce, force_single_thread=True)
+        for n_threads in [2, 3, 2**10]:
+            threaded = bytearray(data)
+            crypter.chacha_encrypt(threaded, nonce, n_threads=n_threads)
+            self.assertEqual(threaded, expected)
+
     # Test that chacha multiprocessing works correctly
     def test_multiprocessing(self):
         key = get_random_bytes(32)
@@ -200,7 +448,69 @@ class ChaChaTest(unittest.TestCase):
             self.assertEqual(data, original)
 
 
+class GaloisTest(unittest.TestCase):
+    # Checks that the lookup tables of GF(2^16) are built on first use, as arrays of 16-bit entries
+    def test_large_field(self):
+        field = GaloisField(2, 16, 0x1100b, 2)
+        self.assertIsNone(field.expTable)
+        self.assertEqual(field.tableMem, 2**18)
+        x = randint(1, 2**16 - 1)
+        self.assertEqual(field.mult(x, field.inverse(x)), 1)
+        self.assertEqual((field.expTable.itemsize, len(field.expTable)), (2, 2**16))
+        # Products are the same as those computed without tables
+        no_tables = GaloisField(2, 16, 0x1100b, 2, maxMem=0)
+        for _ in range(100):
+            a, b = randint(0, 2**16 - 1), randint(0, 2**16 - 1)
+            self.assertEqual(field.mult(a, b), no_tables.mult(a, b))
+        self.assertFalse(no_tables.haveTables)
+        self.assertFalse(hasattr(field[x], '__dict__'))
+
+    # Checks each batch operation against the scalar one, over every pair of elements (and a range of exponents), in a
+    # binary field, a prime field, a field of odd characteristic, and a field without lookup tables
+    @unittest.skipIf(np is None, 'NumPy is not installed')
+    def test_batch_operations(self):
+        for field in [GaloisField(2, 8, 283, 3), GaloisField(7), GaloisField(3, 2), GaloisField(2, 4, maxMem=0)]:
+            a = np.array([list(field.f)]*field.q)
+            b, exponents = a.T, np.arange(-20, 300)
+            self.assertEqual(field.add_array(a, b).tolist(), [[field.add(x, y) for x in field.f] for y in field.f])
+            self.assertEqual(field.mult_array(a, b).tolist(), [[field.mult(x, y) for x in field.f] for y in field.f])
+            self.assertEqual(field.pow_array(a[0][:, None], exponents).tolist(),
+                             [[field.pow(x, int(e)) for e in exponents] for x in field.f])
+            self.assertEqual(field.inverse_array(field.f).tolist(), [field.inverse(x) for x in field.f])
+            self.assertTrue(all(field.mult(x, field.inverse(x)) == 1 for x in field.f[1:]))
+            coefficients = [randint(0, field.q - 1) for _ in range(5)]
+            expected = []
+            for x in field.f:
+                y = 0
+                for c in reversed(coefficients):
+                    y = field.add(field.mult(y, x), c)
+                expected.append(y)
+            self.assertEqual(field.poly_eval_array(coefficients, field.f).tolist(), expected)
+
+
+class ToolsTest(unittest.TestCase):
+    # Test vector is taken from RFC 5869 Appendix A.1
+    def test_hkdf_vector(self):
+        key = bytes.fromhex('0b0b0b0b0b0b0b0b0b0b0b0b0b0b0b0b0b0b0b0b0b0b')
+        salt = bytes.fromhex('000102030405060708090a0b0c')
+        info = bytes.fromhex('f0f1f2f3f4f5f6f7f8f9')
+        expected = bytes.fromhex('3cb25f25faacd57a90434f64d0362f2a2d2d0a90cf1a5a4c5db02d56ecc4c5bf34007208d5b887185865')
+        self.assertEqual(hkdf(key, salt, info, 42), expected)
+
+    # Checks that the number of available CPUs is limited by the cgroup CPU quota, rounded up
+    @mock.patch.object(tools_module.os, 'sched_getaffinity', lambda pid: set(range(8)), create=True)
+    def test_available_cpus(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, 'cpu.max')
+            with mock.patch.object(tools_module, 'CGROUP_CPU_MAX', path):
+                for contents, expected in [('max 100000', 8), ('150000 100000', 2), ('1600000 100000', 8)]:
+                    with open(path, 'w') as f:
+                        f.write(contents + '\n')
+                    self.assertEqual(available_cpus(), expected)
+
+
 class PackerTest(unittest.TestCase):
+    @mock.patch.object(packer_module, 'FUSED_BLOCK_SIZE', 2**8)
     def test_packing(self):
         for packing_mode in PACKING_MODES:
             alg, mode, auth = packing_mode.split('-', 2)
@@ -214,6 +524,420 @@ class PackerTest(unittest.TestCase):
                 packer.unpack(data)
                 self.assertEqual(data, expected)
 
+    # Test packing into reserved space, and unpacking buffers that cannot be resized
+    def test_zero_copy(self):
+        for packing_mode in PACKING_MODES:
+            alg, mode, auth = packing_mode.split('-', 2)
+            packer = NescientPacker(get_random_bytes(8), alg, mode, auth)
+            expected = get_random_bytes(randint(0, 2**10))
+            data = bytearray(packer.headroom) + expected
+            packer.pack(data, reserved=True)
+            copy = bytearray(data)
+            packer.unpack(copy)
+            self.assertEqual(copy, expected)
+            view = packer.unpack(memoryview(data))
+            self.assertIsInstance(view, memoryview)
+            self.assertEqual(view, expected)
+
+    # Test that a container which fails authentication is left encrypted
+    @mock.patch.object(packer_module, 'FUSED_BLOCK_SIZE', 2**8)
+    def test_tampered(self):
+        for packing_mode in PACKING_MODES:
+            alg, mode, auth = packing_mode.split('-', 2)
+            packer = NescientPacker(get_random_bytes(8), alg, mode, auth)
+            data = bytearray(get_random_bytes(2**10))
+            packer.pack(data)
+            data[-1] ^= 1
+            expected = data[:]
+            self.assertRaises(AuthError, packer.unpack, data)
+            self.assertEqual(data, expected)
+
+    # Test that files streamed in chunks or memory-mapped are interchangeable with containers packed in memory
+    @mock.patch.object(packer_module, 'CHUNK_SIZE', 2**10)
+    @mock.patch.object(packer_module, 'FUSED_BLOCK_SIZE', 2**8)
+    def test_file_packing(self):
+        with tempfile.TemporaryDirectory() as directory:
+            in_path, out_path = os.path.join(directory, 'in'), os.path.join(directory, 'out')
+            for packing_mode in PACKING_MODES:
+                alg, mode, auth = packing_mode.split('-', 2)
+                packer = NescientPacker(get_random_bytes(8), alg, mode, auth)
+                for size, use_mmap in product([0, 15, 2**10, 2**10+1, 3*2**10-16, 5*2**10+7], [False, True]):
+                    expected = get_random_bytes(size)
+                    with open(in_path, 'wb') as f:
+                        f.write(expected)
+                    packer.pack_or_unpack_file(in_path, out_path, 'pack', overwrite=False, use_mmap=use_mmap)
+                    with open(out_path, 'rb') as f:
+                        data = bytearray(f.read())
+                    packer.unpack(data)
+                    self.assertEqual(data, expected)
+                    data = bytearray(expected)
+                    packer.pack(data)
+                    with open(in_path, 'wb') as f:
+                        f.write(data)
+                    packer.pack_or_unpack_file(in_path, out_path, 'unpack', use_mmap=use_mmap)
+                    self.assertFalse(os.path.exists(in_path))
+                    with open(out_path, 'rb') as f:
+                        self.assertEqual(f.read(), expected)
+
+    @mock.patch.object(packer_module, 'CHUNK_SIZE', 2**10)
+    def test_file_tampered(self):
+        with tempfile.TemporaryDirectory() as directory:
+            in_path, out_path = os.path.join(directory, 'in'), os.path.join(directory, 'out')
+            packer = NescientPacker(get_random_bytes(8))
+            data = bytearray(get_random_bytes(3*2**10))
+            packer.pack(data)
+            data[-1] ^= 1
+            with open(in_path, 'wb') as f:
+                f.write(data)
+            for use_mmap in [False, True]:
+                self.assertRaises(AuthError, packer.pack_or_unpack_file, in_path, out_path, 'unpack', use_mmap=use_mmap)
+                self.assertEqual(os.listdir(directory), ['in'])
+            # If the input cannot be opened, the temporary output file is closed and removed
+            real_mkstemp, fds = tempfile.mkstemp, []
+
+            def mkstemp(**kwargs):
+                fd, path = real_mkstemp(**kwargs)
+                fds.append(fd)
+                return fd, path
+            with mock.patch.object(tempfile, 'mkstemp', mkstemp):
+                self.assertRaises(OSError, packer.pack_or_unpack_file, directory, out_path, 'pack')
+            self.assertRaises(OSError, os.fstat, fds[0])
+            self.assertEqual(os.listdir(directory), ['in'])
+
+    # Test that chunked containers packed in memory, streamed or memory-mapped are interchangeable, including when
+    # there are more chunks than threads to process them on
+    @mock.patch.object(packer_module, 'N_THREADS', 3)
+    def test_chunked_packing(self):
+        with tempfile.TemporaryDirectory() as directory:
+            in_path, out_path = os.path.join(directory, 'in'), os.path.join(directory, 'out')
+            for packing_mode in CHUNKED_MODES:
+                alg, mode, auth = packing_mode.split('-', 2)
+                packer = NescientPacker(get_random_bytes(8), alg, mode, auth, chunk_size=2**8)
+                for size, use_mmap in product([0, 15, 2**8, 2**8-16, 4*2**8, 7*2**8+7], [False, True]):
+                    expected = get_random_bytes(size)
+                    data = bytearray(expected)
+                    packer.pack(data)
+                    with open(in_path, 'wb') as f:
+                        f.write(data)
+                    packer.pack_or_unpack_file(in_path, out_path, 'unpack', use_mmap=use_mmap)
+                    with open(out_path, 'rb') as f:
+                        self.assertEqual(f.read(), expected)
+                    packer.pack_or_unpack_file(out_path, in_path, 'pack', use_mmap=use_mmap)
+                    with open(in_path, 'rb') as f:
+                        data = bytearray(f.read())
+                    self.assertEqual(packer.unpack(data), expected)
+
+    # Test that segmented CBC containers packed in memory, streamed or memory-mapped are interchangeable, whether or not
+    # they are chunked and however segments fall across chunks and stream reads, and can be read at random
+    @mock.patch.object(packer_module, 'N_THREADS', 3)
+    @mock.patch.object(packer_module, 'CHUNK_SIZE', 2**10)
+    @mock.patch.object(packer_module, 'FUSED_BLOCK_SIZE', 2**8)
+    def test_segmented_packing(self):
+        with self.assertRaises(ParamError):
+            NescientPacker('password', 'chacha', 'stm', 'sha', segment_size=2**8)
+        with tempfile.TemporaryDirectory() as directory:
+            in_path, out_path = os.path.join(directory, 'in'), os.path.join(directory, 'out')
+            for segment_size, chunk_size in product([48, 2**9, 2**12], [None, 2**8]):
+                packer = NescientPacker(get_random_bytes(8), 'aes128', 'cbc', 'sha', chunk_size, iterations=1000,
+                                        segment_size=segment_size)
+                for size, use_mmap in product([0, 47, 2**10, 3*2**10+5], [False, True]):
+                    expected = get_random_bytes(size)
+                    data = bytearray(expected)
+                    packer.pack(data)
+                    with open(in_path, 'wb') as f:
+                        f.write(data)
+                    with NescientReader(in_path, packer.password) as reader:
+                        reader.seek(size // 3)
+                        self.assertEqual(reader.read(), expected[size // 3:])
+                    packer.pack_or_unpack_file(in_path, out_path, 'unpack', use_mmap=use_mmap)
+                    with open(out_path, 'rb') as f:
+                        self.assertEqual(f.read(), expected)
+                    packer.pack_or_unpack_file(out_path, in_path, 'pack', use_mmap=use_mmap)
+                    with open(in_path, 'rb') as f:
+                        data = bytearray(f.read())
+                    self.assertEqual(packer.unpack(data), expected)
+            # The second segment is a CBC chain of its own, starting from the segment's IV
+            packer = NescientPacker(get_random_bytes(8), 'aes128', 'cbc', 'sha', iterations=1000, segment_size=48)
+            expected = get_random_bytes(2**8)
+            data = bytearray(expected)
+            packer.pack(data)
+            parsed = NescientPacker.parse_nescient_header(data)
+            salt, key = parsed['salt'], packer._unpacker(parsed)._unpack_key(parsed)
+            crypter = AesCrypter(key)
+            segment = bytearray(expected[48:96])
+            crypter.cbc_encrypt(segment, implicit=False, iv=NescientPacker._segment_iv(crypter, salt, 1), do_pad=False)
+            self.assertEqual(segment, data[packer.headroom+48:packer.headroom+96])
+
+    # Test that streaming a segmented container reads several segments at a time, encrypting them on a thread pool that
+    # is shared by the whole file
+    @mock.patch.object(packer_module, 'N_THREADS', 3)
+    @mock.patch.object(packer_module, 'CHUNK_SIZE', 2**13)
+    def test_segmented_stream(self):
+        packer = NescientPacker(get_random_bytes(8), 'aes128', 'cbc', 'sha', iterations=1000, segment_size=2**12)
+        cbc_pieces, n_pieces = NescientPacker._cbc_pieces, []
+
+        def count_pieces(*args):
+            pieces = cbc_pieces(*args)
+            n_pieces.append(len(pieces))
+            return pieces
+        with tempfile.TemporaryDirectory() as directory:
+            in_path, out_path = os.path.join(directory, 'in'), os.path.join(directory, 'out')
+            expected = get_random_bytes(2**14 + 5)
+            with open(in_path, 'wb') as f:
+                f.write(expected)
+            executor_class = packer_module.ThreadPoolExecutor
+            with mock.patch.object(NescientPacker, '_cbc_pieces', count_pieces), \
+                    mock.patch.object(packer_module, 'ThreadPoolExecutor', wraps=executor_class) as pool:
+                packer.pack_or_unpack_file(in_path, out_path, 'pack')
+            self.assertEqual(n_pieces, [3, 2])
+            self.assertEqual(pool.call_count, 1)
+            with open(out_path, 'rb') as f:
+                self.assertEqual(packer.unpack(bytearray(f.read())), expected)
+
+    # Test that GCM is only used with its own authentication, unchunked, and that its 16 byte tag is followed by zeros
+    def test_gcm_packing(self):
+        for mode, auth, chunk_size in [('gcm', 'sha', None), ('cbc', 'gcm', None), ('gcm', 'gcm', 2**8)]:
+            with self.assertRaises(ParamError):
+                NescientPacker('password', 'aes128', mode, auth, chunk_size)
+        packer = NescientPacker(get_random_bytes(8), 'aes256', 'gcm', 'gcm', iterations=1000)
+        expected = get_random_bytes(2**8)
+        data = bytearray(expected)
+        packer.pack(data)
+        self.assertEqual(data[56:72], bytes(16))
+        self.assertEqual(len(data), packer.headroom + len(expected))
+        data[71] ^= 1
+        with self.assertRaises(AuthError):
+            packer.unpack(data[:])
+        data[71] ^= 1
+        self.assertEqual(packer.unpack(data), expected)
+
+    # Checks that stream mode refuses more data than its 32-bit counter covers, and that c64 mode packs it
+    @mock.patch.object(packer_module, 'STM_MAX_SIZE', 2**8)
+    def test_c64_packing(self):
+        expected = get_random_bytes(2**8 + 1)
+        with self.assertRaises(ParamError):
+            NescientPacker(get_random_bytes(8), 'chacha', 'stm', 'sha', iterations=1000).pack(bytearray(expected))
+        packer = NescientPacker(get_random_bytes(8), 'chacha', 'c64', 'sha', iterations=1000)
+        data = bytearray(expected)
+        packer.pack(data)
+        self.assertNotEqual(data[packer.headroom:], expected)
+        self.assertEqual(packer.unpack(data), expected)
+
+    def test_ply_packing(self):
+        for mode, auth, chunk_size in [('c64', 'ply', None), ('stm', 'ply', 2**8)]:
+            with self.assertRaises(ParamError):
+                NescientPacker('password', 'chacha', mode, auth, chunk_size)
+        packer = NescientPacker(get_random_bytes(8), 'chacha', 'stm', 'ply', iterations=1000)
+        expected = get_random_bytes(2**8 + 3)
+        data = bytearray(expected)
+        packer.pack(data)
+        self.assertEqual(data[56:72], bytes(16))
+        data[-1] ^= 1
+        with self.assertRaises(AuthError):
+            packer.unpack(data[:])
+        data[-1] ^= 1
+        self.assertEqual(packer.unpack(data), expected)
+
+    # Test that keyed BLAKE2b is available to every algorithm, and that its tags match hashlib's
+    def test_b2b_packing(self):
+        for alg in ['aes128', 'aes192', 'aes256', 'chacha']:
+            self.assertTrue(any(packing_mode.startswith(alg) and packing_mode.endswith('-b2b')
+                                for packing_mode in PACKING_MODES))
+        packer = NescientPacker(get_random_bytes(8), 'chacha', 'stm', 'b2b', iterations=1000)
+        key, auth_data, data = get_random_bytes(32), get_random_bytes(40), get_random_bytes(2**8)
+        self.assertEqual(packer._gen_auth_tag(key, auth_data, data),
+                         hashlib.blake2b(auth_data + data, key=key, digest_size=32).digest())
+
+    # Test that corrupted, reordered or missing chunks are detected, and leave the container encrypted
+    def test_chunked_tampered(self):
+        for packing_mode in CHUNKED_MODES:
+            alg, mode, auth = packing_mode.split('-', 2)
+            packer = NescientPacker(get_random_bytes(8), alg, mode, auth, chunk_size=2**8)
+            data = bytearray(get_random_bytes(4*2**8))
+            packer.pack(data)
+            start = packer.headroom
+            # Corrupt the third chunk
+            corrupted = data[:]
+            corrupted[start + 2*2**8 + 5] ^= 1
+            expected = corrupted[:]
+            with self.assertRaisesRegex(AuthError, 'chunk 2'):
+                packer.unpack(corrupted)
+            self.assertEqual(corrupted, expected)
+            # Swap the first two chunks and their tags
+            tags = len(data) - 32*packer._split_payload(len(data) - start)[1]
+            swapped = data[:start] + data[start+2**8:start+2*2**8] + data[start:start+2**8] + data[start+2*2**8:tags]
+            swapped += data[tags+32:tags+64] + data[tags:tags+32] + data[tags+64:]
+            self.assertRaises(AuthError, packer.unpack, swapped)
+            # Drop the chunks after the third, and their tags
+            truncated = data[:start+3*2**8] + data[tags:tags+3*32]
+            self.assertRaises(AuthError, packer.unpack, truncated)
+
+    # Test that containers packed before parameters were added to the header can still be unpacked. The containers
+    # hold b'Hello world', packed by version 0.9.0 with the password 'password'.
+    def test_legacy_unpacking(self):
+        packer = NescientPacker('password')
+        for container in ['4e45534330302e30392e303063686163686173746d736861266b40ffb4081b450a4ae040b3906d2978c54b30e5'
+                          '00cbd09603b18cee5c4d1a7c1e355ffd19f0638e4e2416c9bfa517fe7096989a7e6d27e9a5d6',
+                          '4e45534330302e30392e303061657331323863626373686138d6a4ce8a98803dd05b65dbbe7e47dfec76d7bc58'
+                          '89338dad4c9f66b41b6d3d3a8c9c809d505fc5703e1e33afbdfa34b5e67620cf430035008d7cfa21445f7923a9'
+                          'fc0e4826ed7c9310c359d221cedd']:
+            self.assertEqual(packer.unpack(bytearray.fromhex(container)), b'Hello world')
+
+    # Test that containers packed with a master key can be unpacked by a new packer, deriving the master key once
+    def test_master_key(self):
+        for packing_mode in PACKING_MODES:
+            alg, mode, auth = packing_mode.split('-', 2)
+            packer = NescientPacker(get_random_bytes(8), alg, mode, auth, master_key=True)
+            containers, expected = [], [get_random_bytes(randint(0, 2**8)) for _ in range(5)]
+            with mock.patch.object(packer_module, 'pbkdf2_hmac', wraps=packer_module.pbkdf2_hmac) as pbkdf2:
+                for data in expected:
+                    containers.append(bytearray(data))
+                    packer.pack(containers[-1])
+                unpacker = NescientPacker(packer.password)
+                self.assertEqual([unpacker.unpack(bytearray(data)) for data in containers], expected)
+                self.assertEqual(pbkdf2.call_count, 1)
+            self.assertRaises(AuthError, NescientPacker(get_random_bytes(8)).unpack, containers[0])
+        # Master keys are derived once, even when prefetched on several threads at once
+        with tempfile.TemporaryDirectory() as directory:
+            paths = [os.path.join(directory, str(i)) for i in range(len(containers))]
+            for path, data in zip(paths, containers):
+                with open(path, 'wb') as f:
+                    f.write(data)
+            unpacker = NescientPacker(packer.password)
+            with mock.patch.object(packer_module, 'pbkdf2_hmac', wraps=packer_module.pbkdf2_hmac) as pbkdf2:
+                list(future.result() for future in unpacker.prefetch_keys(paths, 'unpack', depth=len(paths)))
+                self.assertEqual(pbkdf2.call_count, 1)
+
+    # Test that containers are unpacked with the number of iterations recorded in them
+    def test_iterations(self):
+        for iterations, master_key in product([1, 1000], [False, True]):
+            packer = NescientPacker(get_random_bytes(8), iterations=iterations, master_key=master_key)
+            expected = get_random_bytes(2**8)
+            data = bytearray(expected)
+            packer.pack(data)
+            params = NescientPacker.parse_nescient_header(data)['params']
+            self.assertEqual(params['itr'], iterations.to_bytes(4, 'little'))
+            with mock.patch.object(packer_module, 'pbkdf2_hmac', wraps=packer_module.pbkdf2_hmac) as pbkdf2:
+                self.assertEqual(NescientPacker(packer.password).unpack(data), expected)
+                self.assertEqual(pbkdf2.call_args[0][3], iterations)
+        # Containers demanding more iterations than the maximum are rejected before any key is derived
+        data[72:] = data[72:].replace(b'itr\x04' + (1000).to_bytes(4, 'little'),
+                                      b'itr\x04' + (2**32 - 1).to_bytes(4, 'little'), 1)
+        with mock.patch.object(packer_module, 'pbkdf2_hmac') as pbkdf2:
+            self.assertRaises(PackingError, NescientPacker(packer.password).unpack, data)
+            pbkdf2.assert_not_called()
+        self.assertRaises(ParamError, NescientPacker, 'password', iterations=packer_module.MAX_ITERATIONS + 1)
+
+    # Test that incorrect passwords are rejected by the key check value, before the payload is read
+    def test_key_check(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'in')
+            for key_check in [False, True]:
+                packer = NescientPacker(get_random_bytes(8), key_check=key_check)
+                expected = get_random_bytes(2**10)
+                data = bytearray(expected)
+                packer.pack(data)
+                self.assertEqual('kcv' in NescientPacker.parse_nescient_header(data)['params'], key_check)
+                with open(path, 'wb') as f:
+                    f.write(data)
+                wrong_packer = NescientPacker(get_random_bytes(8))
+                with mock.patch.object(NescientPacker, '_unpack_into', wraps=packer._unpack_into) as unpack_into:
+                    self.assertRaises(AuthError, wrong_packer.unpack, bytearray(data))
+                    self.assertEqual(unpack_into.called, not key_check)
+                if key_check:
+                    self.assertRaises(AuthError, next(wrong_packer.prefetch_keys([path], 'unpack')).result)
+                    self.assertRaises(AuthError, NescientReader, path, wrong_packer.password)
+                self.assertEqual(NescientPacker(packer.password).unpack(data), expected)
+
+    # Test that files are packed and unpacked with keys derived ahead of time, and that invalid containers are reported
+    def test_prefetch_keys(self):
+        with tempfile.TemporaryDirectory() as directory:
+            packer = NescientPacker(get_random_bytes(8))
+            paths = [os.path.join(directory, str(i)) for i in range(5)]
+            expected = [get_random_bytes(randint(0, 2**8)) for _ in paths]
+            for path, data in zip(paths, expected):
+                with open(path, 'wb') as f:
+                    f.write(data)
+            for packing_choice in ['pack', 'unpack']:
+                # Finish deriving keys before checking that processing files does not derive them again
+                keys = [future.result() for future in packer.prefetch_keys(paths, packing_choice, depth=2)]
+                for path, (salt, key) in zip(paths, keys):
+                    with mock.patch.object(packer_module, 'pbkdf2_hmac') as pbkdf2:
+                        packer.pack_or_unpack_file(path, path, packing_choice, salt=salt, key=key)
+                        pbkdf2.assert_not_called()
+            for path, data in zip(paths, expected):
+                with open(path, 'rb') as f:
+                    self.assertEqual(f.read(), data)
+            keys = list(packer.prefetch_keys(paths, 'unpack'))
+            self.assertRaises(PackingError, keys[0].result)
+
+
+class ReaderTest(unittest.TestCase):
+    # Test reading random ranges of chunked and unchunked containers, spanning several blocks
+    @mock.patch.object(reader_module, 'READ_BLOCK_SIZE', 2**8)
+    def test_random_access(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'in.nesc')
+            for packing_mode, chunk_size in [(packing_mode, chunk_size) for packing_mode, chunk_size
+                                             in product(PACKING_MODES, [None, 2**7])
+                                             if chunk_size is None or packing_mode in CHUNKED_MODES]:
+                alg, mode, auth = packing_mode.split('-', 2)
+                packer = NescientPacker(get_random_bytes(8), alg, mode, auth, chunk_size)
+                expected = get_random_bytes(randint(2**10, 2**11))
+                data = bytearray(expected)
+                packer.pack(data)
+                with open(path, 'wb') as f:
+                    f.write(data)
+                with NescientReader(path, packer.password) as reader:
+                    self.assertEqual(reader.seek(0, os.SEEK_END), len(expected))
+                    for _ in range(20):
+                        start = randint(0, len(expected))
+                        reader.seek(start)
+                        self.assertEqual(reader.read(randint(0, 2**9)), expected[start:reader.tell()])
+                    reader.seek(0)
+                    self.assertEqual(reader.read(), expected)
+
+    # Test that only corrupted chunks (and in CBC mode, the chunks following them) fail to be read from chunked
+    # containers, and that blocks of containers that are not chunked changed after opening them fail to be read
+    @mock.patch.object(reader_module, 'READ_BLOCK_SIZE', 2**8)
+    def test_tampered(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'in.nesc')
+            for packing_mode in CHUNKED_MODES:
+                alg, mode, auth = packing_mode.split('-', 2)
+                packer = NescientPacker(get_random_bytes(8), alg, mode, auth, chunk_size=2**8)
+                expected = get_random_bytes(4*2**8)
+                data = bytearray(expected)
+                packer.pack(data)
+                data[packer.headroom + 2*2**8] ^= 1
+                with open(path, 'wb') as f:
+                    f.write(data)
+                with NescientReader(path, packer.password) as reader:
+                    self.assertEqual(reader.read(2*2**8), expected[:2*2**8])
+                    self.assertRaises(AuthError, reader.read, 1)
+                    reader.seek(3*2**8)
+                    if mode == 'cbc':  # The corrupted chunk ends in the IV of the next, which cannot be trusted either
+                        self.assertRaises(AuthError, reader.read)
+                    else:
+                        self.assertEqual(reader.read(), expected[3*2**8:])
+                # Without chunks, the whole container is authenticated up front
+                packer.chunk_size = None
+                data = bytearray(expected)
+                packer.pack(data)
+                data[-1] ^= 1
+                with open(path, 'wb') as f:
+                    f.write(data)
+                self.assertRaises(AuthError, NescientReader, path, packer.password)
+                # Blocks changed after the container was authenticated are detected when read
+                data[-1] ^= 1
+                with open(path, 'wb') as f:
+                    f.write(data)
+                with NescientReader(path, packer.password) as reader, open(path, 'r+b') as f:
+                    f.seek(packer.headroom)
+                    f.write(bytes([data[packer.headroom] ^ 1]))
+                    f.flush()
+                    self.assertRaises(AuthError, reader.read, 1)
+
 
 def _add(x, y):
     return x + y
@@ -243,8 +967,9 @@ class MultiprocessingTest(unittest.TestCase):
         self.assertRaises(_DummyException, process_sync_wrapper(_except))
 
     def test_packer_pickling(self):
-        packer = NescientPacker('')
-        pickle.dumps(packer)
+        packer = NescientPacker('', master_key=True)
+        copy = pickle.loads(pickle.dumps(packer))
+        self.assertEqual(copy.derive_master_key(packer.master_salt), packer.derive_master_key(packer.master_salt))
         pickle.dumps(packer.pack_or_unpack_file)
 
     def test_process_packing(self):
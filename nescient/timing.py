@@ -12,7 +12,9 @@ from threading import Thread
 from timeit import default_timer as timer
 from pkg_resources import Requirement, resource_filename
 
-from nescient.packer import NescientPacker
+from nescient.packer import NescientPacker, MAX_ITERATIONS
+from nescient.crypto.aes import AesCrypter
+from nescient.crypto.chacha import ChaChaCrypter
 from nescient.crypto.tools import get_random_bytes
 
 
@@ -20,6 +22,9 @@ from nescient.crypto.tools import get_random_bytes
 BENCHMARK_PATH = os.path.join(os.path.expanduser('~'), 'nescient-benchmarks')
 #BENCHMARK_PATH = resource_filename(Requirement.parse('Nescient'), os.path.join('nescient', 'benchmark'))
 
+# The key under which the ChaCha thread tuning is stored with the benchmarks of each packing mode
+THREAD_TUNING_KEY = 'chacha-threads'
+
 
 def load_benchmarks():
     try:
@@ -78,6 +83,129 @@ def benchmark_mode(packing_mode):
         del data
         gc.collect()
     write_benchmarks(packing_mode, times)
+    if alg == 'chacha':
+        write_benchmarks(THREAD_TUNING_KEY, calibrate_threads())
+        load_thread_tuning()
+
+
+def calibrate_iterations(target_time, packing_mode='chacha-stm-sha'):
+    """ Find the number of PBKDF2 iterations that derive a key in about the target time on the current machine.
+
+    Args:
+        target_time (float): The desired key derivation time, in seconds.
+        packing_mode (str): The packing mode keys are to be derived for.
+
+    Returns:
+        int: The number of iterations, to pass on to `NescientPacker`.
+    """
+    alg, mode, auth = packing_mode.split('-', 2)
+    iterations = 1000
+    # Double the number of iterations until derivation takes long enough to be timed reliably, then scale it
+    while True:
+        packer = NescientPacker(get_random_bytes(16), alg, mode, auth, iterations=iterations)
+        checkpoint = timer()
+        packer._key_gen(get_random_bytes(16))
+        elapsed = timer() - checkpoint
+        if elapsed > 0 and elapsed >= min(target_time, 0.05):
+            return max(1, min(int(iterations*target_time/elapsed), MAX_ITERATIONS))
+        # Derivation can be too fast to time even at the maximum, which is then the best available
+        if iterations >= MAX_ITERATIONS:
+            return MAX_ITERATIONS
+        iterations = min(2*iterations, MAX_ITERATIONS)
+
+
+# Returns the best of several times taken to encrypt some data with ChaCha on the given number of threads
+def _time_chacha(crypter, data, n_threads, repeats):
+    best = None
+    for _ in range(repeats):
+        checkpoint = timer()
+        crypter.chacha_encrypt(data, 0, n_threads=n_threads, force_single_thread=n_threads == 1)
+        elapsed = timer() - checkpoint
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def calibrate_threads(max_size=2**24, repeats=5):
+    """ Measure when multithreading ChaCha encryption pays off on the current machine.
+
+    Sizes are doubled from 4 KiB up to the maximum size. The parallel threshold is the smallest size at which using
+    every available CPU is faster than a single thread, and the minimum thread chunk is half the smallest size at which
+    two threads are faster than one, the least data worth starting another thread for.
+
+    Args:
+        max_size (int): The largest number of bytes to time encrypting.
+        repeats (int): The number of runs of each size, of which the fastest is taken.
+
+    Returns:
+        dict: The `n_threads`, `parallel_threshold` and `min_thread_chunk` to give `ChaChaCrypter`, to be stored with
+        the benchmarks and applied by `load_thread_tuning`.
+    """
+    n_threads = ChaChaCrypter.n_threads
+    tuning = {'n_threads': n_threads, 'parallel_threshold': ChaChaCrypter.parallel_threshold,
+              'min_thread_chunk': ChaChaCrypter.min_thread_chunk}
+    if n_threads == 1:  # There is nothing to tune
+        return tuning
+    crypter = ChaChaCrypter(get_random_bytes(32))
+    # Let the crypter use threads for any amount of data while timing
+    crypter.parallel_threshold, crypter.min_thread_chunk = 0, 64
+    threshold = chunk = None
+    size = 2**12
+    while size <= max_size and (threshold is None or chunk is None):
+        data = bytearray(size)
+        single = _time_chacha(crypter, data, 1, repeats)
+        if chunk is None and _time_chacha(crypter, data, 2, repeats) < single:
+            chunk = size//2
+        if threshold is None and _time_chacha(crypter, data, n_threads, repeats) < single:
+            threshold = size
+        size *= 2
+    # If threads never paid off, use them for no size that was measured
+    tuning['parallel_threshold'] = threshold if threshold is not None else 2*max_size
+    tuning['min_thread_chunk'] = chunk if chunk is not None else max_size
+    return tuning
+
+
+def load_thread_tuning():
+    """ Apply the ChaCha thread tuning stored with the benchmarks, if any, to `ChaChaCrypter`.
+
+    The tuning is only applied if it was measured with as many CPUs as are available now.
+    """
+    tuning = load_benchmarks().get(THREAD_TUNING_KEY)
+    if tuning is not None and tuning.get('n_threads') == ChaChaCrypter.n_threads:
+        ChaChaCrypter.parallel_threshold = tuning['parallel_threshold']
+        ChaChaCrypter.min_thread_chunk = tuning['min_thread_chunk']
+
+
+def benchmark_interleaving(size=2**22, repeats=5):
+    """ Compare the rates of the interleaved AES core and the one-block loop, in each mode using the interleaved core.
+
+    Each mode is run on a single thread, and the best of several runs is taken.
+
+    Args:
+        size (int): The number of bytes to encrypt or decrypt in each run.
+        repeats (int): The number of runs of each mode.
+
+    Returns:
+        dict: The rates of the one-block loop and the interleaved core in MiB/s, as a tuple, by mode.
+    """
+    data = bytearray(size)
+    iv = bytes(16)
+    rates = {}
+    for interleave in [False, True]:
+        crypter = AesCrypter(get_random_bytes(32), interleave=interleave)
+        runs = {'ecb-encrypt': lambda: crypter.ecb_encrypt(data, do_pad=False),
+                'ecb-decrypt': lambda: crypter.ecb_decrypt(data, do_pad=False, force_single_thread=True),
+                'cbc-decrypt': lambda: crypter.cbc_decrypt(data, iv=iv, do_pad=False, force_single_thread=True),
+                'ctr': lambda: crypter.ctr_encrypt(data, 0, force_single_thread=True)}
+        for mode, run in runs.items():
+            best = None
+            for _ in range(repeats):
+                checkpoint = timer()
+                run()
+                elapsed = timer() - checkpoint
+                best = elapsed if best is None else min(best, elapsed)
+            rates.setdefault(mode, ())
+            rates[mode] += (size/2**20/best,)
+    return rates
 
 
 class EstimatedProgressBar:
@@ -195,6 +323,9 @@ if __name__ == '__main__':
     benchmark_mode('chacha-stm-sha')
     benchmarks = load_benchmarks()
     for mode, times in benchmarks.items():
+        if mode == THREAD_TUNING_KEY:
+            print(mode, times)
+            continue
         print(mode)
         for size in times:
             print('{:>10}'.format(size), ' '.join('{:>8} MiB/s'.format(round((size/2**20)/t, 2)) for t in times[size]))
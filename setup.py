@@ -22,7 +22,9 @@ else:
 
 USE_CYTHON = False
 ext = 'pyx' if USE_CYTHON else 'c'
-extensions = [Extension('nescient.crypto.aes', ['nescient/crypto/aes.%s' % ext]),
+extensions = [Extension('nescient.crypto.aes', ['nescient/crypto/aes.%s' % ext],
+                        depends=['nescient/crypto/aes_tables.h'],
+                        extra_compile_args=extra_compile_args, extra_link_args=extra_link_args),
               Extension('nescient.crypto.chacha', ['nescient/crypto/chacha.%s' % ext],
                         extra_compile_args=extra_compile_args, extra_link_args=extra_link_args)]
 if USE_CYTHON:
@@ -37,7 +39,7 @@ setup(name='Nescient',
       author_email='arant@mit.edu',
       url=url,
       packages=['nescient', 'nescient.crypto', 'nescient.resources'],
-      package_data={'nescient': ['*.png', '*.ico'], 'nescient.crypto': ['*.pyx', '*.pxd'],
+      package_data={'nescient': ['*.png', '*.ico'], 'nescient.crypto': ['*.pyx', '*.pxd', '*.h'],
                     'nescient.resources': ['*gif']},
       ext_modules=extensions,
       entry_points={'console_scripts': ['nescient = nescient.__main__:main'],
@@ -48,5 +50,6 @@ setup(name='Nescient',
                    'Topic :: Security :: Cryptography',
                    'Programming Language :: Python :: 3.5',
                    'Programming Language :: Python :: 3.6'],
-      python_requires='>=3.5'
+      python_requires='>=3.5',
+      extras_require={'numpy': ['numpy']}
       )